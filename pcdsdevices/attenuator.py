@@ -4,6 +4,7 @@ Module for `Attenuator` and related classes.
 import enum
 import functools
 import logging
+import threading
 import time
 from typing import Generator
 
@@ -19,6 +20,7 @@ from ophyd.signal import EpicsSignal, EpicsSignalRO, Signal, SignalRO
 
 from . import utils
 from .analog_signals import FDQ
+from .attenuator_solver import FilterSpec, SolidAttenuatorSolver
 from .device import GroupDevice
 from .device import UnrelatedComponent as UCpt
 from .device import UpdateComponent as UpCpt
@@ -159,16 +161,21 @@ class AttBase(FltMvInterface, PVPositionerNoInterrupt):
 
     # Attenuator Signals
     energy = Cpt(EpicsSignalRO, ':COM:T_CALC.VALE', kind='normal')
-    trans_ceil = Cpt(EpicsSignalRO, ':COM:R_CEIL', kind='omitted')
-    trans_floor = Cpt(EpicsSignalRO, ':COM:R_FLOOR', kind='omitted')
+    trans_ceil = Cpt(EpicsSignalRO, ':COM:R_CEIL', auto_monitor=True,
+                     kind='omitted')
+    trans_floor = Cpt(EpicsSignalRO, ':COM:R_FLOOR', auto_monitor=True,
+                      kind='omitted')
     user_energy = Cpt(EpicsSignal, ':COM:EDES', kind='omitted')
     eget_cmd = Cpt(EpicsSignal, ':COM:EACT.SCAN', kind='omitted')
 
     # Aux Signals
-    calcpend = Cpt(EpicsSignalRO, ':COM:CALCP', kind='omitted')
+    calcpend = Cpt(EpicsSignalRO, ':COM:CALCP', auto_monitor=True,
+                   kind='omitted')
 
     egu = ''  # Transmission is a unitless ratio
     done_value = 0
+    # Maximum time to wait for a pending calculation before actuating
+    calcpend_timeout = 1
 
     # QIcon for UX
     _icon = 'fa.barcode'
@@ -178,6 +185,13 @@ class AttBase(FltMvInterface, PVPositionerNoInterrupt):
     tab_whitelist = ['set_energy']
 
     def __init__(self, prefix, *, name, **kwargs):
+        self._calc_done = threading.Event()
+        # Bumped for each setpoint put, see _calcpend_changed
+        self._calc_seq = 0
+        self._calc_started_seq = 0
+        self._move_goal = None
+        self._calc_wait_time = 0.0
+        self.last_move_timing = {}
         super().__init__(prefix, name=name, limits=(0, 1), **kwargs)
         self.filters = []
         self._has_subscribed_state = False
@@ -186,6 +200,44 @@ class AttBase(FltMvInterface, PVPositionerNoInterrupt):
                 self.filters.append(getattr(self, f'filter{i}'))
             except AttributeError:
                 break
+        self.calcpend.subscribe(self._calcpend_changed, run=True)
+
+    def _calcpend_changed(self, *args, value, **kwargs):
+        """
+        Keep the calculation done event in sync with calcpend.
+
+        After a setpoint put from :meth:`_setup_move`, only a calculation
+        that started after the put may set the event.
+        """
+        if value == 0:
+            if self._calc_started_seq == self._calc_seq:
+                self._calc_done.set()
+        else:
+            self._calc_started_seq = self._calc_seq
+            self._calc_done.clear()
+
+    def wait_for_calculation(self, timeout=None):
+        """
+        Wait until the IOC has no pending transmission calculation.
+
+        This is driven by the calcpend monitor rather than by polling. The
+        IOC posts the new ceiling and floor before it clears calcpend, so
+        once this returns True their monitored values are current.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait in seconds. Defaults to
+            ``calcpend_timeout``.
+
+        Returns
+        -------
+        done : bool
+            False if we gave up waiting.
+        """
+        if timeout is None:
+            timeout = self.calcpend_timeout
+        return self._calc_done.wait(timeout)
 
     @property
     def actuate_value(self):
@@ -199,16 +251,24 @@ class AttBase(FltMvInterface, PVPositionerNoInterrupt):
         This will wait until a pending calculation completes before returning.
         """
 
-        timeout = 1
-        start = time.time()
-        while self.calcpend.get() != 0:
-            if time.time() - start > timeout:
-                break
-            time.sleep(0.01)
-
-        goal = self.setpoint.get()
-        ceil = self.trans_ceil.get()
-        floor = self.trans_floor.get()
+        start = time.monotonic()
+        calc_done = self.wait_for_calculation()
+        if not calc_done:
+            self.log.debug('%s no calculation finished after %s s, asking '
+                           'the IOC directly', self.name,
+                           self.calcpend_timeout)
+            if self.calcpend.get(use_monitor=False) == 0:
+                # The put did not need a new calculation
+                self._calc_done.set()
+        # Accumulate: this property may be evaluated more than once per move
+        self._calc_wait_time += time.monotonic() - start
+
+        if self._move_goal is not None:
+            goal = self._move_goal
+        else:
+            goal = self.setpoint.get()
+        ceil = self.trans_ceil.get(use_monitor=calc_done)
+        floor = self.trans_floor.get(use_monitor=calc_done)
 
         if abs(goal - ceil) > abs(goal - floor):
             return 2
@@ -291,12 +351,33 @@ class AttBase(FltMvInterface, PVPositionerNoInterrupt):
         This was needed because the status PV in the attenuator IOC does not
         react if we request a move to a transmission we've already reached.
         Therefore, this prevents a pointless timeout.
+
+        The time spent waiting for the IOC calculation and the rest of the
+        move setup is stored in ``last_move_timing``.
         """
 
+        start = time.monotonic()
         old_position = self.position
-        super()._setup_move(position)
+        self._move_goal = position
+        self._calc_wait_time = 0.0
+        # Any done flag left over from the previous calculation is stale
+        # once we put the new setpoint
+        self._calc_seq += 1
+        self._calc_done.clear()
+        try:
+            super()._setup_move(position)
+        finally:
+            self._move_goal = None
         ceil = self.trans_ceil.get()
         floor = self.trans_floor.get()
+        total = time.monotonic() - start
+        self.last_move_timing = {
+            'calc_wait': self._calc_wait_time,
+            'setup': total - self._calc_wait_time,
+            'total': total,
+        }
+        self.log.debug('%s move setup timing: %s', self.name,
+                       self.last_move_timing)
         if any(np.isclose((old_position, old_position), (ceil, floor))):
             moving_val = 1 - self.done_value
             self._move_changed(value=moving_val)
@@ -780,6 +861,98 @@ class AttenuatorCalculatorBase(BaseInterface, Device):
         self.run_calculation.put(1, wait=True)
         return self.get_best_config(use_monitor=False)
 
+    def get_filter_specs(self):
+        """
+        Read the filter materials and thicknesses for the offline solver.
+
+        Filters that are inactive or stuck are marked as unusable.
+
+        Returns
+        -------
+        blades : list of list of FilterSpec
+            The filters of each blade, in filter index order.
+        """
+        def spec(filt):
+            return FilterSpec(
+                material=filt.material.get(),
+                thickness=float(filt.thickness.get()),
+                usable=bool(filt.active.get()) and not filt.is_stuck.get(),
+            )
+
+        blades = []
+        for index in sorted(self.filters_by_index):
+            blade = self.filters_by_index[index]
+            if hasattr(blade, '_filter_index_to_attr'):
+                # A blade holding several filters
+                blades.append([
+                    spec(getattr(blade, blade._filter_index_to_attr[idx]))
+                    for idx in sorted(blade._filter_index_to_attr)
+                ])
+            else:
+                blades.append([spec(blade)])
+        return blades
+
+    def make_solver(self, attenuation_length=None, blades=None):
+        """
+        Create an offline solver for this attenuator.
+
+        Parameters
+        ----------
+        attenuation_length : callable, optional
+            The attenuation length table to use, see
+            `attenuator_solver.AttenuationLengthTable`.
+        blades : list of list of FilterSpec, optional
+            A cached filter table. If omitted, this is read from the
+            filter signals with `get_filter_specs`.
+
+        Returns
+        -------
+        solver : SolidAttenuatorSolver
+        """
+        if blades is None:
+            blades = self.get_filter_specs()
+        return SolidAttenuatorSolver(
+            blades, attenuation_length=attenuation_length
+        )
+
+    def calculate_local(self, transmission, *, energy=None, use_floor=True,
+                        solver=None):
+        """
+        Calculate blade configurations locally, without the IOC.
+
+        This accepts arrays of transmissions and energies, unlike
+        `calculate`, which remains available for cross-checking.
+
+        Parameters
+        ----------
+        transmission : float or array-like
+            The desired transmissions, in the range [0, 1].
+
+        energy : float or array-like, optional
+            The photon energies in eV. Defaults to the reported beamline
+            photon energy.
+
+        use_floor : bool, optional
+            Select floor or ceiling transmission estimation.  Defaults to
+            floor.
+
+        solver : SolidAttenuatorSolver, optional
+            A solver to reuse. If omitted, one is created with
+            `make_solver`.
+
+        Returns
+        -------
+        config : np.ndarray
+            One row per request with one entry per blade: 0 if removed,
+            otherwise the 1-based index of the inserted filter.
+        """
+        if solver is None:
+            solver = self.make_solver()
+        if energy is None:
+            energy = self.energy_actual.get()
+        solution = solver.solve(transmission, energy)
+        return solution.best_config(use_floor=use_floor)
+
 
 class AttenuatorCalculator_AT2L0(AttenuatorCalculatorBase):
     """
@@ -1064,7 +1237,9 @@ class AttenuatorSXR_Ladder(FltMvInterface, PVPositionerPC,
                 cpt_name = cpt_name.removesuffix('_state_state')
                 lightpath_kwargs[cpt_name] = sig.get()
 
-            self._cached_state = self.calc_lightpath_state(**lightpath_kwargs)
+            self._update_lightpath_state(
+                self.calc_lightpath_state(**lightpath_kwargs)
+            )
 
         return self._cached_state
 
@@ -1235,7 +1410,9 @@ class AttenuatorSXR_LadderTwoBladeLBD(FltMvInterface, PVPositionerPC,
                 cpt_name = cpt_name.removesuffix('_state_state')
                 lightpath_kwargs[cpt_name] = sig.get()
 
-            self._cached_state = self.calc_lightpath_state(**lightpath_kwargs)
+            self._update_lightpath_state(
+                self.calc_lightpath_state(**lightpath_kwargs)
+            )
 
         return self._cached_state
 
@@ -1588,7 +1765,9 @@ class AT2L0(FltMvInterface, PVPositionerPC, LightpathMixin):
                 cpt_name = cpt_name.removesuffix('_state_state')
                 lightpath_kwargs[cpt_name] = sig.get()
 
-            self._cached_state = self.calc_lightpath_state(**lightpath_kwargs)
+            self._update_lightpath_state(
+                self.calc_lightpath_state(**lightpath_kwargs)
+            )
 
         return self._cached_state
 
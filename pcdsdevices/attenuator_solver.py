@@ -0,0 +1,375 @@
+"""
+Offline blade-combination solver for solid attenuators.
+
+This mirrors the floor/ceiling calculation of the solid attenuator IOCs
+(see `AttenuatorCalculatorBase.calculate`) without any round trips, so
+that many (transmission, energy) pairs can be solved at once, e.g. to
+precompute the configurations used in a transmission scan.
+
+An attenuator is described as a sequence of blades. Each blade can either
+be removed or have exactly one of its filters inserted. Solid attenuators
+with individual in/out filters (e.g. AT2L0) have one filter per blade,
+while the SXR ladder attenuators have up to 8 filters per blade.
+
+Configurations are reported as one integer per blade: 0 for a removed
+blade, or the 1-based index of the inserted filter on that blade.
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+#: Signature of an attenuation length table: (material, energies in eV) ->
+#: attenuation lengths in microns, with the same shape as the energies.
+AttenuationLengthTable = Callable[[str, np.ndarray], np.ndarray]
+
+
+def xraydb_attenuation_length(material: str,
+                              energy: np.ndarray) -> np.ndarray:
+    """
+    Default attenuation length table, based on ``xraydb`` through pcdscalc.
+
+    This uses the elemental density of ``material``. Use a custom table if
+    your filters have a different density (e.g. diamond).
+
+    Parameters
+    ----------
+    material : str
+        The material formula, e.g. "Si".
+    energy : np.ndarray
+        Photon energies in eV.
+
+    Returns
+    -------
+    att_len : np.ndarray
+        The attenuation lengths in microns.
+    """
+    from pcdscalc.be_lens_calcs import get_att_len
+
+    # get_att_len takes keV and returns meters
+    return np.asarray(
+        get_att_len(np.asarray(energy) * 1.0e-3, material=material)
+    ) * 1.0e6
+
+
+@dataclasses.dataclass(frozen=True)
+class FilterSpec:
+    """
+    A single filter that may be inserted into the beam.
+
+    Attributes
+    ----------
+    material : str
+        The material formula, e.g. "Si".
+    thickness : float
+        The thickness in microns.
+    usable : bool
+        If False, the solver will never insert this filter (e.g. it is
+        inactive or stuck).
+    """
+    material: str
+    thickness: float
+    usable: bool = True
+
+
+@dataclasses.dataclass
+class AttenuatorSolution:
+    """
+    Floor and ceiling configurations for a set of requests.
+
+    All arrays have one row per requested (transmission, energy) pair.
+
+    Attributes
+    ----------
+    transmission : np.ndarray
+        The requested transmissions.
+    energy : np.ndarray
+        The photon energies used, in eV.
+    floor_config : np.ndarray
+        Integer array of shape (n_requests, n_blades), the configurations
+        with the highest transmission at or below the request.
+    floor_transmission : np.ndarray
+        The transmission of each floor configuration.
+    ceiling_config : np.ndarray
+        Integer array of shape (n_requests, n_blades), the configurations
+        with the lowest transmission at or above the request.
+    ceiling_transmission : np.ndarray
+        The transmission of each ceiling configuration.
+    """
+    transmission: np.ndarray
+    energy: np.ndarray
+    floor_config: np.ndarray
+    floor_transmission: np.ndarray
+    ceiling_config: np.ndarray
+    ceiling_transmission: np.ndarray
+
+    def best_config(self, use_floor: bool = True) -> np.ndarray:
+        """Get the floor or ceiling configurations."""
+        return self.floor_config if use_floor else self.ceiling_config
+
+    def best_transmission(self, use_floor: bool = True) -> np.ndarray:
+        """Get the floor or ceiling transmissions."""
+        if use_floor:
+            return self.floor_transmission
+        return self.ceiling_transmission
+
+
+class SolidAttenuatorSolver:
+    """
+    Vectorized floor/ceiling solver over all blade combinations.
+
+    All ``prod(n_filters_per_blade + 1)`` combinations are enumerated with
+    NumPy in the log-transmission domain. The sorted combination table is
+    cached per photon energy, so repeated queries at the same energy only
+    cost a ``searchsorted``.
+
+    Parameters
+    ----------
+    blades : sequence of sequence of FilterSpec
+        The filters available on each blade, in blade order.
+    attenuation_length : callable, optional
+        The attenuation length table to use. See `AttenuationLengthTable`.
+        Defaults to `xraydb_attenuation_length`.
+    max_cached_energies : int, optional
+        How many per-energy combination tables to keep.
+    """
+    # Refuse to enumerate more combinations than this
+    max_combinations = 2 ** 24
+
+    def __init__(
+        self,
+        blades: Sequence[Sequence[FilterSpec]],
+        attenuation_length: AttenuationLengthTable | None = None,
+        max_cached_energies: int = 16,
+    ):
+        self.blades = [list(blade) for blade in blades]
+        self.attenuation_length = (
+            attenuation_length or xraydb_attenuation_length
+        )
+        self.max_cached_energies = max_cached_energies
+        self._table_cache = {}
+        # Per blade, the 1-based filter numbers we are allowed to insert
+        self._options = [
+            np.asarray(
+                [0] + [idx for idx, filt in enumerate(blade, 1)
+                       if filt.usable],
+                dtype=int,
+            )
+            for blade in self.blades
+        ]
+        self._shape = tuple(len(opts) for opts in self._options)
+        n_combinations = int(np.prod(self._shape, dtype=np.int64))
+        if n_combinations > self.max_combinations:
+            raise ValueError(
+                f'Too many filter combinations to enumerate: {n_combinations}'
+            )
+        self.n_combinations = n_combinations
+
+    @classmethod
+    def from_table(
+        cls,
+        materials: Sequence[str],
+        thicknesses: Sequence[float],
+        usable: Sequence[bool] | None = None,
+        **kwargs,
+    ) -> SolidAttenuatorSolver:
+        """
+        Create a solver for an attenuator with one in/out filter per blade.
+
+        Parameters
+        ----------
+        materials : sequence of str
+            The material of each filter.
+        thicknesses : sequence of float
+            The thickness of each filter in microns.
+        usable : sequence of bool, optional
+            Which filters may be inserted. Defaults to all of them.
+        **kwargs
+            Passed to the constructor.
+        """
+        if usable is None:
+            usable = [True] * len(materials)
+        if not len(materials) == len(thicknesses) == len(usable):
+            raise ValueError(
+                'materials, thicknesses and usable must have the same length'
+            )
+        blades = [
+            [FilterSpec(material, float(thickness), bool(ok))]
+            for material, thickness, ok in zip(materials, thicknesses, usable)
+        ]
+        return cls(blades, **kwargs)
+
+    def clear_cache(self) -> None:
+        """Forget all cached per-energy combination tables."""
+        self._table_cache.clear()
+
+    def _log_transmission_options(self, energies: np.ndarray) -> list:
+        """
+        Get the log transmission of each blade option at each energy.
+
+        Returns one array per blade of shape (n_options, n_energies), where
+        the first option (removed) is always 0.
+        """
+        att_lens = {}
+        for material in {filt.material for blade in self.blades
+                         for filt in blade if filt.usable}:
+            att_lens[material] = np.asarray(
+                self.attenuation_length(material, energies), dtype=float
+            )
+
+        options = []
+        for blade, opts in zip(self.blades, self._options):
+            log_trans = np.zeros((len(opts), len(energies)))
+            for row, filter_number in enumerate(opts[1:], 1):
+                filt = blade[filter_number - 1]
+                log_trans[row] = -filt.thickness / att_lens[filt.material]
+            options.append(log_trans)
+        return options
+
+    def _tables(self, energies: np.ndarray) -> dict:
+        """
+        Get the sorted combination tables for each unique energy.
+
+        Each table is a tuple of (sorted log transmissions, flat indices).
+        """
+        tables = {}
+        missing = []
+        for energy in energies:
+            try:
+                tables[energy] = self._table_cache[energy]
+            except KeyError:
+                missing.append(energy)
+
+        if missing:
+            options = self._log_transmission_options(
+                np.asarray(missing, dtype=float)
+            )
+            for col, energy in enumerate(missing):
+                total = np.zeros(1)
+                for blade_opts in options:
+                    total = np.add.outer(total, blade_opts[:, col]).ravel()
+                order = np.argsort(total, kind='stable')
+                tables[energy] = (total[order], order)
+                if self.max_cached_energies > 0:
+                    if len(self._table_cache) >= self.max_cached_energies:
+                        # Drop the oldest entry
+                        self._table_cache.pop(next(iter(self._table_cache)))
+                    self._table_cache[energy] = tables[energy]
+        return tables
+
+    def _flat_to_config(self, flat_indices: np.ndarray) -> np.ndarray:
+        """Convert flat combination indices to per-blade filter numbers."""
+        if not self._shape:
+            return np.zeros((len(flat_indices), 0), dtype=int)
+        option_indices = np.unravel_index(flat_indices, self._shape)
+        return np.stack(
+            [opts[idx] for opts, idx in zip(self._options, option_indices)],
+            axis=-1,
+        )
+
+    def transmission_of(self, config, energy) -> np.ndarray:
+        """
+        Calculate the transmission of the given configurations.
+
+        Parameters
+        ----------
+        config : array-like
+            Integer array of shape (n_blades,) or (n, n_blades), using the
+            same convention as the solver output.
+        energy : float or array-like
+            Photon energy in eV, broadcastable against the configurations.
+
+        Returns
+        -------
+        transmission : np.ndarray
+            The transmission of each configuration.
+        """
+        config = np.atleast_2d(np.asarray(config, dtype=int))
+        energy = np.broadcast_to(
+            np.asarray(energy, dtype=float), (config.shape[0],)
+        )
+        unique, inverse = np.unique(energy, return_inverse=True)
+        options = self._log_transmission_options(unique)
+        log_trans = np.zeros(config.shape[0])
+        for blade_idx, (blade_opts, allowed) in enumerate(
+            zip(options, self._options)
+        ):
+            filter_numbers = config[:, blade_idx]
+            rows = np.searchsorted(allowed, filter_numbers)
+            rows = np.clip(rows, 0, len(allowed) - 1)
+            if np.any(allowed[rows] != filter_numbers):
+                raise ValueError(
+                    f'Configuration uses an unusable filter on blade '
+                    f'{blade_idx}: {filter_numbers}'
+                )
+            log_trans += blade_opts[rows, inverse]
+        return np.exp(log_trans)
+
+    def solve(self, transmission, energy) -> AttenuatorSolution:
+        """
+        Find the floor and ceiling configurations for each request.
+
+        Parameters
+        ----------
+        transmission : float or array-like
+            The desired transmissions, in the range [0, 1].
+        energy : float or array-like
+            The photon energies in eV, broadcastable against
+            ``transmission``.
+
+        Returns
+        -------
+        solution : AttenuatorSolution
+            The floor and ceiling configurations and transmissions. If no
+            configuration is at or below (above) a request, the floor
+            (ceiling) is the lowest (highest) transmission available.
+        """
+        transmission, energy = np.broadcast_arrays(
+            np.asarray(transmission, dtype=float),
+            np.asarray(energy, dtype=float),
+        )
+        transmission = transmission.ravel()
+        energy = energy.ravel()
+        if np.any((transmission < 0) | (transmission > 1)):
+            raise ValueError('Transmission must be in the range [0, 1]')
+
+        n_requests = len(transmission)
+        floor_flat = np.zeros(n_requests, dtype=np.int64)
+        ceil_flat = np.zeros(n_requests, dtype=np.int64)
+        floor_log = np.zeros(n_requests)
+        ceil_log = np.zeros(n_requests)
+
+        with np.errstate(divide='ignore'):
+            log_request = np.log(transmission)
+
+        unique, inverse = np.unique(energy, return_inverse=True)
+        tables = self._tables([float(value) for value in unique])
+        for idx, value in enumerate(unique):
+            sorted_log, order = tables[float(value)]
+            mask = inverse == idx
+            request = log_request[mask]
+            last = len(sorted_log) - 1
+            # Highest transmission at or below the request
+            below = np.searchsorted(sorted_log, request, side='right') - 1
+            below = np.clip(below, 0, last)
+            # Lowest transmission at or above the request
+            above = np.searchsorted(sorted_log, request, side='left')
+            above = np.clip(above, 0, last)
+            floor_flat[mask] = order[below]
+            ceil_flat[mask] = order[above]
+            floor_log[mask] = sorted_log[below]
+            ceil_log[mask] = sorted_log[above]
+
+        return AttenuatorSolution(
+            transmission=transmission,
+            energy=energy,
+            floor_config=self._flat_to_config(floor_flat),
+            floor_transmission=np.exp(floor_log),
+            ceiling_config=self._flat_to_config(ceil_flat),
+            ceiling_transmission=np.exp(ceil_log),
+        )
@@ -727,6 +727,8 @@ class CCMEnergyWithVernier(CCMEnergy):
 
     # These are duplicate warnings with main energy motor
     _enable_warn_constants: bool = False
+    # Batch notepad readback writes from the alio encoder
+    notepad_max_rate = 10
     hutch: str
 
     def __init__(
@@ -0,0 +1,426 @@
+"""
+Bulk configuration snapshots for many devices at once.
+
+``read_configuration`` reads one signal at a time. For config-heavy devices
+such as digitizers and timing receivers this adds up to hundreds of
+sequential round trips per device. The tools here read the configuration
+signals of many devices concurrently, store them in a compact columnar
+file, compare snapshots with each other or with live values, and restore
+values through `pcdsdevices.utils.set_many`.
+
+Example
+-------
+
+.. code-block:: python
+
+    snap = snapshot_configuration([wave8, qadc])
+    snap.save("detectors.json.gz")
+    ...
+    reference = ConfigSnapshot.load("detectors.json.gz")
+    for diff in reference.diff_live([wave8, qadc]):
+        print(diff)
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import gzip
+import json
+import logging
+import math
+import time
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+import ophyd
+from ophyd import Kind
+from ophyd.signal import EpicsSignalRO, SignalRO
+
+from .utils import set_many
+
+logger = logging.getLogger(__name__)
+
+#: Bump this if the on-disk layout changes.
+SNAPSHOT_FORMAT_VERSION = 1
+
+#: Marker for a key that only exists on one side of a diff.
+MISSING = "<missing>"
+
+
+def _iter_config_readers(obj):
+    """
+    Find the objects whose ``read_configuration`` make up ``obj``'s.
+
+    This follows ``Device.read_configuration``: components of kind config
+    are included, and devices are walked recursively. Devices that override
+    ``read_configuration`` are read as a whole.
+    """
+    if (
+        isinstance(obj, ophyd.Device)
+        and type(obj).read_configuration is ophyd.Device.read_configuration
+    ):
+        for _, component in obj._get_components_of_kind(Kind.config):
+            yield from _iter_config_readers(component)
+    else:
+        yield obj
+
+
+def _iter_config_signals(obj):
+    """Find the configuration signals of ``obj``, by their read key."""
+    for reader in _iter_config_readers(obj):
+        if isinstance(reader, ophyd.Signal):
+            yield reader.name, reader
+        else:
+            for sig in reader.walk_signals():
+                yield sig.item.name, sig.item
+
+
+def _to_serializable(value):
+    """Convert numpy scalars and arrays to plain python for JSON."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_to_serializable(val) for val in value]
+    return value
+
+
+def values_equal(value1, value2, rtol: float = 0.0, atol: float = 0.0) -> bool:
+    """
+    Compare two configuration values.
+
+    Sequences are compared element-wise. Floats are compared with
+    ``math.isclose`` using ``rtol`` and ``atol``; NaN equals NaN.
+    """
+    if isinstance(value1, (list, tuple, np.ndarray)) or isinstance(
+        value2, (list, tuple, np.ndarray)
+    ):
+        try:
+            arr1 = np.asarray(value1)
+            arr2 = np.asarray(value2)
+        except Exception:
+            return False
+        if arr1.shape != arr2.shape:
+            return False
+        if arr1.dtype.kind in "fc" or arr2.dtype.kind in "fc":
+            try:
+                return bool(
+                    np.allclose(arr1, arr2, rtol=rtol, atol=atol, equal_nan=True)
+                )
+            except TypeError:
+                return False
+        return bool(np.array_equal(arr1, arr2))
+    if isinstance(value1, float) or isinstance(value2, float):
+        try:
+            if math.isnan(value1) and math.isnan(value2):
+                return True
+            return math.isclose(value1, value2, rel_tol=rtol, abs_tol=atol)
+        except TypeError:
+            return False
+    return value1 == value2
+
+
+@dataclasses.dataclass(frozen=True)
+class ConfigDifference:
+    """
+    One configuration value that differs between two snapshots.
+
+    Attributes
+    ----------
+    device : str
+        The name of the top-level device.
+    key : str
+        The ``read_configuration`` key, i.e. the signal name.
+    old : any
+        The value in the reference snapshot, or `MISSING`.
+    new : any
+        The value in the other snapshot, or `MISSING`.
+    """
+    device: str
+    key: str
+    old: Any
+    new: Any
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.old!r} -> {self.new!r}"
+
+
+@dataclasses.dataclass
+class ConfigSnapshot:
+    """
+    Configuration values of several devices, stored column-wise.
+
+    Row ``i`` of the snapshot is ``keys[i]`` on device
+    ``device_names[device_index[i]]`` with ``values[i]`` read at
+    ``timestamps[i]``.
+
+    Attributes
+    ----------
+    device_names : list of str
+        The top-level device names.
+    device_index : list of int
+        Index into ``device_names`` for each row.
+    keys : list of str
+        The ``read_configuration`` key for each row.
+    values : list
+        The value for each row.
+    timestamps : list of float
+        The timestamp reported with each value.
+    created : float
+        When the snapshot was taken.
+    errors : dict of str to str
+        Keys that could not be read, with the reason.
+    """
+    device_names: list[str] = dataclasses.field(default_factory=list)
+    device_index: list[int] = dataclasses.field(default_factory=list)
+    keys: list[str] = dataclasses.field(default_factory=list)
+    values: list[Any] = dataclasses.field(default_factory=list)
+    timestamps: list[float] = dataclasses.field(default_factory=list)
+    created: float = dataclasses.field(default_factory=time.time)
+    errors: dict[str, str] = dataclasses.field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        """Get ``{device_name: {key: value}}``."""
+        result = {name: {} for name in self.device_names}
+        for idx, key, value in zip(self.device_index, self.keys, self.values):
+            result[self.device_names[idx]][key] = value
+        return result
+
+    def _rows(self) -> dict[str, tuple[str, Any]]:
+        """Get ``{key: (device_name, value)}``."""
+        return {
+            key: (self.device_names[idx], value)
+            for idx, key, value in zip(self.device_index, self.keys, self.values)
+        }
+
+    def diff(
+        self,
+        other: ConfigSnapshot,
+        rtol: float = 0.0,
+        atol: float = 0.0,
+    ) -> list[ConfigDifference]:
+        """
+        Compare this snapshot with ``other``.
+
+        Parameters
+        ----------
+        other : ConfigSnapshot
+            The snapshot to compare against. This snapshot is the reference
+            (``old``) side.
+        rtol, atol : float, optional
+            Tolerances for floating point values, see `values_equal`.
+
+        Returns
+        -------
+        list of ConfigDifference
+            In the order of this snapshot, followed by keys only present in
+            ``other``.
+        """
+        mine = self._rows()
+        theirs = other._rows()
+        differences = []
+        for key, (device, value) in mine.items():
+            if key not in theirs:
+                differences.append(ConfigDifference(device, key, value, MISSING))
+                continue
+            other_value = theirs[key][1]
+            if not values_equal(value, other_value, rtol=rtol, atol=atol):
+                differences.append(
+                    ConfigDifference(device, key, value, other_value)
+                )
+        for key, (device, value) in theirs.items():
+            if key not in mine:
+                differences.append(ConfigDifference(device, key, MISSING, value))
+        return differences
+
+    def diff_live(
+        self,
+        devices: Sequence[ophyd.ophydobj.OphydObject],
+        rtol: float = 0.0,
+        atol: float = 0.0,
+        **kwargs,
+    ) -> list[ConfigDifference]:
+        """
+        Compare this snapshot with the current values of ``devices``.
+
+        Keyword arguments are passed on to `snapshot_configuration`.
+        """
+        live = snapshot_configuration(devices, **kwargs)
+        return self.diff(live, rtol=rtol, atol=atol)
+
+    def restore(
+        self,
+        devices: Sequence[ophyd.ophydobj.OphydObject],
+        *,
+        only_differences: bool = True,
+        rtol: float = 0.0,
+        atol: float = 0.0,
+        timeout: float | None = None,
+        raise_on_set_failure: bool = False,
+        **kwargs,
+    ) -> ophyd.status.StatusBase:
+        """
+        Put the snapshot values back on ``devices`` using `set_many`.
+
+        Read-only signals are skipped.
+
+        Parameters
+        ----------
+        devices : sequence of OphydObject
+            The devices to restore.
+        only_differences : bool, optional
+            Only set the signals whose live values differ. Defaults to True.
+        rtol, atol : float, optional
+            Tolerances used to find the differences.
+        timeout : float, optional
+            Per-signal timeout, passed to `set_many`.
+        raise_on_set_failure : bool, optional
+            Passed to `set_many`.
+        **kwargs
+            Passed to `snapshot_configuration` to read the live values.
+
+        Returns
+        -------
+        status : StatusBase
+            The combined status of all the ``set`` calls.
+        """
+        signals = {}
+        for device in devices:
+            signals.update(_iter_config_signals(device))
+
+        if only_differences:
+            to_restore = {
+                diff.key: diff.old
+                for diff in self.diff_live(devices, rtol=rtol, atol=atol,
+                                           **kwargs)
+                if diff.old is not MISSING and diff.new is not MISSING
+            }
+        else:
+            to_restore = {
+                key: value for key, (_, value) in self._rows().items()
+            }
+
+        to_set = {}
+        for key, value in to_restore.items():
+            sig = signals.get(key)
+            if sig is None or isinstance(sig, (SignalRO, EpicsSignalRO)):
+                continue
+            to_set[sig] = value
+
+        logger.debug("Restoring %d configuration values", len(to_set))
+        return set_many(
+            to_set, timeout=timeout, raise_on_set_failure=raise_on_set_failure
+        )
+
+    def save(self, filename: str) -> None:
+        """
+        Save the snapshot as JSON, gzipped if ``filename`` ends in ``.gz``.
+        """
+        data = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "created": self.created,
+            "device_names": self.device_names,
+            "columns": {
+                "device_index": self.device_index,
+                "key": self.keys,
+                "value": _to_serializable(self.values),
+                "timestamp": self.timestamps,
+            },
+            "errors": self.errors,
+        }
+        opener = gzip.open if str(filename).endswith(".gz") else open
+        with opener(filename, "wt") as fd:
+            json.dump(data, fd, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, filename: str) -> ConfigSnapshot:
+        """Load a snapshot written by :meth:`save`."""
+        opener = gzip.open if str(filename).endswith(".gz") else open
+        with opener(filename, "rt") as fd:
+            data = json.load(fd)
+        if data.get("version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot format version: {data.get('version')}"
+            )
+        columns = data["columns"]
+        return cls(
+            device_names=data["device_names"],
+            device_index=columns["device_index"],
+            keys=columns["key"],
+            values=columns["value"],
+            timestamps=columns["timestamp"],
+            created=data["created"],
+            errors=data.get("errors", {}),
+        )
+
+
+def snapshot_configuration(
+    devices: Iterable[ophyd.ophydobj.OphydObject],
+    *,
+    max_workers: int = 16,
+    timeout: float | None = None,
+) -> ConfigSnapshot:
+    """
+    Read the configuration of many devices concurrently.
+
+    The result matches calling ``read_configuration`` on each device, but
+    the individual configuration signals are read in parallel from a thread
+    pool instead of one after the other.
+
+    Parameters
+    ----------
+    devices : iterable of OphydObject
+        The devices to read.
+    max_workers : int, optional
+        The number of concurrent reads.
+    timeout : float, optional
+        Give up on reads that have not finished after this many seconds
+        in total. Unfinished and failed reads are listed in
+        ``ConfigSnapshot.errors``.
+
+    Returns
+    -------
+    ConfigSnapshot
+    """
+    devices = list(devices)
+    snapshot = ConfigSnapshot(device_names=[device.name for device in devices])
+    tasks = [
+        (device_idx, reader)
+        for device_idx, device in enumerate(devices)
+        for reader in _iter_config_readers(device)
+    ]
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(tasks)))
+    )
+    try:
+        futures = [
+            executor.submit(reader.read_configuration) for _, reader in tasks
+        ]
+        concurrent.futures.wait(futures, timeout=timeout)
+    finally:
+        # Do not wait for reads that are stuck past the timeout
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Assemble in device/component order, like read_configuration
+    for (device_idx, reader), future in zip(tasks, futures):
+        if not future.done():
+            future.cancel()
+            snapshot.errors[reader.name] = "Timed out"
+            continue
+        try:
+            result = future.result()
+        except Exception as ex:
+            logger.debug("Failed to read %s", reader.name, exc_info=True)
+            snapshot.errors[reader.name] = f"{type(ex).__name__}: {ex}"
+            continue
+        for key, reading in result.items():
+            snapshot.device_index.append(device_idx)
+            snapshot.keys.append(key)
+            snapshot.values.append(reading["value"])
+            snapshot.timestamps.append(reading.get("timestamp", 0.0))
+    return snapshot
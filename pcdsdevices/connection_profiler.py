@@ -0,0 +1,440 @@
+"""
+Connection-latency profiling for device trees.
+
+When a session takes a long time to come up, it is not obvious which devices
+or PVs are responsible. `ConnectionProfiler` records, for every signal of one
+or more devices, how long it took to:
+
+* connect its channels,
+* receive its initial metadata (the ophyd ``SUB_META`` event with
+  ``connected=True``),
+* receive its first value from a monitor, and
+* become ready, i.e. ``signal.connected`` is True. This includes the
+  enum attribute signals of `EpicsSignalBaseEditMD` and the constituent
+  signals of `AggregateSignal`.
+
+The results are available as a sorted table of the slowest signals, see
+`ConnectionProfiler.report`, or as a flame-style tree aggregated by device
+hierarchy, see `ConnectionProfiler.tree`.
+
+Times are measured from ``start_time``. To include the time spent creating
+the devices, take the start time before instantiating them::
+
+    start = time.monotonic()
+    devices = load_my_devices()
+    profiler = profile_connections(devices, start_time=start)
+    print(profiler.report(n=20))
+    print(profiler.tree())
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+import math
+import threading
+import time
+from collections.abc import Iterable
+from typing import Optional
+
+import prettytable
+from ophyd import Device
+from ophyd.signal import Signal
+
+from .signal import AggregateSignal, EpicsSignalBaseEditMD
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class SignalTiming:
+    """
+    Connection timing information for a single signal.
+
+    All times are in seconds relative to the profiler start time, or None if
+    the event has not been seen yet.
+
+    Attributes
+    ----------
+    name : str
+        The full signal name.
+    path : tuple of str
+        The device name followed by the attribute names leading to the
+        signal, e.g. ``('mono', 'm_pi', 'user_readback')``.
+    pvname : str
+        The PV name, if any.
+    connect : float or None
+        When all of the signal's channels were connected.
+    metadata : float or None
+        When the signal reported its initial metadata.
+    first_value : float or None
+        When the first value arrived through a monitor.
+    ready : float or None
+        When ``signal.connected`` first reported True.
+    pending : list of str
+        The names of signals the readiness is still waiting on, e.g. the
+        enum attribute signals of an `EpicsSignalBaseEditMD`.
+    """
+    name: str
+    path: tuple[str, ...]
+    pvname: str = ''
+    connect: Optional[float] = None
+    metadata: Optional[float] = None
+    first_value: Optional[float] = None
+    ready: Optional[float] = None
+    pending: list[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        """The time to readiness, or infinity if it never became ready."""
+        return math.inf if self.ready is None else self.ready
+
+
+def _format_time(value: Optional[float]) -> str:
+    return '-' if value is None else f'{value:.3f}'
+
+
+def _pending_signals(signal: Signal) -> list[Signal]:
+    """Get the signals that ``signal`` still waits on to become ready."""
+    if isinstance(signal, EpicsSignalBaseEditMD):
+        return list(signal._pending_signals)
+    if isinstance(signal, AggregateSignal):
+        return [
+            sig for sig, info in list(signal._signals.items())
+            if not (info.connected and info.value is not None)
+        ]
+    return []
+
+
+def _channels_connected(signal: Signal) -> bool:
+    """Are all of the signal's channels connected, ignoring metadata?"""
+    states = getattr(signal, '_connection_states', None)
+    if states:
+        return all(states.values())
+    if isinstance(signal, (AggregateSignal, EpicsSignalBaseEditMD)):
+        # Readiness includes more than the channels here, so look at the
+        # channel-level metadata instead.
+        if isinstance(signal, AggregateSignal):
+            return all(sig.connected for sig in list(signal._signals))
+        return bool(signal._metadata.get('connected', False))
+    return signal.connected
+
+
+class ConnectionProfiler:
+    """
+    Record per-signal connection latencies for a set of devices.
+
+    Subscribing to the signals starts their monitors, so the profiler should
+    be started right after the devices are created.
+
+    Parameters
+    ----------
+    devices : Device, Signal or iterable of them
+        The objects to profile.
+    start_time : float, optional
+        The reference time, as given by ``clock``. Defaults to the time at
+        which `start` is called.
+    include_lazy : bool, optional
+        Whether to instantiate and profile lazy components. Defaults to
+        False, so only the signals that already exist are profiled.
+    clock : callable, optional
+        The time source. Defaults to `time.monotonic`.
+    """
+    def __init__(
+        self,
+        devices,
+        start_time: Optional[float] = None,
+        include_lazy: bool = False,
+        clock=time.monotonic,
+    ):
+        if isinstance(devices, (Device, Signal)):
+            devices = [devices]
+        self.devices = list(devices)
+        self.start_time = start_time
+        self.include_lazy = include_lazy
+        self.clock = clock
+        self.timings: dict[Signal, SignalTiming] = {}
+        self._subscriptions = []
+        self._lock = threading.RLock()
+
+    def _elapsed(self) -> float:
+        return self.clock() - self.start_time
+
+    def _collect_signals(self) -> Iterable[tuple[tuple[str, ...], Signal]]:
+        """Yield the path and signal of everything that will be profiled."""
+        for obj in self.devices:
+            if isinstance(obj, Signal):
+                yield (obj.name, ), obj
+                continue
+            for walk in obj.walk_signals(include_lazy=self.include_lazy):
+                yield (obj.name, *walk.dotted_name.split('.')), walk.item
+
+    def start(self) -> ConnectionProfiler:
+        """Subscribe to all signals and start recording."""
+        if self.start_time is None:
+            self.start_time = self.clock()
+
+        for path, signal in self._collect_signals():
+            if signal in self.timings:
+                continue
+            timing = SignalTiming(
+                name=signal.name,
+                path=path,
+                pvname=str(getattr(signal, 'pvname', '') or ''),
+            )
+            with self._lock:
+                self.timings[signal] = timing
+            for event_type, callback in (
+                (signal.SUB_META, self._metadata_callback),
+                (signal.SUB_VALUE, self._value_callback),
+            ):
+                try:
+                    cid = signal.subscribe(
+                        callback, event_type=event_type, run=True
+                    )
+                except Exception:
+                    logger.debug('Failed to subscribe to %s', signal.name,
+                                 exc_info=True)
+                else:
+                    self._subscriptions.append((signal, cid))
+            self._check(signal)
+        return self
+
+    def stop(self) -> None:
+        """Unsubscribe from all signals, keeping the recorded timings."""
+        for signal, cid in self._subscriptions:
+            try:
+                signal.unsubscribe(cid)
+            except Exception:
+                logger.debug('Failed to unsubscribe from %s', signal.name,
+                             exc_info=True)
+        self._subscriptions.clear()
+        self.poll()
+
+    def _check(self, signal: Signal) -> None:
+        """Record any newly-reached connection milestones of ``signal``."""
+        with self._lock:
+            timing = self.timings.get(signal)
+            if timing is None:
+                return
+            now = self._elapsed()
+            if timing.connect is None and _channels_connected(signal):
+                timing.connect = now
+            if timing.ready is None and signal.connected:
+                timing.ready = now
+                if timing.connect is None:
+                    timing.connect = now
+            timing.pending = [sig.name for sig in _pending_signals(signal)]
+
+    def _metadata_callback(self, *, obj, connected=False, **kwargs):
+        with self._lock:
+            timing = self.timings.get(obj)
+            if timing is not None and connected and timing.metadata is None:
+                timing.metadata = self._elapsed()
+        self._check(obj)
+
+    def _value_callback(self, *, obj, value=None, **kwargs):
+        with self._lock:
+            timing = self.timings.get(obj)
+            if (timing is not None and value is not None
+                    and timing.first_value is None):
+                timing.first_value = self._elapsed()
+        self._check(obj)
+
+    def poll(self) -> None:
+        """
+        Check all signals that are not ready yet.
+
+        Channel connections and readiness do not always come with an event,
+        so these are also checked periodically by `wait`.
+        """
+        with self._lock:
+            signals = [sig for sig, timing in self.timings.items()
+                       if timing.ready is None or timing.connect is None]
+        for signal in signals:
+            self._check(signal)
+
+    @property
+    def complete(self) -> bool:
+        """True if all profiled signals are ready."""
+        with self._lock:
+            return all(timing.ready is not None
+                       for timing in self.timings.values())
+
+    def wait(self, timeout: Optional[float] = 10.0,
+             interval: float = 0.01) -> bool:
+        """
+        Wait for all signals to become ready.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time to wait, in seconds. None waits forever.
+        interval : float, optional
+            How often to check the signals that are not ready yet.
+
+        Returns
+        -------
+        complete : bool
+            True if all signals are ready, False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.poll()
+            if self.complete:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def slowest(self, n: Optional[int] = None) -> list[SignalTiming]:
+        """
+        Get the timings sorted by time to readiness, slowest first.
+
+        Signals that never became ready are listed first.
+        """
+        with self._lock:
+            timings = sorted(self.timings.values(),
+                             key=lambda timing: timing.total, reverse=True)
+        return timings if n is None else timings[:n]
+
+    def report(self, n: Optional[int] = 20) -> str:
+        """
+        Create a table of the slowest signals.
+
+        Parameters
+        ----------
+        n : int, optional
+            The number of signals to include. None includes all of them.
+
+        Returns
+        -------
+        report : str
+            The table, with times in seconds and "-" for missing events.
+        """
+        table = prettytable.PrettyTable()
+        table.field_names = ['Signal', 'PV', 'Connect', 'Metadata',
+                             'First value', 'Ready', 'Pending']
+        table.align = 'l'
+        for timing in self.slowest(n):
+            table.add_row([
+                timing.name,
+                timing.pvname,
+                _format_time(timing.connect),
+                _format_time(timing.metadata),
+                _format_time(timing.first_value),
+                _format_time(timing.ready),
+                ', '.join(timing.pending),
+            ])
+        return table.get_string()
+
+    def tree(self, width: int = 40, min_time: float = 0.0) -> str:
+        """
+        Create a flame-style tree of the time to readiness.
+
+        Each node shows the slowest signal below it, which is the time the
+        whole (sub-)device took to become ready, and a bar scaled to the
+        slowest node overall. Children are sorted slowest first.
+
+        Parameters
+        ----------
+        width : int, optional
+            The width of the longest bar, in characters.
+        min_time : float, optional
+            Hide nodes that were ready faster than this, in seconds.
+
+        Returns
+        -------
+        tree : str
+        """
+        root = {}
+        with self._lock:
+            timings = list(self.timings.values())
+        for timing in timings:
+            node = root
+            for part in timing.path:
+                node = node.setdefault(part, {})
+            node[None] = timing
+
+        def node_time(node):
+            if None in node:
+                return node[None].total
+            return max((node_time(child) for key, child in node.items()),
+                       default=0.0)
+
+        def node_count(node):
+            if None in node:
+                return 1
+            return sum(node_count(child) for child in node.values())
+
+        finite = [timing.total for timing in timings
+                  if timing.ready is not None]
+        scale = max(finite, default=0.0)
+        lines = []
+
+        def render(node, depth):
+            children = sorted(
+                ((key, child) for key, child in node.items()
+                 if key is not None),
+                key=lambda item: node_time(item[1]), reverse=True,
+            )
+            for key, child in children:
+                total = node_time(child)
+                if total < min_time:
+                    continue
+                if math.isinf(total):
+                    bar = '!' * width
+                    label = 'not ready'
+                else:
+                    filled = int(round(width * total / scale)) if scale else 0
+                    bar = '#' * filled
+                    label = f'{total:.3f}s'
+                count = node_count(child)
+                suffix = f' ({count} signals)' if None not in child else ''
+                lines.append(
+                    f'{bar:<{width}} {label:>9} {"  " * depth}{key}{suffix}'
+                )
+                render(child, depth + 1)
+
+        render(root, 0)
+        return '\n'.join(lines)
+
+
+def profile_connections(
+    devices,
+    timeout: Optional[float] = 10.0,
+    start_time: Optional[float] = None,
+    include_lazy: bool = False,
+) -> ConnectionProfiler:
+    """
+    Profile the connection of ``devices`` until they are ready.
+
+    Parameters
+    ----------
+    devices : Device, Signal or iterable of them
+        The objects to profile.
+    timeout : float, optional
+        The maximum time to wait for all signals to become ready.
+    start_time : float, optional
+        The reference time from `time.monotonic`, e.g. taken before the
+        devices were created.
+    include_lazy : bool, optional
+        Whether to instantiate and profile lazy components.
+
+    Returns
+    -------
+    profiler : ConnectionProfiler
+        The stopped profiler, see `ConnectionProfiler.report` and
+        `ConnectionProfiler.tree`.
+    """
+    profiler = ConnectionProfiler(devices, start_time=start_time,
+                                  include_lazy=include_lazy)
+    profiler.start()
+    try:
+        if not profiler.wait(timeout=timeout):
+            logger.warning(
+                'Not all signals were ready after %s s, see the report for '
+                'details.', timeout
+            )
+    finally:
+        profiler.stop()
+    return profiler
@@ -414,14 +414,14 @@ class GroupDevice(Device):
     ]
 
     def __init__(self, *args, **kwargs):
+        self._group_orphan_on_create = False
         super().__init__(*args, **kwargs)
         # Remove references to parent (in this case, self)
+        # Lazy components will be handled when they are instantiated
         for cpt_name in self.component_names:
-            cpt = getattr(self, cpt_name)
-            # The following types break without parents
-            if not isinstance(cpt, tuple(self.needs_parent)):
-                cpt._parent = None
-                cpt.biological_parent = self
+            if cpt_name in self._signals:
+                self._remove_parent(self._signals[cpt_name])
+        self._group_orphan_on_create = True
         if self.stage_group is None:
             self.stage_group = []
         else:
@@ -450,6 +450,19 @@ class GroupDevice(Device):
                         "Only Component types are allowed!"
                     )
 
+    def _remove_parent(self, cpt: OphydObject) -> None:
+        """Remove the parent reference from a component, if safe to do so."""
+        # The following types break without parents
+        if not isinstance(cpt, tuple(self.needs_parent)):
+            cpt._parent = None
+            cpt.biological_parent = self
+
+    def _instantiate_component(self, attr: str) -> OphydObject:
+        cpt = super()._instantiate_component(attr)
+        if getattr(self, '_group_orphan_on_create', False):
+            self._remove_parent(cpt)
+        return cpt
+
     def stage_group_instances(self) -> Iterator[OphydObject]:
         """Yields an iterator of subdevices that should be staged."""
         return (getattr(self, cpt.attr) for cpt in self.stage_group)
@@ -11,10 +11,13 @@ from ophyd.signal import EpicsSignal, EpicsSignalRO
 from pcdsdevices.variety import set_metadata
 
 from .interface import BaseInterface
+from .signal import ArrayHistorySignal
+from .utils import lazy_components_by_kind
 
 logger = logging.getLogger(__name__)
 
 
+@lazy_components_by_kind
 class Wave8V2SystemRegs(BaseInterface, Device):
     """
     Class for Wave8 system registers.
@@ -59,6 +62,7 @@ class Wave8V2SystemRegs(BaseInterface, Device):
     temp_dig_raw1 = Cpt(EpicsSignalRO, ':TempDigRaw1', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2RawBuffers(BaseInterface, Device):
     """
     Class for LCLS-II Wave8 raw buffer registers.
@@ -117,6 +121,7 @@ class Wave8V2RawBuffers(BaseInterface, Device):
     trigger_count = Cpt(EpicsSignalRO, ':TrigCnt', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2Sfp(BaseInterface, Device):
     """
     Class for LCLS-II Wave8 SFP connection (PGP, EVR).
@@ -129,6 +134,7 @@ class Wave8V2Sfp(BaseInterface, Device):
     tx_power = Cpt(EpicsSignalRO, ':TxPower_RBV', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2ADCRegs(BaseInterface, Device):
     """
     Class for accessing LCLS-II Wave8 ADC registers.
@@ -175,6 +181,7 @@ class Wave8V2ADCRegs(BaseInterface, Device):
                         write_pv=':AdcReg_0x0020', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2ADCSamples(BaseInterface, Device):
     """
     Class for the LCLS-II Wave8 ADC sample readout registers.
@@ -190,6 +197,7 @@ class Wave8V2ADCSamples(BaseInterface, Device):
     sample7 = Cpt(EpicsSignal, 'Sample[7]', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2ADCDelayLanes(BaseInterface, Device):
     """
     Class for the LCLS-II Wave8 ADC delay lanes.
@@ -204,6 +212,7 @@ class Wave8V2ADCDelayLanes(BaseInterface, Device):
     lane7 = Cpt(EpicsSignal, 'Lane7_RBV', write_pv='Lane7', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2ADCSampleReadout(BaseInterface, Device):
     """
     Class for the LCLS-II Wave8 ADC sample readout registers.
@@ -223,6 +232,7 @@ class Wave8V2ADCSampleReadout(BaseInterface, Device):
     adcB_delay_lanes = Cpt(Wave8V2ADCDelayLanes, ':DelayAdcB')
 
 
+@lazy_components_by_kind
 class Wave8V2AxiVersion(BaseInterface, Device):
     """
     Class for LCLS-II Wave8 AxiVersion registers.
@@ -244,6 +254,7 @@ class Wave8V2AxiVersion(BaseInterface, Device):
     uptime = Cpt(EpicsSignalRO, ':UpTime', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2EventBuilder(BaseInterface, Device):
     """
     Class for controlling the LCLS-II Wave8 event builder registers.
@@ -289,6 +300,7 @@ class Wave8V2EventBuilder(BaseInterface, Device):
     transaction_cnt = Cpt(EpicsSignalRO, ':TransactionCnt', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2EvrV2(BaseInterface, Device):
     """
     Class for LCLS-II Wave8 EVR V2 (TPR) registers.
@@ -315,6 +327,7 @@ class Wave8V2EvrV2(BaseInterface, Device):
                  kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2Integrators(BaseInterface, Device):
     """
     Class for controlling the LCLS-II Wave8 integrators.
@@ -365,6 +378,7 @@ class Wave8V2Integrators(BaseInterface, Device):
     trig_cnt = Cpt(EpicsSignalRO, ':TrigCnt', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2PgpMon(BaseInterface, Device):
     """
     Class for monitoring the PGP status of the LCLS-II Wave8.
@@ -427,6 +441,7 @@ class Wave8V2PgpMon(BaseInterface, Device):
                         kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2Timing(BaseInterface, Device):
     """
     Class for controlling the LCLS-II Wave8 timing registers.
@@ -456,6 +471,7 @@ class Wave8V2Timing(BaseInterface, Device):
                        write_pv=':UseMiniTpg', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2TriggerEventManager(BaseInterface, Device):
     """
     Class for controlling the LCLS-II Wave8 trigger event manager.
@@ -489,6 +505,7 @@ class Wave8V2TriggerEventManager(BaseInterface, Device):
                         write_pv=':TriggerDelay_RBV', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2XpmMini(BaseInterface, Device):
     """
     Class for controlling the LCLS-II Wave8 XPM Mini.
@@ -508,6 +525,7 @@ class Wave8V2XpmMini(BaseInterface, Device):
     link = Cpt(EpicsSignal, ':Link_RBV', write_pv=':Link', kind='config')
 
 
+@lazy_components_by_kind
 class Wave8V2XpmMsg(BaseInterface, Device):
     """
     Class for the LCLS-II Wave8 XPM message related PVs.
@@ -562,6 +580,23 @@ class Wave8V2Simple(BaseInterface, Device):
     ch6 = Cpt(EpicsSignalRO, ':CH6:ArrayData', kind='normal')
     ch7 = Cpt(EpicsSignalRO, ':CH7:ArrayData', kind='normal')
 
+    ch0_history = Cpt(ArrayHistorySignal, signal='ch0', size=120,
+                      lazy=True, kind='omitted')
+    ch1_history = Cpt(ArrayHistorySignal, signal='ch1', size=120,
+                      lazy=True, kind='omitted')
+    ch2_history = Cpt(ArrayHistorySignal, signal='ch2', size=120,
+                      lazy=True, kind='omitted')
+    ch3_history = Cpt(ArrayHistorySignal, signal='ch3', size=120,
+                      lazy=True, kind='omitted')
+    ch4_history = Cpt(ArrayHistorySignal, signal='ch4', size=120,
+                      lazy=True, kind='omitted')
+    ch5_history = Cpt(ArrayHistorySignal, signal='ch5', size=120,
+                      lazy=True, kind='omitted')
+    ch6_history = Cpt(ArrayHistorySignal, signal='ch6', size=120,
+                      lazy=True, kind='omitted')
+    ch7_history = Cpt(ArrayHistorySignal, signal='ch7', size=120,
+                      lazy=True, kind='omitted')
+
 
 class Wave8V2(Wave8V2Simple):
     """
@@ -648,8 +683,12 @@ class Qadc(QadcBase):
     off3_ni = Cpt(EpicsSignal, ":OFF3_NI", kind="omitted")
 
     out = Cpt(EpicsSignalRO, ":OUT", kind="normal")
+    out_history = Cpt(ArrayHistorySignal, signal='out', size=120,
+                      lazy=True, kind='omitted')
 
     rawdata = Cpt(EpicsSignalRO, ":RAWDATA", kind="normal")
+    rawdata_history = Cpt(ArrayHistorySignal, signal='rawdata', size=120,
+                          lazy=True, kind='omitted')
 
     start = Cpt(EpicsSignal, ":START", kind="normal")
 
@@ -715,4 +754,13 @@ class Qadc134(QadcBase):
     rawdata1 = Cpt(EpicsSignalRO, ":RAWDATA1", kind="normal",
                    doc="Signal in ADU")
 
+    out0_history = Cpt(ArrayHistorySignal, signal='out0', size=120,
+                       lazy=True, kind='omitted')
+    out1_history = Cpt(ArrayHistorySignal, signal='out1', size=120,
+                       lazy=True, kind='omitted')
+    rawdata0_history = Cpt(ArrayHistorySignal, signal='rawdata0', size=120,
+                           lazy=True, kind='omitted')
+    rawdata1_history = Cpt(ArrayHistorySignal, signal='rawdata1', size=120,
+                           lazy=True, kind='omitted')
+
     start = Cpt(EpicsSignal, ":START", kind="normal")
@@ -5,6 +5,7 @@ import functools
 import logging
 import shutil
 import subprocess
+import threading
 import time
 from enum import Enum
 from typing import Callable, ClassVar, Optional
@@ -728,6 +729,205 @@ class PCDSMotorBase(EpicsMotorInterface):
             self.set_use_switch.put(0, wait=True)
 
 
+def _caget_pmgr_fields(pvnames, enums):
+    """
+    Read many pmgr field PVs at once with ``epics.caget_many``.
+
+    Enumerated fields are read as strings, the same as pmgr does.
+    """
+    import epics
+
+    values = [None] * len(pvnames)
+    for as_string in (False, True):
+        indices = [idx for idx, enum in enumerate(enums) if enum == as_string]
+        if not indices:
+            continue
+        results = epics.caget_many([pvnames[idx] for idx in indices],
+                                   as_string=as_string, as_numpy=False)
+        for idx, value in zip(indices, results):
+            values[idx] = value
+    return values
+
+
+class PmgrCache:
+    """
+    Session cache of the parameter manager tables.
+
+    The upstream ``pmgrAPI`` re-reads the database and does a linear search
+    over every object on each call. This wraps a ``pmgrAPI`` instance and
+    keeps an index of the objects by ``rec_base`` and of the configurations
+    by name, which is only rebuilt by an explicit `refresh`.
+
+    Parameters
+    ----------
+    pm : pmgr.pmgrAPI.pmgrAPI
+        The parameter manager API object to wrap.
+    reader : callable, optional
+        A function ``reader(pvnames, enums)`` that returns the live value of
+        each PV, reading enumerated fields as strings. Defaults to a grouped
+        ``epics.caget_many``.
+    """
+    # Relative tolerance for floating point comparisons, same as pmgr
+    float_tolerance = 1e-8
+
+    def __init__(self, pm, reader=None):
+        self.pm = pm
+        self.reader = reader or _caget_pmgr_fields
+        self.refresh_count = 0
+        self._lock = threading.RLock()
+        self._by_rec_base = None
+        self._cfg_by_name = None
+
+    @property
+    def tables(self):
+        """The underlying ``pmgrobj`` holding the database tables."""
+        return self.pm.pm
+
+    def refresh(self):
+        """Re-read the database, if needed, and rebuild the indices."""
+        with self._lock:
+            self.pm.update_db()
+            self._by_rec_base = {
+                obj['rec_base']: obj for obj in self.tables.objs.values()
+            }
+            self._cfg_by_name = {
+                cfg['name']: cfg for cfg in self.tables.cfgs.values()
+            }
+            self.refresh_count += 1
+
+    def _ensure_index(self):
+        if self._by_rec_base is None:
+            self.refresh()
+
+    def get_object(self, rec_base):
+        """
+        Get the database entry for the motor at ``rec_base``.
+
+        Raises
+        ------
+        KeyError
+            If the motor is not in the database.
+        """
+        self._ensure_index()
+        try:
+            return self._by_rec_base[rec_base]
+        except KeyError:
+            raise KeyError(f'{rec_base} not found in pmgr!') from None
+
+    def get_config(self, cfgname):
+        """
+        Get the database entry for configuration ``cfgname``.
+
+        Raises
+        ------
+        KeyError
+            If the configuration is not in the database.
+        """
+        self._ensure_index()
+        try:
+            return self._cfg_by_name[cfgname]
+        except KeyError:
+            raise KeyError(f'{cfgname} not found in pmgr!') from None
+
+    def get_config_name(self, rec_base):
+        """Get the name of the configuration assigned to ``rec_base``."""
+        obj = self.get_object(rec_base)
+        return self.tables.cfgs[obj['config']]['name']
+
+    def get_config_values(self, cfgname):
+        """Get a copy of the configured values of ``cfgname``."""
+        return dict(self.get_config(cfgname))
+
+    def get_current_values(self, rec_base):
+        """Get the live values of all configuration fields of a motor."""
+        obj = self.get_object(rec_base)
+        return self.tables.getActualConfig(obj['id'])
+
+    def _setting_fields(self):
+        """Get the (field, pv suffix, is enum) of every settable field."""
+        fields = []
+        for group in self.tables.setflds:
+            for fld in group:
+                info = self.tables.fldmap[fld]
+                if info['readonly']:
+                    continue
+                try:
+                    info['enum'][0]
+                    enum = True
+                except Exception:
+                    enum = False
+                fields.append((fld, info['pv'], enum))
+        return fields
+
+    def diff(self, rec_bases, cfgnames=None, refresh=True):
+        """
+        Compare the live settings of many motors to their configurations.
+
+        This does at most one database refresh and one grouped read of all
+        of the field PVs, then compares all of the values at once. The
+        comparison matches ``pmgrAPI.diff_config``: unset configuration
+        values are skipped and floats use a relative tolerance.
+
+        Parameters
+        ----------
+        rec_bases : iterable of str
+            The motor PV prefixes to check.
+        cfgnames : dict, optional
+            Mapping of rec_base to the configuration to compare against.
+            Motors that are not included use their assigned configuration.
+        refresh : bool, optional
+            If True (default), refresh the database first.
+
+        Returns
+        -------
+        diffs : dict
+            Mapping of each rec_base to a dictionary of field name to
+            (actual, configuration) tuples, one per difference.
+        """
+        cfgnames = cfgnames or {}
+        with self._lock:
+            if refresh:
+                self.refresh()
+            fields = self._setting_fields()
+            rows = []
+            for rec_base in rec_bases:
+                obj = self.get_object(rec_base)
+                vals = dict(obj)
+                cfgname = cfgnames.get(rec_base)
+                if cfgname is None:
+                    vals.update(self.tables.cfgs[obj['config']])
+                else:
+                    vals.update(self.get_config(cfgname))
+                for fld, suffix, enum in fields:
+                    if vals.get(fld) is not None:
+                        rows.append((rec_base, fld, rec_base + suffix, enum,
+                                     vals[fld]))
+
+        diffs = {rec_base: {} for rec_base in rec_bases}
+        if not rows:
+            return diffs
+        actual = self.reader([row[2] for row in rows],
+                             [row[3] for row in rows])
+        is_float = np.array([isinstance(value, (float, np.floating))
+                             for value in actual], dtype=bool)
+        differs = np.zeros(len(rows), dtype=bool)
+        if is_float.any():
+            live = np.array([value for value, ok in zip(actual, is_float)
+                             if ok], dtype=float)
+            configured = np.array([row[4] for row, ok in zip(rows, is_float)
+                                   if ok], dtype=float)
+            scale = np.where(live == 0.0, 1.0, np.abs(live))
+            differs[is_float] = (
+                np.abs(live - configured) > self.float_tolerance * scale
+            )
+        for idx in np.flatnonzero(~is_float):
+            differs[idx] = bool(actual[idx] != rows[idx][4])
+        for idx in np.flatnonzero(differs):
+            rec_base, fld, _, _, configured = rows[idx]
+            diffs[rec_base][fld] = (actual[idx], configured)
+        return diffs
+
+
 class IMS(PCDSMotorBase):
     """
     PCDS implementation of the Motor Record for IMS motors.
@@ -763,11 +963,15 @@ class IMS(PCDSMotorBase):
         'get_configuration_values',
         'get_current_values',
         'find_configuration',
-        'diff_configuration'
+        'diff_configuration',
+        'diff_configurations',
+        'refresh_pmgr',
     ]
 
     # The singleton parameter manager object.
     _pm = None
+    # Indexed session cache around _pm, see get_pmgr_cache
+    _pm_cache = None
     # If we fail to create _pm, set bool to only try once
     _pm_init_error = False
 
@@ -970,27 +1174,30 @@ class IMS(PCDSMotorBase):
             cfgname = self.get_configuration()
         return self._pm.get_config_values(cfgname)
 
-    def get_current_values(self, pv=None):
+    def get_current_values(self, pv=None, refresh=True):
         """
         Returns the current parameters for a given pv.
 
         Parameters
         ----------
         pv : str
-          Default is None
+            The motor prefix to look up. Default is None, which uses this
+            motor's prefix.
+        refresh : bool
+            If True (default), re-read the database first. Pass False to
+            reuse the cached tables, see `refresh_pmgr`.
 
         Returns
         -------
         cdict : dict
             A dictionary mapping field names (str) to values.
         """
-
-        pv = self.prefix
-        self._setup_and_check_pmgr()
-
-        self._pm.update_db()
-        o = self._pm._search(self._pm.pm.objs, 'rec_base', pv)
-        return self._pm.pm.getActualConfig(o['id'])
+        if pv is None:
+            pv = self.prefix
+        cache = self.get_pmgr_cache()
+        if refresh:
+            cache.refresh()
+        return cache.get_current_values(pv)
 
     @staticmethod
     def find_configuration(pattern, case_insensitive=True, display=30):
@@ -1055,6 +1262,76 @@ class IMS(PCDSMotorBase):
             table.add_row([key, actual, configuration])
         return table
 
+    @staticmethod
+    def diff_configurations(motors, cfgname=None, refresh=True,
+                            as_dict=False):
+        """
+        Compare the live settings of many IMS motors to the parameter manager.
+
+        Unlike calling `diff_configuration` on each motor, this refreshes the
+        database once and reads all of the field PVs in one grouped request.
+
+        Parameters
+        ----------
+        motors : iterable of IMS
+            The motors to check.
+        cfgname : str or dict, optional
+            The configuration to compare all motors to, or a mapping of motor
+            name to configuration name. By default each motor is compared to
+            its assigned configuration.
+        refresh : bool, optional
+            If True (default), refresh the database first.
+        as_dict : bool, optional
+            If True, return the raw differences instead of a table.
+
+        Returns
+        -------
+        diff : PrettyTable or dict
+            A table with headers "Motor", "Parameter", "Actual", and
+            "Configuration", or a dictionary mapping motor name to a
+            dictionary of field name to (actual, configuration) tuples.
+        """
+        motors = list(motors)
+        if isinstance(cfgname, dict):
+            cfgnames = {motor.prefix: cfgname[motor.name] for motor in motors
+                        if motor.name in cfgname}
+        elif cfgname is not None:
+            cfgnames = {motor.prefix: cfgname for motor in motors}
+        else:
+            cfgnames = None
+        cache = IMS.get_pmgr_cache()
+        diffs = cache.diff([motor.prefix for motor in motors],
+                           cfgnames=cfgnames, refresh=refresh)
+        result = {motor.name: diffs[motor.prefix] for motor in motors}
+        if as_dict:
+            return result
+        table = PrettyTable()
+        table.field_names = ["Motor", "Parameter", "Actual", "Configuration"]
+        for name, diff in result.items():
+            for key, (actual, configuration) in diff.items():
+                table.add_row([name, key, actual, configuration])
+        return table
+
+    @staticmethod
+    def get_pmgr_cache():
+        """
+        Get the shared `PmgrCache` for the IMS parameter manager.
+
+        The cache is created on first use and replaced if the underlying
+        pmgr object changes.
+        """
+        IMS._setup_and_check_pmgr()
+        cache = IMS._pm_cache
+        if cache is None or cache.pm is not IMS._pm:
+            cache = PmgrCache(IMS._pm)
+            IMS._pm_cache = cache
+        return cache
+
+    @staticmethod
+    def refresh_pmgr():
+        """Re-read the parameter manager database into the shared cache."""
+        IMS.get_pmgr_cache().refresh()
+
     @staticmethod
     def setup_pmgr():
         try:
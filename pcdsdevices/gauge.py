@@ -3,15 +3,20 @@ Standard classes for LCLS Gauges.
 """
 import logging
 
+import numpy as np
 from ophyd import Component as Cpt
 from ophyd import Device, EpicsSignal, EpicsSignalRO, EpicsSignalWithRBV
 from ophyd import FormattedComponent as FCpt
 
 from .doc_stubs import GaugeSet_base
 from .interface import BaseInterface
+from .signal import ScalarHistorySignal
 
 logger = logging.getLogger(__name__)
 
+#: Default number of pressure updates kept by the pressure histories
+PRESSURE_HISTORY_SIZE = 3600
+
 
 class MKS937a(BaseInterface, Device):
     """
@@ -57,12 +62,17 @@ class BaseGauge(BaseInterface, Device):
         A name to refer to the gauge.
     """
 
-    pressure = Cpt(EpicsSignalRO, ':PMON', kind='hinted')
+    pressure = Cpt(EpicsSignalRO, ':PMON', kind='hinted', auto_monitor=True)
     egu = Cpt(EpicsSignalRO, ':PMON.EGU', kind='normal')
-    state = Cpt(EpicsSignalRO, ':STATE', kind='normal')
+    state = Cpt(EpicsSignalRO, ':STATE', kind='normal', auto_monitor=True)
     status = Cpt(EpicsSignalRO, ':STATUSMON', kind='normal')
     pressure_status = Cpt(EpicsSignalRO, ':PSTATMON', kind='normal')
     pressure_status_enable = Cpt(EpicsSignal, ':PSTATMSP', kind='normal')
+    pressure_history = Cpt(ScalarHistorySignal, signal='pressure',
+                           size=PRESSURE_HISTORY_SIZE, lazy=True,
+                           kind='omitted',
+                           doc='timestamped history of the pressure '
+                               'updates, recorded once accessed')
 
     tab_component_names = True
 
@@ -116,6 +126,11 @@ class GaugeSetBase(BaseInterface, Device):
     def egu(self):
         return self.gcc.egu.get()
 
+    @property
+    def pressure_history(self):
+        """The pressure history of the cold cathode gauge."""
+        return self.gcc.pressure_history
+
 
 class GaugeSetMks(GaugeSetBase):
     """
@@ -184,7 +199,12 @@ class GaugePLC(Device):
     """
 
     pressure = Cpt(EpicsSignalRO, ':PRESS_RBV', kind='hinted',
-                   doc='gauge pressure reading')
+                   auto_monitor=True, doc='gauge pressure reading')
+    pressure_history = Cpt(ScalarHistorySignal, signal='pressure',
+                           size=PRESSURE_HISTORY_SIZE, lazy=True,
+                           kind='omitted',
+                           doc='timestamped history of the pressure '
+                               'updates, recorded once accessed')
     gauge_at_vac = Cpt(EpicsSignalRO, ':AT_VAC_RBV', kind='normal',
                        doc='gauge is at VAC')
     pressure_ok = Cpt(EpicsSignalRO, ':PRESS_OK_RBV', kind='normal',
@@ -403,3 +423,35 @@ def GaugeSet(prefix, *, name, index, **kwargs):
                 **kwargs)
         else:
             return GaugeSetPirani(prefix, name=name, index=index, **kwargs)
+
+
+def rank_by_rate_of_rise(devices, seconds=None):
+    """
+    Rank gauges and pumps by the rate of rise of their pressure.
+
+    Each device needs a ``pressure_history``, e.g. a `BaseGauge`,
+    `GaugeSetBase`, `GaugePLC`, `IonPumpBase` or `PIPPLC`. The histories
+    only record once accessed, so access them (e.g. by calling this) well
+    before the ranking is needed.
+
+    Parameters
+    ----------
+    devices : iterable of Device
+        The gauges and pumps to rank, e.g. all of those in a hutch.
+    seconds : float, optional
+        The fit window, see `ScalarHistorySignal.rate_of_rise`. Defaults to
+        the whole history of each device.
+
+    Returns
+    -------
+    ranking : list of (Device, float)
+        The devices and their rates of rise in pressure units per second,
+        fastest-rising first. Devices without enough history to fit a rate
+        are listed last, with a rate of NaN.
+    """
+    rates = [(device, device.pressure_history.rate_of_rise(seconds))
+             for device in devices]
+    return sorted(
+        rates,
+        key=lambda item: (np.isnan(item[1]), -np.nan_to_num(item[1])),
+    )
@@ -364,6 +364,9 @@ class Kappa(BaseInterface, PseudoPositioner, GroupDevice):
     """
     sample_stage = Cpt(KappaXYZStage, name='', kind='normal')
 
+    # Batch notepad readback writes from the three rotation stages
+    notepad_max_rate = 10
+
     # The real (or physical) positioners:
     eta = FCpt(IMS, '{self._prefix_eta}', kind='normal')
     kappa = FCpt(IMS, '{self._prefix_kappa}', kind='normal')
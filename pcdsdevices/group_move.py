@@ -0,0 +1,306 @@
+"""
+Insert and remove groups of in/out devices together.
+
+Clearing a beamline means removing many imagers, intensity monitors, slits
+and so on. `remove_all` and `insert_all` start all of these moves at once
+and return a single `GroupMoveStatus`, which also reports the progress of
+each device::
+
+    status = remove_all([im1k0, im2k0, ipm, slits], order='upstream')
+    status.progress
+    # {'im1k0': 'done', 'im2k0': 'moving', 'ipm': 'waiting', ...}
+    status.wait()
+
+Devices that are already in the requested state are skipped. This is decided
+from the monitored lightpath state of `LightpathMixin` devices, so it costs
+no extra gets. Devices whose lightpath state is not kept up to date by
+monitors, e.g. because they have no lightpath branches, are always moved.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional, Union
+
+from ophyd.status import StatusBase
+
+logger = logging.getLogger(__name__)
+
+#: Progress of devices that were already in the requested state
+SKIPPED = 'skipped'
+#: Progress of devices in a later stage that has not started yet
+WAITING = 'waiting'
+#: Progress of devices that are moving
+MOVING = 'moving'
+#: Progress of devices that finished their move
+DONE = 'done'
+#: Progress of devices whose move failed or could not be started
+FAILED = 'failed'
+
+
+class GroupMoveError(RuntimeError):
+    """Raised when a move of a group of devices fails."""
+
+
+def _monitored_lightpath_state(device):
+    """The monitored LightpathState of ``device``, or None if unknown."""
+    try:
+        get_state = device.get_monitored_lightpath_state
+    except AttributeError:
+        return None
+    return get_state()
+
+
+def _device_z(device) -> Optional[float]:
+    """The z position of ``device`` from its happi metadata, if any."""
+    try:
+        return device.md.z
+    except AttributeError:
+        return None
+
+
+def _order_stages(devices: list, order) -> list[list]:
+    """Split ``devices`` into stages that are moved one after the other."""
+    if order is None:
+        return [devices]
+    if order in ('upstream', 'downstream'):
+        with_z = [device for device in devices
+                  if _device_z(device) is not None]
+        without_z = [device for device in devices
+                     if _device_z(device) is None]
+        if without_z:
+            logger.warning(
+                'No z position for %s, moving these last',
+                ', '.join(device.name for device in without_z)
+            )
+        with_z.sort(key=_device_z, reverse=(order == 'downstream'))
+        stages = []
+        last_z = None
+        for device in with_z:
+            z = _device_z(device)
+            if not stages or z != last_z:
+                stages.append([])
+            stages[-1].append(device)
+            last_z = z
+        if without_z:
+            stages.append(without_z)
+        return stages
+    if isinstance(order, str):
+        raise ValueError(
+            f'Unknown order {order!r}, expected "upstream", "downstream", '
+            f'a list of stages or None'
+        )
+    stages = [list(stage) for stage in order]
+    staged = [device for stage in stages for device in stage]
+    if (len(staged) != len(devices)
+            or {id(dev) for dev in staged} != {id(dev) for dev in devices}):
+        raise ValueError('The stages must contain each device exactly once')
+    return stages
+
+
+class GroupMoveStatus(StatusBase):
+    """
+    Combined status of an insert or remove of a group of devices.
+
+    The devices are moved in stages: all devices in a stage move at the
+    same time, and the next stage starts once they are all done. The status
+    finishes when the last stage is done, and fails as soon as one of the
+    moves fails. Later stages are then not started.
+
+    Parameters
+    ----------
+    stages : list of list of Device
+        The devices to move, in stages.
+    action : {'insert', 'remove'}
+        The method to call on each device.
+    skip : bool, optional
+        Skip devices whose monitored lightpath state is already the
+        requested state.
+    move_timeout : float, optional
+        The timeout passed to each device move.
+    timeout : float, optional
+        The timeout of the whole group move.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Sequence[Any]],
+        action: str,
+        skip: bool = True,
+        move_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        if action not in ('insert', 'remove'):
+            raise ValueError(f'Unknown action {action!r}')
+        self.action = action
+        self.stages = [list(stage) for stage in stages]
+        self.skip = skip
+        self.move_timeout = move_timeout
+        #: Device name to the status of its move
+        self.statuses: dict[str, StatusBase] = {}
+        self._progress = {device.name: WAITING
+                          for stage in self.stages for device in stage}
+        self._lock = threading.RLock()
+        self._stage = -1
+        self._pending = set()
+        self._starting = False
+        super().__init__(timeout=timeout)
+        self._start_next_stage()
+
+    @property
+    def progress(self) -> dict[str, str]:
+        """Device name to its progress, e.g. ``'moving'`` or ``'done'``."""
+        with self._lock:
+            return dict(self._progress)
+
+    @property
+    def fraction(self) -> float:
+        """The fraction of devices that are done or skipped."""
+        with self._lock:
+            finished = sum(state in (DONE, SKIPPED)
+                           for state in self._progress.values())
+            return finished / len(self._progress) if self._progress else 1.0
+
+    def _in_requested_state(self, device) -> bool:
+        state = _monitored_lightpath_state(device)
+        if state is None:
+            return False
+        if self.action == 'insert':
+            return bool(state.inserted)
+        return bool(state.removed)
+
+    def _fail(self, message: str) -> None:
+        if not self.done:
+            self.set_exception(GroupMoveError(message))
+
+    def _start_next_stage(self) -> None:
+        with self._lock:
+            while not self.done:
+                self._stage += 1
+                if self._stage >= len(self.stages):
+                    self.set_finished()
+                    return
+                # Moves that finish right away must not start the next
+                # stage while we are still starting this one
+                self._starting = True
+                try:
+                    for device in self.stages[self._stage]:
+                        if not self._start_move(device):
+                            return
+                finally:
+                    self._starting = False
+                if self._pending:
+                    return
+
+    def _start_move(self, device) -> bool:
+        """Start the move of one device, returning False if we failed."""
+        if self.skip and self._in_requested_state(device):
+            self._progress[device.name] = SKIPPED
+            return True
+        try:
+            status = getattr(device, self.action)(timeout=self.move_timeout)
+        except Exception as ex:
+            self._progress[device.name] = FAILED
+            logger.debug('Failed to %s %s', self.action, device.name,
+                         exc_info=True)
+            self._fail(f'Failed to {self.action} {device.name}: {ex}')
+            return False
+        self._progress[device.name] = MOVING
+        self.statuses[device.name] = status
+        self._pending.add(device.name)
+        # Attach right away so the progress of moves that already started
+        # is still tracked if a later device in this stage fails to start
+        status.add_callback(self._device_callback(device))
+        return not self.done
+
+    def _device_callback(self, device):
+        def finished(status):
+            with self._lock:
+                self._pending.discard(device.name)
+                if status.success:
+                    self._progress[device.name] = DONE
+                else:
+                    self._progress[device.name] = FAILED
+                    self._fail(f'Failed to {self.action} {device.name}: '
+                               f'{status.exception()}')
+                    return
+                if not self._pending and not self._starting:
+                    self._start_next_stage()
+        return finished
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} {self.action} '
+                f'done={self.done} progress={self.progress}>')
+
+
+def _group_move(action: str, devices: Iterable[Any], order, skip: bool,
+                move_timeout: Optional[float], timeout: Optional[float],
+                wait: bool) -> GroupMoveStatus:
+    devices = list(devices)
+    status = GroupMoveStatus(_order_stages(devices, order), action,
+                             skip=skip, move_timeout=move_timeout,
+                             timeout=timeout)
+    if wait:
+        status.wait()
+    return status
+
+
+def remove_all(
+    devices: Iterable[Any],
+    order: Union[None, str, Sequence[Sequence[Any]]] = None,
+    skip: bool = True,
+    move_timeout: Optional[float] = None,
+    timeout: Optional[float] = None,
+    wait: bool = False,
+) -> GroupMoveStatus:
+    """
+    Remove a group of devices from the beam.
+
+    Parameters
+    ----------
+    devices : iterable of Device
+        Devices with a ``remove`` method, e.g. `PIM`, `LCLS2ImagerBase`,
+        `IPMMotion` or slits.
+    order : str or list of list of Device, optional
+        Defaults to moving all devices at once. ``'upstream'`` moves the
+        devices one z position at a time, most upstream first, and
+        ``'downstream'`` the other way around, using the happi metadata of
+        the devices. A list of lists of devices gives the stages explicitly.
+    skip : bool, optional
+        Skip devices whose cached lightpath state is already removed.
+    move_timeout : float, optional
+        The timeout passed to each device's ``remove``.
+    timeout : float, optional
+        The timeout of the whole group move.
+    wait : bool, optional
+        Wait for the group move to finish.
+
+    Returns
+    -------
+    status : GroupMoveStatus
+    """
+    return _group_move('remove', devices, order, skip, move_timeout, timeout,
+                       wait)
+
+
+def insert_all(
+    devices: Iterable[Any],
+    order: Union[None, str, Sequence[Sequence[Any]]] = None,
+    skip: bool = True,
+    move_timeout: Optional[float] = None,
+    timeout: Optional[float] = None,
+    wait: bool = False,
+) -> GroupMoveStatus:
+    """
+    Insert a group of devices into the beam.
+
+    See `remove_all` for the parameters, with ``insert`` instead of
+    ``remove``.
+
+    Returns
+    -------
+    status : GroupMoveStatus
+    """
+    return _group_move('insert', devices, order, skip, move_timeout, timeout,
+                       wait)
@@ -353,6 +353,11 @@ class OffsetMirror(BeamControl):
     y_ranges = EntryInfo("valid y positions, determining coating",
                          optional=True, enforce=list,
                          include_default_as_kwarg=False)
+    range_hysteresis = EntryInfo("hysteresis band around the x, y and pitch "
+                                 "ranges, either one value or a dictionary "
+                                 "keyed by x, y and pitch",
+                                 optional=True,
+                                 include_default_as_kwarg=False)
 
 
 class PulsePicker(BeamControl):
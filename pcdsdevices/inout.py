@@ -8,6 +8,7 @@ the beam or out of the beam.
 """
 import math
 
+import numpy as np
 from ophyd.device import required_for_connection
 from ophyd.sim import NullStatus
 
@@ -46,6 +47,12 @@ class InOutPositioner(StatePositioner):
         :attr:`out_states`, 0 (full block) for :attr:`in_states`,
         and :const:`~math.nan` (no idea!) for unaccounted states.
 
+    _transmission_energy : dict{str: (array, array)}
+        Optional mapping from a state to a table of photon energies in eV and
+        the transmission at each energy. When a photon energy is given, these
+        states are interpolated from the table instead of using
+        :attr:`_transmission`.
+
     _in_if_not_out : bool
         If `True`, shorthand for saying "All states not unknown and
         not in out_states belong in the in_states list."
@@ -57,6 +64,7 @@ class InOutPositioner(StatePositioner):
     in_states = ['IN']
     out_states = ['OUT']
     _transmission = {}
+    _transmission_energy = {}
     _in_if_not_out = False
 
     tab_whitelist = ['inserted', 'removed', 'insert', 'remove', 'transmission']
@@ -84,6 +92,14 @@ class InOutPositioner(StatePositioner):
         self._trans_enum = {}
         self._extend_trans_enum(self.in_states, 0)
         self._extend_trans_enum(self.out_states, 1)
+        self._trans_table = np.full(len(self.states_list), math.nan)
+        for index, transmission in self._trans_enum.items():
+            self._trans_table[index] = transmission
+        self._trans_curves = {
+            self._state_index(state): (np.asarray(energies, dtype=float),
+                                       np.asarray(values, dtype=float))
+            for state, (energies, values) in self._transmission_energy.items()
+        }
 
     @property
     def inserted(self):
@@ -136,13 +152,47 @@ class InOutPositioner(StatePositioner):
         """
         return self.check_transmission()
 
-    def check_transmission(self, state=None):
-        """Query the transition at a particular state."""
+    def check_transmission(self, state=None, energy=None):
+        """
+        Query the transmission at a particular state.
+
+        If a photon energy in eV is given, states with a table in
+        :attr:`_transmission_energy` are interpolated at that energy.
+        """
         if state is None:
             state = self.position
         state_index = self.get_state(state).value
+        if energy is not None and state_index in self._trans_curves:
+            return float(np.interp(energy, *self._trans_curves[state_index]))
         return self._trans_enum.get(state_index, math.nan)
 
+    def transmission_table(self, energy=None):
+        """
+        The transmission of every state, indexed by the state enum value.
+
+        States that are neither in nor out are :const:`~math.nan`.
+
+        Parameters
+        ----------
+        energy : float or array-like, optional
+            Photon energies in eV. States with a table in
+            :attr:`_transmission_energy` are interpolated at these energies.
+
+        Returns
+        -------
+        table : np.ndarray
+            Array of shape ``np.shape(energy) + (len(states_list),)``.
+        """
+        if energy is None:
+            return self._trans_table.copy()
+        energy = np.asarray(energy, dtype=float)
+        table = np.broadcast_to(
+            self._trans_table, energy.shape + self._trans_table.shape
+        ).copy()
+        for index, (energies, values) in self._trans_curves.items():
+            table[..., index] = np.interp(energy, energies, values)
+        return table
+
     def _extend_trans_enum(self, state_list, default):
         for state in state_list:
             self._update_trans_enum(state, default)
@@ -153,6 +203,11 @@ class InOutPositioner(StatePositioner):
         index = self.states_list.index(state)
         self._trans_enum[index] = self._transmission.get(state, default)
 
+    def _state_index(self, state):
+        if state not in self.states_list:
+            state = self.get_state(state).name
+        return self.states_list.index(state)
+
     def _pos_in_list(self, state_list, check_state=None):
         if check_state is None:
             current_state = self.get_state(self.position)
@@ -12,7 +12,7 @@ import time
 import typing
 from contextlib import contextmanager
 from pathlib import Path
-from threading import Event
+from threading import Event, RLock
 from types import MethodType, SimpleNamespace
 from typing import Optional
 from weakref import WeakSet
@@ -94,6 +94,10 @@ class TabCompletionHelperClass(_TabCompletionHelper):
     """
     Tab completion helper for the class itself.
 
+    The filtered and unfiltered ``dir`` results of the class are cached here
+    and shared by all instances that have not customized their includes.
+    The cache is invalidated whenever the includes change.
+
     Parameters
     ----------
     cls : subclass of BaseInterface
@@ -101,9 +105,11 @@ class TabCompletionHelperClass(_TabCompletionHelper):
     """
 
     cls: type['BaseInterface']
+    _dir_cache: dict[bool, list[str]]
 
     def __init__(self, cls):
         self.cls = cls
+        self._dir_cache = {}
         super().__init__()
 
     def reset(self):
@@ -119,6 +125,44 @@ class TabCompletionHelperClass(_TabCompletionHelper):
                         whitelist.append(cpt_name)
 
         self._includes = set(whitelist)
+        self._dir_cache.clear()
+
+    def add(self, attr: str):
+        """Add an attribute to the include list."""
+        super().add(attr)
+        self._dir_cache.clear()
+
+    def remove(self, attr: str):
+        """Remove an attribute from the include list."""
+        super().remove(attr)
+        self._dir_cache.clear()
+
+    def get_class_dir(self, filtered: bool) -> list[str]:
+        """
+        Get the (cached) dir list of the class.
+
+        Parameters
+        ----------
+        filtered : bool
+            If True, only include attributes that match the includes.
+        """
+        try:
+            return self._dir_cache[filtered]
+        except KeyError:
+            ...
+
+        if filtered:
+            if self._regex is None:
+                self.build_regex()
+            result = [
+                elem
+                for elem in self.get_class_dir(filtered=False)
+                if self._regex.fullmatch(elem)
+            ]
+        else:
+            result = dir(self.cls)
+        self._dir_cache[filtered] = result
+        return result
 
     def new_instance(self, instance) -> 'TabCompletionHelperInstance':
         """
@@ -136,6 +180,10 @@ class TabCompletionHelperInstance(_TabCompletionHelper):
     """
     Tab completion helper for one instance of a class.
 
+    The includes of the class helper are shared until this instance is
+    customized through :meth:`add` or :meth:`remove`, at which point a
+    private copy is made.
+
     Parameters
     ----------
     instance : object
@@ -147,36 +195,102 @@ class TabCompletionHelperInstance(_TabCompletionHelper):
 
     class_helper: TabCompletionHelperClass
     instance: 'BaseInterface'
-    super_dir: typing.Callable[[], list[str]]
+    _own_includes: Optional[set[str]]
+    _filtered_class_dir: Optional[list[str]]
 
     def __init__(self, instance, class_helper):
         assert isinstance(instance, BaseInterface), 'Must mix in BaseInterface'
 
         self.class_helper = class_helper
         self.instance = instance
-        self.super_dir = super(BaseInterface, instance).__dir__
+        self._own_includes = None
+        self._filtered_class_dir = None
         super().__init__()
 
+    @property
+    def _includes(self) -> set[str]:
+        """The includes of the class helper, unless customized."""
+        if self._own_includes is None:
+            return self.class_helper._includes
+        return self._own_includes
+
+    @_includes.setter
+    def _includes(self, includes: set[str]):
+        self._own_includes = includes
+
+    @property
+    def customized(self) -> bool:
+        """True if this instance no longer shares the class includes."""
+        return self._own_includes is not None
+
+    @property
+    def super_dir(self) -> typing.Callable[[], list[str]]:
+        """The unfiltered ``__dir__`` of the instance."""
+        return super(BaseInterface, self.instance).__dir__
+
+    def build_regex(self) -> typing.Pattern:
+        """Update the regular expression based on the current includes."""
+        if not self.customized:
+            return self.class_helper.build_regex()
+        self._filtered_class_dir = None
+        return super().build_regex()
+
     def reset(self):
         """Reset the attribute includes to that defined by the class."""
-        super().reset()
-        self._includes = set(self.class_helper._includes)
+        self._own_includes = None
+        self._filtered_class_dir = None
+        self._regex = None
+
+    def _copy_on_write(self):
+        """Make a private copy of the class includes, if not done already."""
+        if not self.customized:
+            self._own_includes = set(self.class_helper._includes)
+
+    def add(self, attr: str):
+        """Add an attribute to the include list."""
+        self._copy_on_write()
+        self._filtered_class_dir = None
+        super().add(attr)
+
+    def remove(self, attr: str):
+        """Remove an attribute from the include list."""
+        self._copy_on_write()
+        self._filtered_class_dir = None
+        super().remove(attr)
+
+    def _get_instance_attrs(self) -> list[str]:
+        """Get the attribute names stored on the instance itself."""
+        return list(getattr(self.instance, '__dict__', ()))
 
     def get_filtered_dir_list(self) -> list[str]:
         """Get the dir list, filtered based on the whitelist."""
-        if self._regex is None:
-            self.build_regex()
-
-        return [
+        if not self.customized:
+            regex = self.class_helper._regex or self.class_helper.build_regex()
+            class_dir = self.class_helper.get_class_dir(filtered=True)
+        else:
+            regex = self._regex or self.build_regex()
+            if self._filtered_class_dir is None:
+                self._filtered_class_dir = [
+                    elem
+                    for elem in self.class_helper.get_class_dir(filtered=False)
+                    if regex.fullmatch(elem)
+                ]
+            class_dir = self._filtered_class_dir
+
+        result = set(class_dir)
+        result.update(
             elem
-            for elem in self.super_dir()
-            if self._regex.fullmatch(elem)
-        ]
+            for elem in self._get_instance_attrs()
+            if regex.fullmatch(elem)
+        )
+        return list(result)
 
     def get_dir(self) -> list[str]:
         """Get the dir list based on the engineering mode settings."""
         if get_engineering_mode():
-            return self.super_dir()
+            result = set(self.class_helper.get_class_dir(filtered=False))
+            result.update(self._get_instance_attrs())
+            return list(result)
         return self.get_filtered_dir_list()
 
 
@@ -1697,13 +1811,19 @@ class LightpathMixin(Device):
     lightpath_summary: Signal = Cpt(SummarySignal, name='lightpath_summary',
                                     kind='omitted')
 
+    # Run with old_state, new_state only when the LightpathState changes
+    SUB_LIGHTPATH = 'lightpath'
+
     def __init__(self, *args,
                  input_branches=[], output_branches=[], **kwargs):
         self._lightpath_ready = False
         self._retry_lightpath = True
         self._summary_initialized = False
         self._cached_state = None
+        self._lightpath_lock = RLock()
         self._md = None
+        # Number of LightpathState calculations, and how many changed it
+        self.lightpath_stats = {'recomputes': 0, 'changes': 0}
 
         super().__init__(*args, **kwargs)
 
@@ -1767,10 +1887,51 @@ class LightpathMixin(Device):
             self.log.debug('calculating new LightpathState')
             kwargs = {sig.name.removeprefix(self.name + '_'): sig.get()
                       for sig in self.lightpath_summary._signals}
-            self._cached_state = self.calc_lightpath_state(**kwargs)
+            self._update_lightpath_state(self.calc_lightpath_state(**kwargs))
+
+        return self._cached_state
+
+    @property
+    def lightpath_monitored(self) -> bool:
+        """
+        Whether monitors keep the cached LightpathState up to date.
+
+        The cache only follows the ``lightpath_cpts`` once the summary signal
+        is initialized, which needs the input and output branches. Only then
+        are ``SUB_LIGHTPATH`` callbacks run when the device moves.
+        """
+        return self._summary_initialized
+
+    def get_monitored_lightpath_state(self) -> Optional[LightpathState]:
+        """
+        Return the cached LightpathState if monitors keep it up to date.
 
+        Returns None rather than a possibly stale state if
+        `lightpath_monitored` is False.
+        """
+        if not self.lightpath_monitored:
+            return None
         return self._cached_state
 
+    def _update_lightpath_state(self, new_state: LightpathState) -> None:
+        """
+        Cache a newly calculated LightpathState.
+
+        Runs the ``SUB_LIGHTPATH`` callbacks with ``old_state`` and
+        ``new_state`` if the state differs from the cached one, including
+        the first calculation where ``old_state`` is None.
+        """
+        with self._lightpath_lock:
+            old_state = self._cached_state
+            self._cached_state = new_state
+            self.lightpath_stats['recomputes'] += 1
+            changed = new_state != old_state
+            if changed:
+                self.lightpath_stats['changes'] += 1
+        if changed:
+            self._run_subs(sub_type=self.SUB_LIGHTPATH, old_state=old_state,
+                           new_state=new_state, timestamp=time.time())
+
     def _calc_cache_lightpath_state(self, *args, **kwargs) -> None:
         """
         Calculate the lightpath state and cache it.
@@ -1859,10 +2020,13 @@ class LightpathInOutCptMixin(LightpathMixin):
 
     def _init_summary_signal(self):
         """ Change summary signal to only watch .state signals """
+        if self._summary_initialized:
+            return
         for sig in self.lightpath_cpts:
             self.lightpath_summary.add_signal_by_attr_name(sig + '.state')
 
         self.lightpath_summary.subscribe(self._calc_cache_lightpath_state)
+        self._summary_initialized = True
 
     def get_lightpath_state(self, use_cache: bool = True) -> LightpathState:
         if (not use_cache) or (self._cached_state is None):
@@ -1872,8 +2036,7 @@ class LightpathInOutCptMixin(LightpathMixin):
                 sig_name = parent.name.removeprefix(self.name + '_')
                 kwargs[sig_name] = sig.get()
 
-            state = self.calc_lightpath_state(**kwargs)
-            self._cached_state = state
+            self._update_lightpath_state(self.calc_lightpath_state(**kwargs))
 
         return self._cached_state
 
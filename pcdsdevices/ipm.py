@@ -5,6 +5,7 @@ import logging
 import warnings
 from typing import Union
 
+import numpy as np
 from lightpath import LightpathState
 from ophyd.device import Component as Cpt
 from ophyd.device import Device
@@ -119,6 +120,22 @@ class IPMDiode(BaseInterface, GroupDevice):
         else:
             return 0
 
+    def transmission_table(self, energy=None):
+        """
+        The transmission of every diode state, indexed by the state enum value.
+
+        Like `transmission`, this is 1 for the in and out states and 0 for
+        the others. The diode transmission does not depend on the photon
+        energy, so ``energy`` only sets the shape of the table.
+        """
+        state = self.state
+        table = np.zeros(len(state.states_list))
+        for name in state.in_states + state.out_states:
+            table[state._state_index(name)] = 1
+        if energy is None:
+            return table
+        return np.broadcast_to(table, np.shape(energy) + table.shape).copy()
+
     remove.__doc__ += insert_remove
 
 
@@ -139,6 +156,8 @@ class IPMMotion(BaseInterface, GroupDevice, LightpathMixin):
                      'removed', 'ty', 'dx', 'dy']
 
     lightpath_cpts = ['target.state', 'diode.state.state']
+    # Components whose transmissions multiply to the total transmission
+    transmission_cpts = ['target', 'diode']
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
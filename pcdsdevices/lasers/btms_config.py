@@ -3,6 +3,7 @@ from __future__ import annotations
 import dataclasses
 import enum
 import logging
+from collections.abc import Iterable, Sequence
 from typing import Union
 
 logger = logging.getLogger(__name__)
@@ -577,11 +578,41 @@ class BtmsState:
         if closest_destination is None:
             closest_destination = self.sources[moving_source].destination
 
-        dest_to_source = {
+        errors.extend(
+            self._check_move_conflicts(
+                moving_source,
+                closest_destination,
+                target_destination,
+                dest_to_source=self.get_destination_to_source(),
+            )
+        )
+        return errors
+
+    def get_destination_to_source(
+        self,
+    ) -> dict[DestinationPosition | None, SourcePosition]:
+        """Map each destination to the source positioned at it."""
+        return {
             source.destination: source.source
             for source in self.sources.values()
         }
 
+    def _check_move_conflicts(
+        self,
+        moving_source: SourcePosition,
+        closest_destination: DestinationPosition | None,
+        target_destination: DestinationPosition,
+        dest_to_source: dict[DestinationPosition | None, SourcePosition],
+        path: tuple[DestinationPosition, ...] | None = None,
+    ) -> list[MoveError]:
+        """
+        Check motion of ``moving_source``, excluding configuration errors.
+
+        This is the per-move part of `check_move_all`, split out so that
+        `BtmsMoveMatrix` can reuse a precomputed ``dest_to_source`` mapping
+        and path.
+        """
+        errors = []
         for other_source in self.sources:
             if other_source == moving_source:
                 ...
@@ -619,7 +650,10 @@ class BtmsState:
                 )
             )
 
-        for dest in closest_destination.path_to(target_destination):
+        if path is None:
+            path = closest_destination.path_to(target_destination)
+
+        for dest in path:
             active_source = dest_to_source.get(dest, None)
             if active_source is None:
                 # No source is near this destination
@@ -695,3 +729,215 @@ class BtmsState:
 
     def __str__(self) -> str:
         return self.get_text_diagram()
+
+
+class BtmsMoveMatrix:
+    """
+    Cached source x destination move conflicts for a `BtmsState`.
+
+    Each entry holds the conflicts of moving a source from its current
+    destination to a target destination, as reported by
+    `BtmsState.check_move_all`.  The matrix owns ``state`` and is kept up
+    to date through the ``update_*`` methods, which only recompute the
+    entries that the change can affect.
+
+    Parameters
+    ----------
+    state : BtmsState, optional
+        The initial state.  Defaults to an empty state.
+    sources : sequence of SourcePosition, optional
+        The sources to track.  Defaults to the valid sources.
+    destinations : sequence of DestinationPosition, optional
+        The target destinations to track.  Defaults to the valid
+        destinations.
+    """
+    state: BtmsState
+    sources: tuple[SourcePosition, ...]
+    destinations: tuple[DestinationPosition, ...]
+
+    def __init__(
+        self,
+        state: BtmsState | None = None,
+        sources: Sequence[SourcePosition] | None = None,
+        destinations: Sequence[DestinationPosition] | None = None,
+    ):
+        self.state = state if state is not None else BtmsState()
+        self.sources = tuple(sources or valid_sources)
+        self.destinations = tuple(destinations or valid_destinations)
+        for source in self.sources:
+            self.state.sources.setdefault(
+                source,
+                BtmsSourceState(
+                    source=source, destination=None, beam_status=False
+                ),
+            )
+        self._paths: dict[
+            tuple[DestinationPosition, DestinationPosition],
+            tuple[DestinationPosition, ...],
+        ] = {}
+        self._conflicts: dict[
+            tuple[SourcePosition, DestinationPosition], list[MoveError]
+        ] = {}
+        self._config_errors: list[MoveError] = []
+        #: The number of matrix entries computed, for diagnostics.
+        self.entries_computed = 0
+        self.recompute()
+
+    def _path(
+        self, start: DestinationPosition, target: DestinationPosition
+    ) -> tuple[DestinationPosition, ...]:
+        """Cached version of `DestinationPosition.path_to`."""
+        try:
+            return self._paths[(start, target)]
+        except KeyError:
+            path = self._paths[(start, target)] = start.path_to(target)
+            return path
+
+    def _compute(
+        self,
+        entries: Iterable[tuple[SourcePosition, DestinationPosition]],
+    ) -> None:
+        """Recompute the given (source, target) entries."""
+        dest_to_source = self.state.get_destination_to_source()
+        for source, target in entries:
+            closest = self.state.sources[source].destination
+            path = None if closest is None else self._path(closest, target)
+            self._conflicts[(source, target)] = (
+                self.state._check_move_conflicts(
+                    source, closest, target,
+                    dest_to_source=dest_to_source,
+                    path=path,
+                )
+            )
+            self.entries_computed += 1
+
+    def recompute(self) -> None:
+        """Recompute the full matrix from ``state``."""
+        self._config_errors = self.state.check_configuration()
+        self._compute(
+            (source, target)
+            for source in self.sources
+            for target in self.destinations
+        )
+
+    def update_source(
+        self,
+        source: SourcePosition,
+        destination: DestinationPosition | None,
+        beam_status: bool,
+    ) -> bool:
+        """
+        Update the position and beam status of ``source``.
+
+        Returns
+        -------
+        changed : bool
+            True if the state changed and the matrix was updated.
+        """
+        source_state = self.state.sources[source]
+        old_destination = source_state.destination
+        if (
+            old_destination == destination
+            and source_state.beam_status == bool(beam_status)
+        ):
+            return False
+
+        source_state.destination = destination
+        source_state.beam_status = bool(beam_status)
+        self._config_errors = self.state.check_configuration()
+
+        # Other sources only see this one through the destinations it was
+        # and is now positioned at: as a target in use, or on a path.
+        touched = {old_destination, destination} - {None}
+        entries = []
+        for other in self.sources:
+            closest = self.state.sources[other].destination
+            for target in self.destinations:
+                if other == source or target in touched:
+                    entries.append((other, target))
+                elif closest is not None and not touched.isdisjoint(
+                    self._path(closest, target)
+                ):
+                    entries.append((other, target))
+        self._compute(entries)
+        return True
+
+    def update_yields_control(
+        self, destination: DestinationPosition, yields_control: bool
+    ) -> bool:
+        """
+        Update whether the user at ``destination`` yields control.
+
+        Returns
+        -------
+        changed : bool
+            True if the state changed and the matrix was updated.
+        """
+        dest_state = self.state.destinations[destination]
+        if dest_state.yields_control == bool(yields_control):
+            return False
+        dest_state.yields_control = bool(yields_control)
+        # Only sources leaving this destination are affected
+        self._compute(
+            (source, target)
+            for source in self.sources
+            if self.state.sources[source].destination == destination
+            for target in self.destinations
+        )
+        return True
+
+    def update_maintenance_mode(self, maintenance_mode: bool) -> bool:
+        """
+        Update the system-level maintenance mode setting.
+
+        Returns
+        -------
+        changed : bool
+            True if the state changed.
+        """
+        if self.state.maintenance_mode == bool(maintenance_mode):
+            return False
+        self.state.maintenance_mode = bool(maintenance_mode)
+        self._config_errors = self.state.check_configuration()
+        return True
+
+    def conflicts(
+        self, source: SourcePosition, target: DestinationPosition
+    ) -> list[MoveError]:
+        """
+        All conflicts for moving ``source`` to ``target``.
+
+        This matches ``state.check_move_all(source, None, target)``.
+        """
+        return self._config_errors + self._conflicts[(source, target)]
+
+    def is_allowed(
+        self, source: SourcePosition, target: DestinationPosition
+    ) -> bool:
+        """Can ``source`` be moved to ``target`` without conflicts?"""
+        return not self._config_errors and not self._conflicts[(source, target)]
+
+    def allowed_destinations(
+        self, source: SourcePosition
+    ) -> list[DestinationPosition]:
+        """The destinations ``source`` may move to."""
+        return [
+            target for target in self.destinations
+            if self.is_allowed(source, target)
+        ]
+
+    def to_dict(
+        self,
+    ) -> dict[SourcePosition, dict[DestinationPosition, list[str]]]:
+        """
+        The matrix as nested dictionaries of conflict reasons.
+
+        An empty list of reasons means the move is allowed.
+        """
+        return {
+            source: {
+                target: [str(err) for err in self.conflicts(source, target)]
+                for target in self.destinations
+            }
+            for source in self.sources
+        }
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import cast
+import functools
+import threading
+from collections.abc import Callable
+from typing import Any, cast
 
 from ophyd.device import Component as Cpt
 from ophyd.device import Device
@@ -13,12 +16,14 @@ from ..device import UnrelatedComponent as UCpt
 from ..epics_motor import SmarAct
 from ..interface import BaseInterface
 from ..signal import PytmcSignal
+from ..utils import lazy_components_by_kind
 from . import btms_config as btms
-from .btms_config import (BtmsSourceState, BtmsState, DestinationPosition,
-                          MoveError, SourcePosition, valid_destinations,
-                          valid_sources)
+from .btms_config import (BtmsMoveMatrix, BtmsSourceState, BtmsState,
+                          DestinationPosition, MoveError, SourcePosition,
+                          valid_destinations, valid_sources)
 
 
+@lazy_components_by_kind
 class BtpsVGC(VGC):
     """
     VGC subclass with 'valve_position' component added.
@@ -649,6 +654,14 @@ class BtpsState(BaseInterface, Device):
                 "``ld[N]`` component in BtpsState."
             ) from ex
 
+        self._live_lock = threading.RLock()
+        self._live_values: dict[Any, Any] = {}
+        self._live_handlers: dict[Any, list[Callable[[], bool]]] = {}
+        self._live_cids: list[tuple[Any, int]] = []
+        self._move_matrix: BtmsMoveMatrix | None = None
+        self._live_started = False
+
+    SUB_MOVE_MATRIX = "move_matrix"
     sources: dict[SourcePosition, BtpsSourceStatus]
     destinations: dict[btms.DestinationPosition, DestinationConfig]
 
@@ -797,29 +810,8 @@ class BtpsState(BaseInterface, Device):
         """
         state = btms.BtmsState()
         for source in self.sources.values():
-            try:
-                dest_pos = DestinationPosition.from_index(
-                    source.current_destination.get()
-                )
-            except ValueError:
-                dest_pos = None
-
-            if dest_pos is not None:
-                dest = self.destinations[dest_pos]
-                source_to_dest = dest.sources[source.source_pos]
-                beam_status = bool(
-                    source.lss.opened_status.get()
-                    and bool(source_to_dest.entry_valve_ready.get())
-                    and bool(dest.exit_valve_ready.get())
-                )
-            else:
-                source_to_dest = None
-                beam_status = source.lss.opened_status.get()
-
-            state.sources[source.source_pos] = BtmsSourceState(
-                source=source.source_pos,
-                destination=dest_pos,
-                beam_status=bool(beam_status),
+            state.sources[source.source_pos] = self._get_source_state(
+                source, lambda sig: sig.get()
             )
 
         for dest in self.destinations.values():
@@ -831,6 +823,172 @@ class BtpsState(BaseInterface, Device):
         state.maintenance_mode = bool(self.config.maintenance_mode.get())
         return state
 
+    def _get_source_state(
+        self,
+        source: BtpsSourceStatus,
+        get_value: Callable[[Any], Any],
+    ) -> BtmsSourceState:
+        """
+        Determine the BTMS state of a single source.
+
+        Parameters
+        ----------
+        source : BtpsSourceStatus
+            The source to check.
+        get_value : callable
+            Called with a signal to get its value.
+        """
+        try:
+            dest_pos = DestinationPosition.from_index(
+                get_value(source.current_destination)
+            )
+        except ValueError:
+            dest_pos = None
+
+        if dest_pos is not None and dest_pos in self.destinations:
+            dest = self.destinations[dest_pos]
+            source_to_dest = dest.sources[source.source_pos]
+            beam_status = bool(
+                get_value(source.lss.opened_status)
+                and bool(get_value(source_to_dest.entry_valve_ready))
+                and bool(get_value(dest.exit_valve_ready))
+            )
+        else:
+            beam_status = get_value(source.lss.opened_status)
+
+        return BtmsSourceState(
+            source=source.source_pos,
+            destination=dest_pos,
+            beam_status=bool(beam_status),
+        )
+
+    @property
+    def live_state(self) -> BtmsState:
+        """
+        A subscription-maintained `BtmsState`.
+
+        Accessing this starts monitoring the BTPS signals, see
+        `start_live_state`.
+        """
+        return self.move_matrix.state
+
+    @property
+    def move_matrix(self) -> BtmsMoveMatrix:
+        """
+        The subscription-maintained source x destination move conflicts.
+
+        Accessing this starts monitoring the BTPS signals, see
+        `start_live_state`.
+        """
+        if self._move_matrix is None:
+            self.start_live_state()
+        return self._move_matrix
+
+    def start_live_state(self) -> None:
+        """
+        Subscribe to the BTPS signals and maintain the move matrix.
+
+        Only the entries affected by a source position, beam status,
+        yield-control or maintenance mode change are recomputed.
+        Subscribe to ``SUB_MOVE_MATRIX`` to be notified of updates.
+        """
+        with self._live_lock:
+            if self._move_matrix is not None:
+                return
+            self._move_matrix = BtmsMoveMatrix(
+                sources=tuple(self.sources),
+                destinations=tuple(self.destinations),
+            )
+
+            def add(sig, handler):
+                self._live_handlers.setdefault(sig, []).append(handler)
+
+            update_all_sources = functools.partial(
+                self._live_update_sources, tuple(self.sources)
+            )
+            for source_pos, source in self.sources.items():
+                update = functools.partial(
+                    self._live_update_sources, (source_pos,)
+                )
+                add(source.current_destination, update)
+                add(source.lss.opened_status, update)
+                for dest in self.destinations.values():
+                    add(dest.sources[source_pos].entry_valve_ready, update)
+
+            for dest_pos, dest in self.destinations.items():
+                add(dest.exit_valve_ready, update_all_sources)
+                add(
+                    dest.yields_control,
+                    functools.partial(self._live_update_yields, dest_pos),
+                )
+            add(self.config.maintenance_mode, self._live_update_maintenance)
+
+            # Cached values (if any) are delivered right away with run=True
+            for sig in self._live_handlers:
+                cid = sig.subscribe(
+                    self._live_value_changed,
+                    event_type=sig.SUB_VALUE,
+                    run=True,
+                )
+                self._live_cids.append((sig, cid))
+            self._live_started = True
+
+        self._run_subs(
+            sub_type=self.SUB_MOVE_MATRIX, matrix=self._move_matrix
+        )
+
+    def stop_live_state(self) -> None:
+        """Stop maintaining the live state and move matrix."""
+        with self._live_lock:
+            for sig, cid in self._live_cids:
+                sig.unsubscribe(cid)
+            self._live_cids.clear()
+            self._live_handlers.clear()
+            self._live_values.clear()
+            self._move_matrix = None
+            self._live_started = False
+
+    def _live_value_changed(self, value=None, obj=None, **kwargs) -> None:
+        """Signal callback: cache the value and update the move matrix."""
+        with self._live_lock:
+            if self._move_matrix is None:
+                return
+            self._live_values[obj] = value
+            changed = False
+            for handler in self._live_handlers.get(obj, []):
+                changed = handler() or changed
+            matrix = self._move_matrix
+            notify = changed and self._live_started
+        if notify:
+            self._run_subs(sub_type=self.SUB_MOVE_MATRIX, matrix=matrix)
+
+    def _live_update_sources(
+        self, source_positions: tuple[SourcePosition, ...]
+    ) -> bool:
+        """Update ``source_positions`` in the matrix from cached values."""
+        changed = False
+        for source_pos in source_positions:
+            source_state = self._get_source_state(
+                self.sources[source_pos], self._live_values.get
+            )
+            changed = self._move_matrix.update_source(
+                source_pos, source_state.destination, source_state.beam_status
+            ) or changed
+        return changed
+
+    def _live_update_yields(self, dest_pos: DestinationPosition) -> bool:
+        """Update the yield-control state of ``dest_pos`` from cached values."""
+        dest = self.destinations[dest_pos]
+        return self._move_matrix.update_yields_control(
+            dest_pos, bool(self._live_values.get(dest.yields_control))
+        )
+
+    def _live_update_maintenance(self) -> bool:
+        """Update the maintenance mode from cached values."""
+        return self._move_matrix.update_maintenance_mode(
+            self._live_values.get(self.config.maintenance_mode)
+        )
+
     def status_info(self) -> dict[str, BtmsState]:
         return {"state": self.to_btms_state()}
 
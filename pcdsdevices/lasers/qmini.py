@@ -1,11 +1,15 @@
 import logging
 
+import numpy as np
 from ophyd import Component as Cpt
 from ophyd import Device, EpicsSignal, EpicsSignalRO
 from ophyd import FormattedComponent as FCpt
 
+from pcdsdevices.signal import ArrayHistorySignal, InternalSignal
 from pcdsdevices.variety import set_metadata
 
+from .spectrum_fit import SpectrumFitter
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +51,9 @@ class QminiSpectrometer(Device):
     set_metadata(reset, dict(variety='command-proc', value=1))
     spectrum = Cpt(EpicsSignalRO, ':SPECTRUM', kind='normal')
     wavelengths = Cpt(EpicsSignalRO, ':WAVELENGTHS', kind='normal')
+    spectrum_history = Cpt(ArrayHistorySignal, signal='spectrum', size=120,
+                           lazy=True, kind='omitted',
+                           doc='The last 120 spectra, recorded locally')
 
     model = Cpt(EpicsSignalRO, ':MODEL_CODE', kind='config')
     set_metadata(model, dict(variety='scalar', display_format='hex'))
@@ -83,6 +90,126 @@ class QminiSpectrometer(Device):
     fit_stdev = Cpt(EpicsSignalRO, ':STDEV', kind='config')
     fit_chisq = Cpt(EpicsSignalRO, ':CHISQ', kind='config')
 
+    # Local spectral fitting, see start_local_fit
+    local_w0 = Cpt(InternalSignal, kind='omitted',
+                   doc='Locally fitted center wavelength of the last shot')
+    local_fwhm = Cpt(InternalSignal, kind='omitted',
+                     doc='Locally fitted FWHM of the last shot')
+    local_amplitude = Cpt(InternalSignal, kind='omitted',
+                          doc='Locally fitted amplitude of the last shot')
+
+    def __init__(self, prefix, *, name, **kwargs):
+        self._wavelengths = None
+        self._local_fitter = None
+        self._local_fit_cid = None
+        super().__init__(prefix, name=name, **kwargs)
+
+    def get_wavelengths(self, refresh=False):
+        """
+        Get the wavelength axis of the spectrum.
+
+        The wavelengths only change when the spectrometer is recalibrated,
+        so they are read once and cached.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            If True, read the wavelengths again.
+
+        Returns
+        -------
+        wavelengths : np.ndarray
+        """
+        if refresh or self._wavelengths is None:
+            self._wavelengths = np.asarray(self.wavelengths.get())
+        return self._wavelengths
+
+    def get_fitter(self, method='gaussian', **fit_kwargs):
+        """
+        Get a `SpectrumFitter` for this spectrometer's wavelength axis.
+
+        Parameters
+        ----------
+        method : {'gaussian', 'moments'}, optional
+            The fit method, see `SpectrumFitter`.
+        **fit_kwargs
+            Passed to the fitter.
+        """
+        return SpectrumFitter(self.get_wavelengths(), method=method,
+                              **fit_kwargs)
+
+    def fit_spectra(self, spectra=None, n=None, method='gaussian',
+                    **fit_kwargs):
+        """
+        Fit spectra locally, without using the IOC fitting.
+
+        Parameters
+        ----------
+        spectra : array-like, optional
+            A spectrum or a stack of spectra of shape (n_shots, n_points).
+            Defaults to the recorded `spectrum_history`, or the current
+            spectrum if nothing has been recorded.
+        n : int, optional
+            When fitting the history, only fit the last ``n`` shots.
+        method : {'gaussian', 'moments'}, optional
+            The fit method, see `SpectrumFitter`.
+        **fit_kwargs
+            Passed to the fitter.
+
+        Returns
+        -------
+        result : pcdsdevices.lasers.spectrum_fit.SpectrumFitResult
+            The per-shot amplitude, center, sigma, fwhm and chisq.
+        """
+        fitter = self.get_fitter(method=method, **fit_kwargs)
+        if spectra is not None:
+            return fitter.fit(spectra)
+        history = self.spectrum_history
+        if history.count:
+            return history.apply(fitter.fit, n)
+        return fitter.fit(self.spectrum.get())
+
+    def start_local_fit(self, method='gaussian', **fit_kwargs):
+        """
+        Fit every new spectrum locally as it arrives.
+
+        The results are put to `local_w0`, `local_fwhm` and
+        `local_amplitude`. Use `stop_local_fit` to stop.
+
+        Parameters
+        ----------
+        method : {'gaussian', 'moments'}, optional
+            The fit method, see `SpectrumFitter`.
+        **fit_kwargs
+            Passed to the fitter.
+        """
+        self.stop_local_fit()
+        self._local_fitter = self.get_fitter(method=method, **fit_kwargs)
+        self._local_fit_cid = self.spectrum.subscribe(
+            self._local_fit_callback
+        )
+
+    def stop_local_fit(self):
+        """Stop fitting new spectra locally."""
+        if self._local_fit_cid is not None:
+            self.spectrum.unsubscribe(self._local_fit_cid)
+            self._local_fit_cid = None
+
+    def _local_fit_callback(self, *args, value, timestamp=None, **kwargs):
+        """Fit one new spectrum and publish the results."""
+        fitter = self._local_fitter
+        if value is None or fitter is None:
+            return
+        if np.size(value) != len(fitter.wavelengths):
+            logger.debug('%s spectrum does not match the wavelengths, '
+                         'skipping local fit', self.name)
+            return
+        result = fitter.fit(value)
+        self.local_w0.put(result.center[0], timestamp=timestamp, force=True)
+        self.local_fwhm.put(result.fwhm[0], timestamp=timestamp, force=True)
+        self.local_amplitude.put(result.amplitude[0], timestamp=timestamp,
+                                 force=True)
+
 
 class QminiWithEvr(QminiSpectrometer):
     """
@@ -0,0 +1,284 @@
+"""
+Batched, client-side fitting of spectra.
+
+This fits many spectra at once, e.g. a stack of recorded Qmini shots, without
+relying on the IOC-side fitting which only handles one spectrum at a time.
+
+Each spectrum is modeled as a Gaussian on top of a constant background::
+
+    y = amplitude * exp(-(x - center)**2 / (2 * sigma**2)) + background
+
+The background is estimated from a low percentile of each spectrum and the
+initial guess comes from the intensity-weighted moments of the peak. The
+guess is then refined with a few Gauss-Newton steps, done for all spectra at
+once with NumPy.
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+#: Ratio between the full width at half maximum and sigma of a Gaussian
+FWHM_PER_SIGMA = 2.0 * math.sqrt(2.0 * math.log(2.0))
+
+
+@dataclasses.dataclass
+class SpectrumFitResult:
+    """
+    Per-spectrum fit results, one entry per fitted spectrum.
+
+    Attributes
+    ----------
+    amplitude : np.ndarray
+        The peak height above the background.
+    center : np.ndarray
+        The peak center, in the units of the wavelength axis.
+    sigma : np.ndarray
+        The Gaussian standard deviation.
+    background : np.ndarray
+        The constant background that was subtracted.
+    chisq : np.ndarray
+        The mean squared residual of the fit inside the fit window.
+    converged : np.ndarray
+        False where the fit failed, e.g. for an empty spectrum. These
+        entries are NaN in the other arrays.
+    """
+    amplitude: np.ndarray
+    center: np.ndarray
+    sigma: np.ndarray
+    background: np.ndarray
+    chisq: np.ndarray
+    converged: np.ndarray
+
+    @property
+    def fwhm(self) -> np.ndarray:
+        """The full width at half maximum of each peak."""
+        return FWHM_PER_SIGMA * self.sigma
+
+    def __len__(self) -> int:
+        return len(self.center)
+
+
+def _truncated_variance_factor(threshold):
+    """
+    Ratio of the thresholded to the true variance of a Gaussian.
+
+    This is the variance of a Gaussian-weighted distribution restricted to
+    the points above ``threshold`` times the peak, relative to sigma**2.
+    """
+    if threshold <= 0:
+        return 1.0
+    z0 = np.sqrt(-2.0 * np.log(threshold))
+    pdf = np.exp(-0.5 * z0 ** 2) / np.sqrt(2.0 * np.pi)
+    return 1.0 - 2.0 * z0 * pdf / math.erf(z0 / np.sqrt(2.0))
+
+
+def _as_stack(wavelengths, spectra):
+    """Normalize the inputs to a 1D axis and a 2D stack of spectra."""
+    x = np.asarray(wavelengths, dtype=float)
+    y = np.atleast_2d(np.asarray(spectra, dtype=float))
+    if y.shape[1] != x.shape[0]:
+        raise ValueError(
+            f'Spectra have {y.shape[1]} points but there are {x.shape[0]} '
+            f'wavelengths'
+        )
+    return x, y
+
+
+def moment_estimate(wavelengths, spectra, threshold=0.2,
+                    background_percentile=10.0):
+    """
+    Estimate the peak of each spectrum from its intensity moments.
+
+    Only the points above ``threshold`` times the peak height are used, so
+    that the tails and noise floor do not dominate. The width is corrected
+    for this truncation, assuming a Gaussian peak.
+
+    Parameters
+    ----------
+    wavelengths : array-like
+        The wavelength axis, shared by all spectra.
+    spectra : array-like
+        Array of shape (n_spectra, n_points), or a single spectrum.
+    threshold : float, optional
+        The fraction of the peak height used to select the peak region.
+    background_percentile : float, optional
+        The percentile of each spectrum used as its background.
+
+    Returns
+    -------
+    result : SpectrumFitResult
+        The moment-based estimate. ``chisq`` is not computed and is NaN.
+    """
+    x, y = _as_stack(wavelengths, spectra)
+    background = np.percentile(y, background_percentile, axis=1)
+    signal = y - background[:, np.newaxis]
+    amplitude = signal.max(axis=1)
+    weights = np.where(
+        signal >= threshold * amplitude[:, np.newaxis], signal, 0.0
+    )
+    total = weights.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = weights @ x / total
+        variance = (
+            (weights * (x - center[:, np.newaxis]) ** 2).sum(axis=1) / total
+        )
+    converged = (amplitude > 0) & (total > 0) & (variance > 0)
+    sigma = np.sqrt(
+        np.where(converged, variance, np.nan)
+        / _truncated_variance_factor(threshold)
+    )
+    return SpectrumFitResult(
+        amplitude=np.where(converged, amplitude, np.nan),
+        center=np.where(converged, center, np.nan),
+        sigma=sigma,
+        background=background,
+        chisq=np.full(len(y), np.nan),
+        converged=converged,
+    )
+
+
+def fit_gaussian(wavelengths, spectra, iterations=5, window=3.0,
+                 threshold=0.2, background_percentile=10.0):
+    """
+    Fit a Gaussian to each spectrum in a stack.
+
+    The fit of each spectrum only uses the points within ``window`` sigma
+    of the initial estimate, so the cost scales with the peak width rather
+    than the length of the spectra.
+
+    Parameters
+    ----------
+    wavelengths : array-like
+        The wavelength axis, shared by all spectra.
+    spectra : array-like
+        Array of shape (n_spectra, n_points), or a single spectrum.
+    iterations : int, optional
+        The number of Gauss-Newton refinement steps. Use 0 to only return
+        the moment-based estimate, see `moment_estimate`.
+    window : float, optional
+        The half-width of the fit window, in units of the estimated sigma.
+    threshold : float, optional
+        Passed to `moment_estimate`.
+    background_percentile : float, optional
+        Passed to `moment_estimate`.
+
+    Returns
+    -------
+    result : SpectrumFitResult
+    """
+    x, y = _as_stack(wavelengths, spectra)
+    guess = moment_estimate(x, y, threshold=threshold,
+                            background_percentile=background_percentile)
+    if iterations <= 0:
+        return guess
+    if x[0] > x[-1]:
+        x = x[::-1]
+        y = y[:, ::-1]
+
+    ok = guess.converged.copy()
+    center = np.where(ok, guess.center, x[0])
+    sigma = np.where(ok, guess.sigma, 1.0)
+    amp = np.where(ok, guess.amplitude, 1.0)
+
+    # Gather a fixed window of points around each initial estimate
+    lo = np.searchsorted(x, center - window * sigma, side='left')
+    hi = np.searchsorted(x, center + window * sigma, side='right')
+    width = max(int((hi - lo).max(initial=0)), 1)
+    offsets = np.arange(width)
+    index = np.minimum(lo[:, np.newaxis] + offsets, len(x) - 1)
+    mask = offsets < (hi - lo)[:, np.newaxis]
+    xs = x[index]
+    ys = (
+        np.take_along_axis(y, index, axis=1)
+        - guess.background[:, np.newaxis]
+    )
+    ok &= mask.sum(axis=1) > 3
+
+    for _ in range(iterations):
+        dx = xs - center[:, np.newaxis]
+        inv_var = 1.0 / sigma[:, np.newaxis] ** 2
+        gauss = np.where(mask, np.exp(-0.5 * dx ** 2 * inv_var), 0.0)
+        resid = ys - amp[:, np.newaxis] * gauss
+        # Jacobian columns with respect to (amp, center, sigma)
+        j_amp = gauss
+        j_center = amp[:, np.newaxis] * gauss * dx * inv_var
+        j_sigma = j_center * dx / sigma[:, np.newaxis]
+        jac = (j_amp, j_center, j_sigma)
+        jtj = np.empty((len(y), 3, 3))
+        jtr = np.empty((len(y), 3))
+        for row in range(3):
+            jtr[:, row] = (jac[row] * resid).sum(axis=1)
+            for col in range(row, 3):
+                jtj[:, row, col] = jtj[:, col, row] = (
+                    (jac[row] * jac[col]).sum(axis=1)
+                )
+        # Leave singular systems (e.g. too few points) alone
+        singular = ~ok | ~(np.abs(np.linalg.det(jtj)) > 0)
+        jtj[singular] = np.eye(3)
+        jtr[singular] = 0.0
+        step = np.linalg.solve(jtj, jtr[..., np.newaxis])[..., 0]
+        amp = amp + step[:, 0]
+        center = center + step[:, 1]
+        sigma = np.abs(sigma + step[:, 2])
+        ok &= np.isfinite(amp) & np.isfinite(center) & (sigma > 0)
+        amp[~ok], center[~ok], sigma[~ok] = 1.0, x[0], 1.0
+
+    dx = xs - center[:, np.newaxis]
+    resid = np.where(
+        mask,
+        ys - amp[:, np.newaxis] * np.exp(-0.5 * (dx / sigma[:, np.newaxis])
+                                         ** 2),
+        0.0,
+    )
+    chisq = (resid ** 2).sum(axis=1) / np.maximum(mask.sum(axis=1) - 3, 1)
+
+    def masked(values):
+        return np.where(ok, values, np.nan)
+
+    return SpectrumFitResult(
+        amplitude=masked(amp),
+        center=masked(center),
+        sigma=masked(sigma),
+        background=guess.background,
+        chisq=masked(chisq),
+        converged=ok,
+    )
+
+
+class SpectrumFitter:
+    """
+    Fits spectra against a fixed wavelength axis.
+
+    Parameters
+    ----------
+    wavelengths : array-like
+        The wavelength axis of the spectra.
+    method : {'gaussian', 'moments'}, optional
+        Whether to refine the moment-based estimate with a Gaussian fit.
+    **fit_kwargs
+        Passed to `fit_gaussian` or `moment_estimate`.
+    """
+    methods = ('gaussian', 'moments')
+
+    def __init__(self, wavelengths, method='gaussian', **fit_kwargs):
+        if method not in self.methods:
+            raise ValueError(
+                f'Unknown fit method {method!r}, expected one of '
+                f'{self.methods}'
+            )
+        self.wavelengths = np.asarray(wavelengths, dtype=float)
+        self.method = method
+        self.fit_kwargs = fit_kwargs
+
+    def fit(self, spectra) -> SpectrumFitResult:
+        """Fit a single spectrum or a stack of spectra."""
+        if self.method == 'moments':
+            return moment_estimate(self.wavelengths, spectra,
+                                   **self.fit_kwargs)
+        return fit_gaussian(self.wavelengths, spectra, **self.fit_kwargs)
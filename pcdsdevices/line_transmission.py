@@ -0,0 +1,282 @@
+"""
+Beam transmission along a line of devices, from cached device states.
+
+Estimating the transmission of a beamline means asking every device in the
+beam for its transmission, which costs a get (or several) per device.
+`LineTransmission` instead subscribes to the state of every device once
+and keeps a flat lookup table of the transmission of each device state, so
+that the transmission of the whole line is a single indexed product::
+
+    line = LineTransmission([im1l0, ipm2, sl1l0, at1l0])
+    line.transmission()
+    line.transmission(energy=np.linspace(5000, 10000, 51))
+
+Devices are handled as follows, in order:
+
+* Devices with ``transmission_cpts`` (e.g. `IPMMotion`) are split into those
+  components, whose transmissions multiply.
+* Devices with a ``transmission_table`` (e.g. `InOutPositioner` subclasses
+  like `IPMTarget`, and `IPMDiode`) are looked up by their state enum value.
+  States with energy-dependent tables are interpolated when an energy is
+  given.
+* Other `LightpathMixin` devices use the transmission of the first output
+  branch of their monitored lightpath state, independent of energy. These
+  need lightpath branches, otherwise nothing keeps their state up to date.
+
+Devices in an unknown state have a transmission of :const:`~math.nan`.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import numpy as np
+
+from .interface import LightpathMixin
+
+logger = logging.getLogger(__name__)
+
+
+class _Source:
+    """One transmission lookup table and the current index into it."""
+
+    def __init__(self, device, owner, positioner=None):
+        #: The top-level device this source belongs to
+        self.device = device
+        #: The object with the transmission_table
+        self.owner = owner
+        #: The state positioner that indexes the table, None for lightpath
+        self.positioner = positioner
+        self.table = None
+        self.curves = {}
+        self.index = -1
+
+    def build_table(self) -> bool:
+        """Build the lookup table, returns False if it is not ready yet."""
+        if self.table is not None:
+            return True
+        if self.positioner is None:
+            self.table = np.array([_lightpath_transmission(
+                self.owner.get_monitored_lightpath_state())])
+            self.index = 0
+            return True
+        try:
+            self.table = np.asarray(self.owner.transmission_table(),
+                                    dtype=float)
+        except (AttributeError, ValueError):
+            # The state enum is not known until the positioner connects
+            return False
+        self.curves = getattr(self.owner, '_trans_curves', {})
+        return True
+
+
+def _lightpath_transmission(state) -> float:
+    """The transmission of the first output branch of a LightpathState."""
+    if state is None:
+        return math.nan
+    return next(iter(state.output.values()), math.nan)
+
+
+def _positioner_for(device):
+    """The state positioner whose enum values index the device's table."""
+    if hasattr(device, 'states_list'):
+        return device
+    return device.state
+
+
+class LineTransmission:
+    """
+    Transmission of a line of devices at one or many photon energies.
+
+    Parameters
+    ----------
+    devices : sequence of Device
+        The devices along the line. See the module documentation for the
+        supported devices.
+
+    Raises
+    ------
+    TypeError
+        If a device has no known way of reporting its transmission.
+    """
+
+    def __init__(self, devices: Sequence[Any]):
+        self.devices = list(devices)
+        self.names = [device.name for device in self.devices]
+        self._lock = threading.RLock()
+        self._sources: list[_Source] = []
+        # Index of the first source of each device, for reduceat
+        self._device_starts = []
+        for device in self.devices:
+            self._device_starts.append(len(self._sources))
+            self._add_sources(device, device)
+        self._subscriptions = []
+        self._rebuild()
+        for position, source in enumerate(self._sources):
+            if source.positioner is None:
+                # run=True replays the latest lightpath state, if any
+                cid = source.owner.subscribe(
+                    self._lightpath_callback(position),
+                    event_type=source.owner.SUB_LIGHTPATH, run=True,
+                )
+                self._subscriptions.append((source.owner, cid))
+            else:
+                signal = source.positioner.state
+                cid = signal.subscribe(self._state_callback(position),
+                                       run=True)
+                self._subscriptions.append((signal, cid))
+                if source.table is None:
+                    # The table needs the state enum from the connection
+                    cid = signal.subscribe(self._meta_callback(position),
+                                           event_type=signal.SUB_META,
+                                           run=False)
+                    self._subscriptions.append((signal, cid))
+
+    def _add_sources(self, device, part) -> None:
+        if getattr(part, 'transmission_cpts', None):
+            for attr in part.transmission_cpts:
+                self._add_sources(device, getattr(part, attr))
+        elif hasattr(part, 'transmission_table'):
+            self._sources.append(
+                _Source(device, part, positioner=_positioner_for(part))
+            )
+        elif isinstance(part, LightpathMixin):
+            if not part.lightpath_monitored:
+                raise TypeError(
+                    f'The lightpath state of {part.name} is not monitored, '
+                    f'it needs input and output branches'
+                )
+            self._sources.append(_Source(device, part))
+        else:
+            raise TypeError(
+                f'Cannot determine the transmission of {part.name}, it is '
+                f'not an in/out or lightpath device'
+            )
+
+    def _rebuild(self) -> None:
+        """
+        Concatenate the source tables into one flat lookup table.
+
+        Tables that were already built are reused, so this only asks the
+        positioners that were not ready before.
+        """
+        with self._lock:
+            ready = [source.build_table() for source in self._sources]
+            tables = [source.table if ok else np.empty(0)
+                      for source, ok in zip(self._sources, ready)]
+            lengths = np.array([len(table) for table in tables], dtype=int)
+            # Slot 0 holds the transmission of unknown states
+            self._offsets = 1 + np.concatenate(
+                ([0], np.cumsum(lengths)[:-1])
+            ).astype(int)
+            self._lengths = lengths
+            self._flat = np.concatenate([[math.nan]] + tables)
+            self._indices = np.array(
+                [source.index for source in self._sources], dtype=int
+            )
+            self._curved = [idx for idx, source in enumerate(self._sources)
+                            if source.curves]
+
+    def _state_callback(self, position: int):
+        source = self._sources[position]
+
+        def update(*args, value, **kwargs):
+            try:
+                index = source.positioner.get_state(value).value
+            except Exception:
+                index = -1
+            with self._lock:
+                source.index = index
+                self._indices[position] = index
+                if source.table is None:
+                    self._rebuild()
+        return update
+
+    def _meta_callback(self, position: int):
+        source = self._sources[position]
+
+        def update(*args, **kwargs):
+            with self._lock:
+                if source.table is None:
+                    self._rebuild()
+        return update
+
+    def _lightpath_callback(self, position: int):
+        source = self._sources[position]
+
+        def update(*args, new_state=None, **kwargs):
+            value = _lightpath_transmission(new_state)
+            with self._lock:
+                source.table[0] = value
+                self._flat[self._offsets[position]] = value
+        return update
+
+    def _source_values(self, energy=None) -> np.ndarray:
+        """The transmission of each source, with energy as leading axes."""
+        with self._lock:
+            indices = self._indices
+            known = (indices >= 0) & (indices < self._lengths)
+            values = self._flat[np.where(known, self._offsets + indices, 0)]
+            if energy is None:
+                return values
+            energy = np.asarray(energy, dtype=float)
+            values = np.broadcast_to(
+                values, energy.shape + values.shape
+            ).copy()
+            for position in self._curved:
+                curve = self._sources[position].curves.get(
+                    int(indices[position])
+                )
+                if curve is not None:
+                    values[..., position] = np.interp(energy, *curve)
+        return values
+
+    def transmission(self, energy: Optional[Any] = None):
+        """
+        The transmission of the whole line.
+
+        Parameters
+        ----------
+        energy : float or array-like, optional
+            Photon energies in eV. Without an energy, devices use their
+            energy-independent transmissions.
+
+        Returns
+        -------
+        transmission : float or np.ndarray
+            The product of the device transmissions, with the shape of
+            ``energy``.
+        """
+        product = np.prod(self._source_values(energy), axis=-1)
+        if energy is None:
+            return float(product)
+        return product
+
+    def device_transmissions(self, energy: Optional[Any] = None) -> np.ndarray:
+        """
+        The transmission of each device, in the order of `devices`.
+
+        Parameters
+        ----------
+        energy : float or array-like, optional
+            Photon energies in eV.
+
+        Returns
+        -------
+        transmissions : np.ndarray
+            Array of shape ``np.shape(energy) + (len(devices),)``.
+        """
+        if not self.devices:
+            return np.ones(np.shape(energy) + (0,))
+        return np.multiply.reduceat(
+            self._source_values(energy), self._device_starts, axis=-1
+        )
+
+    def destroy(self) -> None:
+        """Unsubscribe from all device states."""
+        for obj, cid in self._subscriptions:
+            obj.unsubscribe(cid)
+        self._subscriptions.clear()
@@ -31,11 +31,17 @@ from .inout import InOutRecordPositioner
 from .interface import BaseInterface, FltMvInterface, LightpathMixin
 from .pseudopos import (PseudoPositioner, PseudoSingleInterface,
                         pseudo_position_argument, real_position_argument)
-from .utils import get_status_float, get_status_value, schedule_task
+from .utils import (get_status_float, get_status_value,
+                    lazy_components_by_kind, schedule_task)
 
 logger = logging.getLogger(__name__)
 
 
+@lazy_components_by_kind
+class _LazyIMS(IMS):
+    """IMS motor whose config and omitted signals connect on first access."""
+
+
 class H1N(InOutRecordPositioner):
     states_list = ['OUT', 'C', 'Si']
     in_states = ['C', 'Si']
@@ -128,23 +134,23 @@ class CrystalTower1(BaseInterface, GroupDevice):
         The name of this device.
     """
     # x, y, and z are on the base but not touched in normal operations
-    z1 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:04',
+    z1 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:04',
               kind='normal', doc='LOM Xtal1 Z')
-    x1 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:05',
+    x1 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:05',
               kind='normal', doc='LOM Xtal1 X')
-    y1 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:06',
+    y1 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:06',
               kind='normal', doc='LOM Xtal1 Y')
     # theta movement
-    th1 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:07',
+    th1 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:07',
                kind='normal', doc='LOM Xtal1 Theta')
     # chi movement
-    chi1 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:08',
+    chi1 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:08',
                 kind='normal', doc='LOM Xtal1 Chi')
     # normal to the crystal surface movement
-    h1n = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:09',
+    h1n = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:09',
                kind='normal', doc='LOM Xtal1 Hn')
     # paralell to the crystal surface movement
-    h1p = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:20',
+    h1p = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:20',
                kind='normal', doc='LOM Xtal1 Hp')
 
     # states
@@ -368,6 +374,7 @@ hp [{hp_units}]  {hp_user} ({hp_dial})
 """
 
 
+@lazy_components_by_kind
 class CrystalTower2(BaseInterface, GroupDevice):
     """
     LODCM Crystal Tower 2.
@@ -382,23 +389,23 @@ class CrystalTower2(BaseInterface, GroupDevice):
         The name of this device.
     """
     # x, y, and z are on the base but not touched in normal operations
-    z2 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:10',
+    z2 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:10',
               kind='normal', doc='LOM Xtal2 Z')
-    x2 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:11',
+    x2 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:11',
               kind='normal', doc='LOM Xtal2 X')
-    y2 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:12',
+    y2 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:12',
               kind='normal', doc='LOM Xtal2 Y')
     # thata movement
-    th2 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:13',
+    th2 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:13',
                kind='normal', doc='LOM Xtal2 Theta')
     # chi movement
-    chi2 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:14',
+    chi2 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:14',
                 kind='normal', doc='LOM Xtal2 Chi')
     # normal to the crystal surface movement
-    h2n = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:15',
+    h2n = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:15',
                kind='normal', doc='LOM Xtal2 Hn')
     # in the DAQ for scanning in python, only used for commissioning
-    diode2 = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:21',
+    diode2 = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:21',
                   kind='normal', doc='LOM Xtal2 PIPS')
 
     x2_retry_deadband = FCpt(EpicsSignalRO,
@@ -639,21 +646,21 @@ class DiagnosticsTower(BaseInterface, GroupDevice):
     """
     # Located midway between T1 and T2 in the center of rotation of the device.
     # horizontal slits
-    dh = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:16',
+    dh = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:16',
               kind='normal', doc='LOM Dia H')
     # vertical slits
-    dv = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:17',
+    dv = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:17',
               kind='normal', doc='LOM Dia V')
-    dr = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:19',
+    dr = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:19',
               kind='normal', doc='LOM Dia Theta')
     # filters wheel
-    df = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:{self._df_suffix}',
+    df = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:{self._df_suffix}',
               kind='normal', doc='LOM Dia Filter Wheel')
     # pips diode
-    dd = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:18',
+    dd = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:18',
               kind='normal', doc='LOM Dia PIPS')
     # yag screen
-    yag_zoom = FCpt(IMS, '{self._hutch_prefix}:MON:CLZ:01',
+    yag_zoom = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:CLZ:01',
                     kind='normal', doc='LOM Zoom')
 
     tab_component_names = True
@@ -747,7 +754,7 @@ class LODCMEnergySi(FltMvInterface, PseudoPositioner, GroupDevice):
     """
     tower1 = FCpt(CrystalTower1, '{self._prefix}', kind='normal')
     tower2 = FCpt(CrystalTower2, '{self._prefix}', kind='normal')
-    dr = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:19',
+    dr = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:19',
               kind='normal', doc='LOM Dia Theta')
 
     th1Si = FCpt(OffsetMotor, prefix='{self._prefix}:TH1:OFF_Si',
@@ -976,7 +983,7 @@ class LODCMEnergyC(FltMvInterface, PseudoPositioner, GroupDevice):
     """
     tower1 = FCpt(CrystalTower1, '{self._prefix}', kind='normal')
     tower2 = FCpt(CrystalTower2, '{self._prefix}', kind='normal')
-    dr = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:19',
+    dr = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:19',
               kind='normal', doc='LOM Dia Theta')
 
     th1C = FCpt(OffsetMotor, prefix='{self._prefix}:TH1:OFF_C',
@@ -1203,7 +1210,7 @@ class LODCMEnergyC1(FltMvInterface, PseudoPositioner, GroupDevice):
         The name of this device.
     """
     tower1 = FCpt(CrystalTower1, '{self._prefix}', kind='normal')
-    dr = FCpt(IMS, '{self._hutch_prefix}:MON:MMS:19',
+    dr = FCpt(_LazyIMS, '{self._hutch_prefix}:MON:MMS:19',
               kind='normal', doc='LOM Dia Theta')
 
     th1C = FCpt(OffsetMotor, prefix='{self._prefix}:TH1:OFF_C',
@@ -0,0 +1,431 @@
+"""
+Serve the PVs of pcdsdevices classes from a local soft IOC.
+
+Fake devices from ``make_fake_device`` skip Channel Access entirely, so they
+cannot be used to measure connection times or monitor throughput. This tool
+instead walks the component tree of real device classes, guesses a plausible
+type for every PV, and serves all of them from a caproto soft IOC on the
+local machine. Optionally, the read-only numeric PVs are updated at a fixed
+rate to emulate live readbacks.
+
+Example, serving two motors and a Qmini with 10 Hz readback updates::
+
+    python -m pcdsdevices.make_soft_ioc \\
+        pcdsdevices.epics_motor.IMS=TST:MTR:01 \\
+        pcdsdevices.epics_motor.IMS=TST:MTR:02 \\
+        pcdsdevices.lasers.qmini.QminiSpectrometer=TST:QMINI \\
+        --rate 10
+
+Running the IOC requires ``caproto``, which is not otherwise a dependency
+of pcdsdevices. The types are educated guesses based on the variety
+metadata, the ophyd signal options, and common record fields.
+"""
+import dataclasses
+import importlib
+import json
+import logging
+import random
+import re
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from ophyd.signal import EpicsSignalBase, EpicsSignalRO
+
+from .state import StatePositioner
+from .variety import get_metadata
+
+logger = logging.getLogger(__name__)
+
+# Default length of array PVs, when nothing better is known
+DEFAULT_ARRAY_LENGTH = 1024
+# Limits of the Channel Access string and enum types
+MAX_STRING_LENGTH = 39
+MAX_ENUM_STRINGS = 16
+
+# Well-known record fields, as (dtype, value, enum strings)
+FIELD_TYPES = {
+    'VAL': ('float', 0.0, ()),
+    'RBV': ('float', 0.0, ()),
+    'DMOV': ('int', 1, ()),
+    'MOVN': ('int', 0, ()),
+    'MSTA': ('int', 0, ()),
+    'HLS': ('int', 0, ()),
+    'LLS': ('int', 0, ()),
+    'STOP': ('int', 0, ()),
+    'PROC': ('int', 0, ()),
+    'PREC': ('int', 3, ()),
+    'HLM': ('float', 100.0, ()),
+    'LLM': ('float', -100.0, ()),
+    'DHLM': ('float', 100.0, ()),
+    'DLLM': ('float', -100.0, ()),
+    'VELO': ('float', 1.0, ()),
+    'VMAX': ('float', 10.0, ()),
+    'ACCL': ('float', 0.2, ()),
+    'EGU': ('string', 'mm', ()),
+    'DESC': ('string', '', ()),
+    'NAME': ('string', '', ()),
+    'PN': ('string', '', ()),
+    'SPMG': ('enum', 3, ('Stop', 'Pause', 'Move', 'Go')),
+    'SPG': ('enum', 2, ('Stop', 'Pause', 'Go')),
+    'SET': ('enum', 0, ('Use', 'Set')),
+    'DIR': ('enum', 0, ('Pos', 'Neg')),
+    'CNEN': ('enum', 0, ('Disable', 'Enable')),
+    'SEVR': ('enum', 0, ('NO_ALARM', 'MINOR', 'MAJOR', 'INVALID')),
+    'STAT': ('enum', 0, ('NO_ALARM', 'READ', 'WRITE', 'HIHI', 'HIGH',
+                         'LOLO', 'LOW', 'STATE', 'COS', 'COMM', 'TIMEOUT',
+                         'HWLIMIT', 'CALC', 'SCAN', 'LINK', 'SOFT')),
+}
+
+# Suffix fragments that usually indicate a waveform
+ARRAY_HINTS = ('ARRAYDATA', 'WAVEFORM', 'SPECTRUM', 'WAVELENGTHS', 'RAWDATA',
+               'WF')
+# Suffix fragments that usually indicate a string
+STRING_HINTS = ('NAME', 'DESC', 'EGU', 'UNITS', 'STR', 'MSG', 'VERSION')
+
+
+@dataclasses.dataclass
+class PVSpec:
+    """
+    The type and initial value of one PV in the soft IOC.
+
+    Attributes
+    ----------
+    pvname : str
+        The full PV name.
+    dtype : str
+        One of 'float', 'int', 'enum', 'string' or 'float_array'.
+    value : Any
+        The initial value. For enums, this is the index of the initial state.
+    enum_strings : tuple of str
+        The enum states, for enum PVs.
+    count : int
+        The number of elements, for array PVs.
+    dynamic : bool
+        If True, this PV receives synthetic updates.
+    signal : str
+        The dotted name of the signal that first used this PV.
+    """
+    pvname: str
+    dtype: str
+    value: Any
+    enum_strings: Tuple[str, ...] = ()
+    count: int = 1
+    dynamic: bool = False
+    signal: str = ''
+
+
+def import_device_class(path):
+    """Import a device class from its dotted path, e.g. ``module.Class``."""
+    module_name, _, class_name = path.rpartition('.')
+    if not module_name:
+        raise ValueError(f'Expected a dotted path to a class, got {path!r}')
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def _field_name(pvname):
+    """Get the last part of a PV name: the record field or the suffix."""
+    return re.split(r'[:.]', pvname)[-1]
+
+
+def guess_pv_spec(signal, pvname):
+    """
+    Guess the type and initial value of one of ``signal``'s PVs.
+
+    Parameters
+    ----------
+    signal : ophyd.signal.EpicsSignalBase
+        The signal using the PV.
+    pvname : str
+        The PV name.
+
+    Returns
+    -------
+    spec : PVSpec
+    """
+    field = _field_name(pvname)
+    upper = field.upper()
+    spec = PVSpec(pvname=pvname, dtype='float', value=0.0,
+                  signal=signal.dotted_name or signal.name)
+
+    try:
+        metadata = get_metadata(signal)
+    except Exception:
+        metadata = {}
+    variety = metadata.get('variety', '')
+    enum_strings = tuple(metadata.get('enum_strings', ()))
+    # Components of GroupDevices only keep their biological parent
+    parent = getattr(signal, 'biological_parent', None) or signal.parent
+
+    if (isinstance(parent, StatePositioner)
+            and signal is getattr(parent, 'state', None)):
+        states = [state for state in parent.states_list if state]
+        spec.dtype = 'enum'
+        spec.value = 0
+        spec.enum_strings = tuple(states or ('Unknown', 'OUT', 'IN'))
+    elif field in FIELD_TYPES or upper in FIELD_TYPES:
+        dtype, value, enum_strings = FIELD_TYPES.get(field,
+                                                     FIELD_TYPES.get(upper))
+        spec.dtype = dtype
+        spec.value = value
+        spec.enum_strings = enum_strings
+    elif enum_strings or variety in ('enum', 'command-enum', 'text-enum'):
+        spec.dtype = 'enum'
+        spec.value = 0
+        spec.enum_strings = enum_strings or ('False', 'True')
+    elif variety.startswith('array'):
+        spec.dtype = 'float_array'
+    elif variety.startswith('text'):
+        spec.dtype = 'string'
+    elif variety.startswith('command') or variety == 'bitmask':
+        spec.dtype = 'int'
+        spec.value = 0
+    elif variety.startswith('scalar'):
+        pass
+    elif any(hint in upper for hint in ARRAY_HINTS):
+        spec.dtype = 'float_array'
+    elif getattr(signal, 'as_string', False) or any(
+            hint in upper for hint in STRING_HINTS):
+        spec.dtype = 'string'
+
+    if spec.dtype == 'string':
+        spec.value = spec.value if isinstance(spec.value, str) else ''
+    elif spec.dtype == 'float_array':
+        spec.count = DEFAULT_ARRAY_LENGTH
+        spec.value = [0.0] * spec.count
+    elif spec.dtype == 'enum':
+        spec.enum_strings = tuple(
+            state[:MAX_STRING_LENGTH]
+            for state in spec.enum_strings[:MAX_ENUM_STRINGS]
+        )
+    return spec
+
+
+def collect_pv_specs(devices, specs=None):
+    """
+    Walk the component trees of ``devices`` and collect their PVs.
+
+    Lazy components are instantiated, so that every PV is included. PVs
+    that are used by several signals are only included once.
+
+    Parameters
+    ----------
+    devices : iterable of ophyd.Device
+        The devices to serve. These do not need to be connected.
+    specs : dict, optional
+        Existing specs to add to, keyed by PV name.
+
+    Returns
+    -------
+    specs : dict
+        Mapping of PV name to `PVSpec`.
+    """
+    specs = {} if specs is None else specs
+    for device in devices:
+        for walk in device.walk_signals(include_lazy=True):
+            signal = walk.item
+            if not isinstance(signal, EpicsSignalBase):
+                continue
+            read_pv = signal.pvname
+            write_pv = getattr(signal, 'setpoint_pvname', read_pv)
+            for pvname in (read_pv, write_pv):
+                if pvname in specs:
+                    continue
+                spec = guess_pv_spec(signal, pvname)
+                # Update readbacks that are never written by ophyd
+                spec.dynamic = (
+                    spec.dtype in ('float', 'float_array')
+                    and (isinstance(signal, EpicsSignalRO)
+                         or pvname != write_pv)
+                )
+                specs[pvname] = spec
+    return specs
+
+
+def make_devices(entries):
+    """
+    Instantiate devices from ``class_path=prefix`` entries.
+
+    Parameters
+    ----------
+    entries : iterable of str
+        Entries like ``pcdsdevices.epics_motor.IMS=TST:MTR:01``.
+
+    Returns
+    -------
+    devices : list of ophyd.Device
+    """
+    devices = []
+    for idx, entry in enumerate(entries):
+        class_path, sep, prefix = entry.partition('=')
+        if not sep:
+            raise ValueError(
+                f'Expected class_path=prefix, got {entry!r}'
+            )
+        cls = import_device_class(class_path)
+        name = re.sub(r'\W', '_', prefix).strip('_').lower() or f'dev{idx}'
+        devices.append(cls(prefix, name=name))
+    return devices
+
+
+def make_pvdb(specs):
+    """
+    Make a caproto PV database from the PV specs.
+
+    Parameters
+    ----------
+    specs : dict
+        Mapping of PV name to `PVSpec`, see `collect_pv_specs`.
+
+    Returns
+    -------
+    pvdb : dict
+        Mapping of PV name to ``caproto.ChannelData``.
+    """
+    import caproto
+
+    pvdb = {}
+    for pvname, spec in specs.items():
+        if spec.dtype == 'enum':
+            channel = caproto.ChannelEnum(
+                value=spec.enum_strings[spec.value],
+                enum_strings=spec.enum_strings,
+            )
+        elif spec.dtype == 'int':
+            channel = caproto.ChannelInteger(value=spec.value)
+        elif spec.dtype == 'string':
+            channel = caproto.ChannelString(
+                value=spec.value[:MAX_STRING_LENGTH]
+            )
+        elif spec.dtype == 'float_array':
+            channel = caproto.ChannelDouble(value=list(spec.value),
+                                            max_length=spec.count)
+        else:
+            channel = caproto.ChannelDouble(value=spec.value)
+        pvdb[pvname] = channel
+    return pvdb
+
+
+def make_update_hook(pvdb, specs, rate, noise=1e-3):
+    """
+    Make a caproto startup hook that updates the dynamic PVs.
+
+    Every ``1 / rate`` seconds, each dynamic PV is written with its initial
+    value plus a little Gaussian noise.
+
+    Parameters
+    ----------
+    pvdb : dict
+        The caproto PV database, see `make_pvdb`.
+    specs : dict
+        The PV specs used to make ``pvdb``.
+    rate : float
+        The update rate, in Hz.
+    noise : float, optional
+        The relative noise added on each update.
+    """
+    dynamic = [(pvdb[pvname], spec) for pvname, spec in specs.items()
+               if spec.dynamic]
+
+    async def update_dynamic_pvs(async_lib):
+        logger.info('Updating %d PVs at %s Hz', len(dynamic), rate)
+        while True:
+            for channel, spec in dynamic:
+                if spec.dtype == 'float_array':
+                    value = [base + random.gauss(0.0, noise)
+                             for base in spec.value]
+                else:
+                    scale = noise * (abs(spec.value) + 1.0)
+                    value = spec.value + random.gauss(0.0, scale)
+                await channel.write(value)
+            await async_lib.library.sleep(1.0 / rate)
+
+    return update_dynamic_pvs
+
+
+def run_soft_ioc(specs, rate=None, interfaces=None, log_pv_names=False):
+    """
+    Serve the PVs from a caproto soft IOC until interrupted.
+
+    Parameters
+    ----------
+    specs : dict
+        Mapping of PV name to `PVSpec`, see `collect_pv_specs`.
+    rate : float, optional
+        If provided, update the dynamic PVs at this rate in Hz.
+    interfaces : list of str, optional
+        The network interfaces to serve on.
+    log_pv_names : bool, optional
+        Log all of the PV names at startup.
+    """
+    from caproto.server import run
+
+    pvdb = make_pvdb(specs)
+    hook = make_update_hook(pvdb, specs, rate) if rate else None
+    run(pvdb, interfaces=interfaces, log_pv_names=log_pv_names,
+        startup_hook=hook)
+
+
+def format_specs(specs):
+    """Format the PV specs as one line per PV, for ``--list``."""
+    lines = []
+    for pvname, spec in sorted(specs.items()):
+        extra = ''
+        if spec.enum_strings:
+            extra = ' ' + json.dumps(list(spec.enum_strings))
+        elif spec.dtype == 'float_array':
+            extra = f' [{spec.count}]'
+        dynamic = ' (dynamic)' if spec.dynamic else ''
+        lines.append(f'{pvname} {spec.dtype}{extra}{dynamic}')
+    return '\n'.join(lines)
+
+
+def main(args: Optional[list] = None) -> Dict[str, PVSpec]:
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Serve the PVs of pcdsdevices classes from a local '
+                    'caproto soft IOC.',
+    )
+
+    parser.add_argument(
+        "devices",
+        nargs='+',
+        help="Devices to serve, as class_path=prefix, e.g. "
+             "pcdsdevices.epics_motor.IMS=TST:MTR:01",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--rate",
+        type=float,
+        default=None,
+        help="Update the read-only numeric PVs at this rate, in Hz.",
+    )
+
+    parser.add_argument(
+        "-l",
+        "--list",
+        action="store_true",
+        help="Print the PVs and their guessed types instead of serving them.",
+    )
+
+    parser.add_argument(
+        "--interfaces",
+        nargs='*',
+        default=None,
+        help="The network interfaces to serve on.",
+    )
+
+    args = parser.parse_args(args)
+    specs = collect_pv_specs(make_devices(args.devices))
+    if args.list:
+        print(format_specs(specs))
+        return specs
+    run_soft_ioc(specs, rate=args.rate, interfaces=args.interfaces,
+                 log_pv_names=True)
+    return specs
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main(sys.argv[1:])
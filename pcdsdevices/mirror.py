@@ -24,7 +24,8 @@ from .inout import InOutRecordPositioner
 from .interface import BaseInterface, FltMvInterface, LightpathMixin
 from .pmps import TwinCATStatePMPS
 from .signal import PytmcSignal
-from .utils import get_status_value, reorder_components, schedule_task
+from .utils import (get_status_value, lazy_components_by_kind,
+                    reorder_components, schedule_task)
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,100 @@ class MirrorLogicError(Exception):
     """ An error in mirror pointing logic """
 
 
+class RangeClassifier:
+    """
+    Find the (min, max) ranges that contain a value.
+
+    The ranges are validated and converted to NumPy arrays once, so that
+    each lookup is cheap. If the ranges do not overlap, a lookup is a
+    single ``searchsorted``. Both limits of each range are exclusive.
+
+    With a nonzero ``hysteresis``, a value that matched a single range
+    keeps matching it until it leaves that range widened by ``hysteresis``
+    on both sides. This keeps a readback jittering around a range edge from
+    flipping between ranges, or between a range and no range at all.
+
+    Parameters
+    ----------
+    ranges : list of (min, max)
+        The ranges to match against, in the order of the returned indices.
+    hysteresis : float, optional
+        The width of the band around the last matching range in which the
+        match is kept.
+
+    Raises
+    ------
+    MirrorLogicError
+        If ``ranges`` is not a list of (min, max) pairs.
+    """
+    def __init__(self, ranges: list[list[numeric]], hysteresis: float = 0.0):
+        try:
+            limits = np.asarray(ranges, dtype=float)
+        except (TypeError, ValueError):
+            limits = None
+        if limits is None or limits.ndim != 2 or limits.shape[1] != 2:
+            raise MirrorLogicError(
+                "Provided ranges must be a list of ranges (min, max).  "
+                f"Received: {ranges}"
+            )
+        self.shape = limits.shape
+        self.hysteresis = float(hysteresis)
+        self._low = limits[:, 0]
+        self._high = limits[:, 1]
+        self._order = np.argsort(self._low, kind='stable')
+        self._sorted_low = self._low[self._order]
+        sorted_high = self._high[self._order]
+        self._sorted_high = sorted_high
+        # Empty or overlapping ranges need the brute-force comparison
+        self._disjoint = bool(
+            np.all(self._low < self._high)
+            and np.all(sorted_high[:-1] <= self._sorted_low[1:])
+        )
+        self._last = None
+
+    def __len__(self) -> int:
+        return len(self._low)
+
+    def reset(self) -> None:
+        """Forget the last match, e.g. after the ranges were changed."""
+        self._last = None
+
+    def _lookup(self, value: numeric) -> tuple[int, ...]:
+        if self._disjoint:
+            pos = int(np.searchsorted(self._sorted_low, value,
+                                      side='left')) - 1
+            if pos >= 0 and value < self._sorted_high[pos]:
+                return (int(self._order[pos]), )
+            return ()
+        return tuple(
+            int(idx) for idx in
+            np.flatnonzero((self._low < value) & (value < self._high))
+        )
+
+    def matches(self, value: numeric) -> tuple[int, ...]:
+        """
+        Get the indices of the ranges that contain ``value``.
+
+        Parameters
+        ----------
+        value : numeric
+            The value to compare to each range.
+
+        Returns
+        -------
+        indices : tuple of int
+            The indices of the matching ranges, in increasing order.
+        """
+        last = self._last
+        if last is not None and self.hysteresis > 0:
+            if (self._low[last] - self.hysteresis < value
+                    < self._high[last] + self.hysteresis):
+                return (last, )
+        indices = self._lookup(value)
+        self._last = indices[0] if len(indices) == 1 else None
+        return indices
+
+
 class OMMotor(FltMvInterface, PVPositioner):
     """Base class for each motor in the LCLS offset mirror system."""
     __doc__ += basic_positioner_init
@@ -341,6 +436,7 @@ class PointingMirror(InOutRecordPositioner, OffsetMirror):
         return super().check_value(pos)
 
 
+@lazy_components_by_kind
 class XOffsetMirror(BaseInterface, GroupDevice, LightpathMixin):
     """
     X-ray Offset Mirror.
@@ -415,8 +511,12 @@ class XOffsetMirror(BaseInterface, GroupDevice, LightpathMixin):
         x_ranges: list[list[int]] = [],
         y_ranges: list[list[int]] = [],
         pitch_ranges: list[list[list[int]]] = [],
+        range_hysteresis: Union[float, dict[str, float]] = 0.0,
         **kwargs
     ) -> None:
+        # hysteresis for the x, y and pitch ranges.  Either one value for
+        # all of them or a dictionary keyed by 'x', 'y' and 'pitch'
+        self._range_hysteresis = range_hysteresis
         # insertion status, [[min_x_out, max_x_out], [min_x_in, max_x_in]]
         self.x_ranges = x_ranges
         # coating status.  (n_coatings * 2) array
@@ -434,6 +534,86 @@ class XOffsetMirror(BaseInterface, GroupDevice, LightpathMixin):
         self.pitch_ranges = pitch_ranges
         super().__init__(*args, **kwargs)
 
+    def _get_range_hysteresis(self, axis: str) -> float:
+        """Get the hysteresis for the 'x', 'y' or 'pitch' ranges."""
+        if isinstance(self._range_hysteresis, dict):
+            return self._range_hysteresis.get(axis, 0.0)
+        return self._range_hysteresis
+
+    def _compile_ranges(
+        self,
+        ranges: list[list[numeric]],
+        axis: str
+    ) -> Union[RangeClassifier, str, None]:
+        """
+        Build the classifier for one set of ranges.
+
+        Returns None if no ranges were provided, or the error message if the
+        ranges are malformed.  The error is only raised when the lightpath
+        state is calculated, so a bad configuration does not prevent the
+        device from loading.
+        """
+        if ranges is None or len(ranges) == 0:
+            return None
+        try:
+            return RangeClassifier(ranges, self._get_range_hysteresis(axis))
+        except MirrorLogicError as ex:
+            return str(ex)
+
+    @staticmethod
+    def _checked_classifier(
+        classifier: Union[RangeClassifier, str]
+    ) -> RangeClassifier:
+        """Raise the error recorded while compiling malformed ranges."""
+        if isinstance(classifier, str):
+            raise MirrorLogicError(classifier)
+        return classifier
+
+    @property
+    def x_ranges(self) -> list[list[numeric]]:
+        """Ranges of x positions for the (out, in) insertion states."""
+        return self._x_ranges
+
+    @x_ranges.setter
+    def x_ranges(self, ranges: list[list[numeric]]) -> None:
+        self._x_ranges = ranges
+        self._x_classifier = self._compile_ranges(ranges, 'x')
+        if (isinstance(self._x_classifier, RangeClassifier)
+                and self._x_classifier.shape != (2, 2)):
+            self._x_classifier = (
+                'Provided x-ranges are the malformed. '
+                f'got: {np.shape(ranges)}, expected (2,2)'
+            )
+
+    @property
+    def y_ranges(self) -> list[list[numeric]]:
+        """Ranges of y positions for each coating."""
+        return self._y_ranges
+
+    @y_ranges.setter
+    def y_ranges(self, ranges: list[list[numeric]]) -> None:
+        self._y_ranges = ranges
+        self._y_classifier = self._compile_ranges(ranges, 'y')
+
+    @property
+    def pitch_ranges(self) -> list[list[list[numeric]]]:
+        """Ranges of pitch positions for each destination, per coating."""
+        return self._pitch_ranges
+
+    @pitch_ranges.setter
+    def pitch_ranges(self, ranges: list[list[list[numeric]]]) -> None:
+        self._pitch_ranges = ranges
+        if ranges is None or len(ranges) == 0:
+            self._pitch_classifiers = None
+            return
+        self._pitch_classifiers = [
+            self._compile_ranges(coating_ranges, 'pitch') or (
+                "Provided ranges must be a list of ranges (min, max).  "
+                f"Received: {coating_ranges}"
+            )
+            for coating_ranges in ranges
+        ]
+
     def calc_lightpath_state(
         self,
         x_up: float,
@@ -503,35 +683,6 @@ class XOffsetMirror(BaseInterface, GroupDevice, LightpathMixin):
                 output={self.output_branches[0]: 0}
             )
 
-    def _find_matching_range_indices(
-        self,
-        ranges: list[list[numeric]],
-        value: numeric
-    ) -> list[bool]:
-        """
-        Helper function for finding the range a particular value falls into
-
-        Parameters
-        ----------
-        ranges : List[List[numeric]]
-            A list of ranges.  Each range has a max and min value (exclusive)
-        value : numeric
-            Value to compare to each range
-
-        Returns
-        -------
-        List[bool]
-            A list of booleans, reporting if the value is in each range
-            in ``ranges``
-        """
-        if len(np.shape(ranges)) < 2:
-            raise MirrorLogicError(
-                "Provided ranges must be a list of ranges (min, max).  "
-                f"Received an array of shape: {np.shape(ranges)}"
-            )
-
-        return [limit[0] < value < limit[1] for limit in ranges]
-
     def _get_insertion_state(self, x: float) -> tuple[bool, bool]:
         """
         Interpret x-position as inserted or removed, based on ranges
@@ -554,18 +705,12 @@ class XOffsetMirror(BaseInterface, GroupDevice, LightpathMixin):
         is_out, is_in : Tuple[bool, bool]
             tuple of booleans describing the inserted and removed status
         """
-        if self.x_ranges == []:
+        if self._x_classifier is None:
             # default case for always-in mirrors
             return False, True
 
-        if np.shape(self.x_ranges) != (2, 2):
-            # improper ranges for insertion, fail
-            raise MirrorLogicError(
-                'Provided x-ranges are the malformed. '
-                f'got: {np.shape(self.x_ranges)}, expected (2,2)')
-
-        ins_bools = self._find_matching_range_indices(self.x_ranges, x)
-        return ins_bools[0], ins_bools[1]  # out, in
+        matches = self._checked_classifier(self._x_classifier).matches(x)
+        return 0 in matches, 1 in matches  # out, in
 
     def _get_coating_index(self, y: float) -> int:
         """
@@ -586,11 +731,10 @@ class XOffsetMirror(BaseInterface, GroupDevice, LightpathMixin):
         index : int
             The coating state
         """
-        if self.y_ranges == []:
+        if self._y_classifier is None:
             return 1
 
-        y_idxs = self._find_matching_range_indices(self.y_ranges, y)
-        valid_y_idx = np.where(y_idxs)[0]
+        valid_y_idx = self._checked_classifier(self._y_classifier).matches(y)
         if len(valid_y_idx) > 1:
             # should only see one valid y-range, coating unknown
             raise MirrorLogicError('only one y-range should be valid')
@@ -627,16 +771,17 @@ class XOffsetMirror(BaseInterface, GroupDevice, LightpathMixin):
         output_branch : str
             the name of the current beam destination
         """
-        if self.pitch_ranges == []:
+        if self._pitch_classifiers is None:
             return self.output_branches[0]
 
         # use coating to pick proper pitch ranges
         # 0 state is unknown, 1 is the first coating.  decrement to get index
-        pitch_limit_list = self.pitch_ranges[coating_idx]
+        classifier = self._checked_classifier(
+            self._pitch_classifiers[coating_idx]
+        )
 
         # find indices ranges where pitch is valid
-        pitch_idxs = self._find_matching_range_indices(pitch_limit_list, pitch)
-        valid_pitch_idx = np.where(pitch_idxs)[0]
+        valid_pitch_idx = classifier.matches(pitch)
 
         # pitch should only be within one valid range
         if len(valid_pitch_idx) != 1:
@@ -877,14 +1022,16 @@ class XOffsetMirrorBend(XOffsetMirror):
             current lightpath state of the device
         """
         try:
-            if np.shape(self.y_ranges) != (2, 2):
+            classifier = self._y_classifier
+            if (classifier is None or (isinstance(classifier, RangeClassifier)
+                                       and classifier.shape != (2, 2))):
                 # improper ranges for insertion, fail
                 raise MirrorLogicError(
-                    'Provided x-ranges are the malformed. '
-                    f'got: {np.shape(self.x_ranges)}, expected (2,2)')
+                    'Provided y-ranges are the malformed. '
+                    f'got: {np.shape(self.y_ranges)}, expected (2,2)')
 
-            x_out, x_in = self._find_matching_range_indices(self.y_ranges,
-                                                            y_up)
+            matches = self._checked_classifier(classifier).matches(y_up)
+            x_out, x_in = 0 in matches, 1 in matches
 
             if x_in and not x_out:
                 out_branch = self.output_branches[1]
@@ -1,14 +1,20 @@
 import logging
+import threading
 
+import numpy as np
 from ophyd import FormattedComponent as FCpt
 from ophyd.device import Component as Cpt
 from ophyd.device import Device
 from ophyd.signal import EpicsSignal, EpicsSignalRO
+from ophyd.status import Status
 
 from .interface import BaseInterface
 
 logger = logging.getLogger(__name__)
 
+#: Default tolerance of the bulk setters, relative to the channel maximum
+BULK_SET_RTOL = 0.01
+
 
 class MPODChannel(BaseInterface, Device):
     """
@@ -28,6 +34,7 @@ class MPODChannel(BaseInterface, Device):
                   write_pv=':SetVoltage', kind='normal',
                   doc='MPOD Channel Voltage Measurement [V]')
     max_voltage = Cpt(EpicsSignalRO, ':GetMaxVoltage', kind='normal',
+                      auto_monitor=True,
                       doc='MPOD Channel Maximum Voltage [V]')
     terminal_voltage = Cpt(EpicsSignalRO, ':GetTerminalVoltageMeasurement',
                            kind='normal', doc='MPOD Terminal Voltage [V]')
@@ -35,7 +42,7 @@ class MPODChannel(BaseInterface, Device):
                   write_pv=':SetCurrent', kind='normal',
                   doc='MPOD Channel Current Measurement [A]')
     max_current = Cpt(EpicsSignalRO, ':GetMaxCurrent', kind='normal',
-                      doc='MPOD Channel Max Current [A]')
+                      auto_monitor=True, doc='MPOD Channel Max Current [A]')
     temperature = Cpt(EpicsSignalRO, ':GetTemperature', kind='normal',
                       doc='MPOD Temperature [C]')
     status_string = Cpt(EpicsSignalRO, ':GetStatusString',
@@ -249,3 +256,224 @@ def get_card_number(channel):
         if channel == 0:
             return channel
         return (int(channel) * 10)
+
+
+def _group_channels(devices):
+    """
+    Expand any modules in ``devices`` into their channels.
+
+    Returns the channels in order, and lists of indices into them that
+    group the channels by module. Single channels form one extra group.
+    """
+    channels = []
+    groups = []
+    single = []
+    for device in devices:
+        if hasattr(device, 'channels'):
+            module_channels = list(device.channels)
+            groups.append(list(range(len(channels),
+                                     len(channels) + len(module_channels))))
+            channels.extend(module_channels)
+        else:
+            single.append(len(channels))
+            channels.append(device)
+    if single:
+        groups.append(single)
+    return channels, groups
+
+
+def _read_limits(signals):
+    """
+    Read the limit signals of one module in one go.
+
+    Connected signals give their monitored values without a round trip.
+    Any others are read together with one ``epics.caget_many`` instead of
+    waiting for each signal to connect in turn. Unknown limits are None.
+    """
+    values = [None] * len(signals)
+    missing = []
+    for idx, signal in enumerate(signals):
+        if signal.connected:
+            values[idx] = signal.get()
+        else:
+            missing.append(idx)
+    if missing:
+        import epics
+
+        results = epics.caget_many([signals[idx].pvname for idx in missing],
+                                   as_numpy=False)
+        for idx, value in zip(missing, results):
+            values[idx] = value
+    return values
+
+
+def _get_limits(channels, groups, limit_attr, reader=_read_limits):
+    """The limit of each channel, with one read per group of channels."""
+    limits = np.full(len(channels), np.nan)
+    for indices in groups:
+        values = reader([getattr(channels[idx], limit_attr)
+                         for idx in indices])
+        for idx, value in zip(indices, values):
+            if value is not None:
+                limits[idx] = value
+    return limits
+
+
+def bulk_set(devices, values, attr, limit_attr, tolerance=None, timeout=None,
+             owner=None, limit_reader=_read_limits):
+    """
+    Set a signal on many MPOD channels at once.
+
+    The limits of the channels are read first, with one read per module,
+    and values above them are clipped, as `MPODApalisChannel.set_voltage`
+    does for a single channel. The setpoints are then all put without
+    waiting, and the returned Status follows the readbacks of all channels
+    together.
+
+    Every channel is tried even if some fail: channels with an unknown
+    limit are not put, and puts that raise are collected. If anything
+    failed, the Status fails with a `RuntimeError` naming those channels,
+    while the other channels keep their new setpoints.
+
+    Parameters
+    ----------
+    devices : iterable of Device
+        The channels to set. Modules with a ``channels`` attribute, e.g.
+        `MPODApalisModule`, are expanded into their channels.
+    values : number or array-like
+        One value for all channels, or one value per channel.
+    attr : str
+        The channel signal to set, e.g. ``'voltage'``.
+    limit_attr : str
+        The channel signal with the maximum value, e.g. ``'max_voltage'``.
+    tolerance : number or array-like, optional
+        The absolute tolerance of the readbacks. Defaults to
+        `BULK_SET_RTOL` times the limit of each channel.
+    timeout : float, optional
+        Fail the Status if the readbacks do not all reach their targets in
+        this many seconds. Defaults to no timeout.
+    owner : OphydObject, optional
+        The owner of the returned Status.
+    limit_reader : callable, optional
+        A function that takes the limit signals of one module and returns
+        their values, None where unknown. Defaults to monitored values and
+        one ``epics.caget_many`` for the signals that are not connected.
+
+    Returns
+    -------
+    status : Status
+        Finishes once every readback is within ``tolerance`` of its target.
+    """
+    channels, groups = _group_channels(devices)
+    status = Status(obj=owner, timeout=timeout)
+    if not channels:
+        status.set_finished()
+        return status
+
+    targets = np.broadcast_to(
+        np.asarray(values, dtype=float), (len(channels),)
+    ).copy()
+    limits = _get_limits(channels, groups, limit_attr, reader=limit_reader)
+    failed = {channels[idx].name: 'unknown limit'
+              for idx in np.flatnonzero(np.isnan(limits))}
+    over = targets > limits
+    if over.any():
+        logger.warning(
+            'Clipping %s to the channel maximum for %s',
+            attr, ', '.join(channel.name for channel, clip
+                            in zip(channels, over) if clip)
+        )
+        targets = np.minimum(targets, limits)
+    if tolerance is None:
+        tolerance = BULK_SET_RTOL * np.abs(limits)
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=float),
+                                (len(channels),))
+
+    signals = [getattr(channel, attr) for channel in channels]
+    index = {signal: idx for idx, signal in enumerate(signals)}
+    readbacks = np.full(len(channels), np.nan)
+    lock = threading.Lock()
+
+    def update(*args, obj, value, **kwargs):
+        with lock:
+            try:
+                readbacks[index[obj]] = value
+            except (TypeError, ValueError):
+                readbacks[index[obj]] = np.nan
+            if status.done or not np.all(
+                np.abs(readbacks - targets) <= tolerance
+            ):
+                return
+            status.set_finished()
+
+    cids = [signal.subscribe(update, run=True) for signal in signals]
+
+    def unsubscribe(status):
+        for signal, cid in zip(signals, cids):
+            signal.unsubscribe(cid)
+
+    status.add_callback(unsubscribe)
+    for channel, signal, target in zip(channels, signals, targets):
+        if channel.name in failed:
+            continue
+        try:
+            signal.put(target, wait=False)
+        except Exception as ex:
+            logger.debug('Failed to set %s', signal.name, exc_info=True)
+            failed[channel.name] = ex
+    if failed:
+        with lock:
+            if not status.done:
+                status.set_exception(RuntimeError(
+                    f'Failed to set {attr} on ' + ', '.join(
+                        f'{name} ({reason})'
+                        for name, reason in failed.items()
+                    )
+                ))
+    return status
+
+
+def set_voltages(devices, voltages, tolerance=None, timeout=None):
+    """
+    Set the voltages of many MPOD channels at once, see `bulk_set`.
+
+    Parameters
+    ----------
+    devices : iterable of Device
+        The channels or modules to set.
+    voltages : number or array-like
+        Voltage in V, for all channels or one per channel.
+    tolerance : number or array-like, optional
+        The absolute tolerance of the voltage readbacks in V.
+    timeout : float, optional
+        The maximum time for all channels to reach their voltages.
+
+    Returns
+    -------
+    status : Status
+    """
+    return bulk_set(devices, voltages, 'voltage', 'max_voltage',
+                    tolerance=tolerance, timeout=timeout)
+
+
+def set_currents(devices, currents, tolerance=None, timeout=None):
+    """
+    Set the currents of many MPOD channels at once, see `bulk_set`.
+
+    Parameters
+    ----------
+    devices : iterable of Device
+        The channels or modules to set.
+    currents : number or array-like
+        Current in A, for all channels or one per channel.
+    tolerance : number or array-like, optional
+        The absolute tolerance of the current readbacks in A.
+    timeout : float, optional
+        The maximum time for all channels to reach their currents.
+
+    Returns
+    -------
+    status : Status
+    """
+    return bulk_set(devices, currents, 'current', 'max_current',
+                    tolerance=tolerance, timeout=timeout)
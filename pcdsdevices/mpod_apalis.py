@@ -1,13 +1,16 @@
 import logging
-import time
 
+import numpy as np
 from ophyd.device import Component as Cpt
 from ophyd.device import Device
 from ophyd.signal import EpicsSignal, EpicsSignalRO
+from ophyd.status import Status
 
 from pcdsdevices.interface import BaseInterface
 
 from .device import GroupDevice
+from .mpod import set_currents, set_voltages
+from .utils import schedule_task, set_many
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,7 @@ class MPODApalisChannel(BaseInterface, Device):
                   doc='MPOD Channel Voltage Measurement [V]')
 
     max_voltage = Cpt(EpicsSignalRO, ':VoltageNominal', kind='normal',
+                      auto_monitor=True,
                       doc='MPOD Channel Maximum Voltage [V]')
 
     current = Cpt(EpicsSignal, ':CurrentMeasure',
@@ -36,7 +40,7 @@ class MPODApalisChannel(BaseInterface, Device):
                   doc='MPOD Channel Current Measure')
 
     max_current = Cpt(EpicsSignalRO, ':CurrentNominal', kind='normal',
-                      doc='MPOD Channel Current Maximum')
+                      auto_monitor=True, doc='MPOD Channel Current Maximum')
 
     state = Cpt(EpicsSignal, ':isOn', write_pv=':Control:setOn',
                 kind='normal', string=True,
@@ -142,7 +146,59 @@ class MPODApalisModule(BaseInterface, GroupDevice):
 
     tab_component_names = True
     tab_whitelist = ['clear_faults', 'set_voltage_ramp_speed',
-                     'set_current_ramp_speed']
+                     'set_current_ramp_speed', 'set_voltages', 'set_currents',
+                     'channels']
+
+    @property
+    def channels(self):
+        """The channels of this module, in order."""
+        return [getattr(self, attr) for attr in self.component_names
+                if issubclass(getattr(type(self), attr).cls,
+                              MPODApalisChannel)]
+
+    def set_voltages(self, voltages, tolerance=None, timeout=None):
+        """
+        Set the voltages of all channels of this module at once.
+
+        Parameters
+        ----------
+        voltages : number or array-like
+            Voltage in V, for all channels or one per channel.
+        tolerance : number or array-like, optional
+            The absolute tolerance of the voltage readbacks in V. Defaults
+            to 1% of the nominal voltage of each channel.
+        timeout : float, optional
+            The maximum time for all channels to reach their voltages.
+
+        Returns
+        -------
+        status : Status
+            Finishes once all channels are at their voltages.
+        """
+        return set_voltages([self], voltages, tolerance=tolerance,
+                            timeout=timeout)
+
+    def set_currents(self, currents, tolerance=None, timeout=None):
+        """
+        Set the currents of all channels of this module at once.
+
+        Parameters
+        ----------
+        currents : number or array-like
+            Current in A, for all channels or one per channel.
+        tolerance : number or array-like, optional
+            The absolute tolerance of the current readbacks in A. Defaults
+            to 1% of the nominal current of each channel.
+        timeout : float, optional
+            The maximum time for all channels to reach their currents.
+
+        Returns
+        -------
+        status : Status
+            Finishes once all channels are at their currents.
+        """
+        return set_currents([self], currents, tolerance=tolerance,
+                            timeout=timeout)
 
     def clear_faults(self):
         """Clears all module faults"""
@@ -305,12 +361,71 @@ class MPODApalisCrate(BaseInterface, Device):
                 doc='Crate power status and control')
 
     tab_component_names = True
-    tab_whitelist = ['power']
+    tab_whitelist = ['power', 'power_cycle']
 
-    def power_cycle(self):
+    def power_cycle(self, delay=5.0):
         """
-        Function used to power cycle the MPOD crate
+        Power cycle the MPOD crate without blocking.
+
+        Parameters
+        ----------
+        delay : float, optional
+            The time in seconds between powering off and on again.
+
+        Returns
+        -------
+        status : Status
+            Finishes once the crate has been told to power on again.
         """
+        status = Status(obj=self)
         self.power.put(0)
-        time.sleep(5)
-        self.power.put(1)
+
+        def power_on():
+            try:
+                self.power.put(1)
+            except Exception as ex:
+                status.set_exception(ex)
+            else:
+                status.set_finished()
+
+        schedule_task(power_on, delay=delay)
+        return status
+
+
+def set_ramp_speeds(modules, voltage=None, current=None, timeout=None):
+    """
+    Set the ramp speeds of many MPODApalis modules at once.
+
+    Parameters
+    ----------
+    modules : iterable of MPODApalisModule
+        The modules to set.
+    voltage : number or sequence, optional
+        Voltage ramp speed [%/sec*Vnom], for all modules or one per module.
+        Left alone if omitted.
+    current : number or sequence, optional
+        Current ramp speed [%/sec*Inom], for all modules or one per module.
+        Left alone if omitted.
+    timeout : float, optional
+        The maximum time for each speed to be set.
+
+    Returns
+    -------
+    status : Status
+        Finishes once all speeds are set.
+    """
+    modules = list(modules)
+    to_set = {}
+    for attr, speeds in (('voltage_ramp_speed', voltage),
+                         ('current_ramp_speed', current)):
+        if speeds is None:
+            continue
+        if np.ndim(speeds) == 0:
+            speeds = [speeds] * len(modules)
+        if len(speeds) != len(modules):
+            raise ValueError(
+                f'Got {len(speeds)} {attr} values for {len(modules)} modules'
+            )
+        for module, speed in zip(modules, speeds):
+            to_set[getattr(module, attr)] = speed
+    return set_many(to_set, timeout=timeout, raise_on_set_failure=True)
@@ -5,7 +5,15 @@ These communicate with ACR via a single bit summary.
 The results of these are published over EPICS and
 interpreted by :class:`.MPS`.
 """
+from __future__ import annotations
+
+import dataclasses
+import itertools
 import logging
+import threading
+import weakref
+from collections.abc import Callable, Iterable
+from typing import Any
 
 from ophyd import Component as Cpt
 from ophyd import Device, EpicsSignal, EpicsSignalRO
@@ -15,6 +23,11 @@ from .interface import BaseInterface
 
 logger = logging.getLogger(__name__)
 
+# Every MPSBase instance, for MPSAggregator.register_all
+_all_mps = weakref.WeakSet()
+# Classes created by mps_factory, see _get_mps_class
+_mps_class_cache = {}
+
 
 class MPSBase(BaseInterface):
     """
@@ -29,6 +42,8 @@ class MPSBase(BaseInterface):
     - :meth:`faulted`
     - :meth:`bypassed`
     - :meth:`_sub_to_children`
+    - :meth:`_fault_signals`
+    - :meth:`_get_fault_state`
     """
 
     # Subscription information
@@ -40,6 +55,7 @@ class MPSBase(BaseInterface):
         self.veto_capable = veto
         self._has_subscribed_fault = False
         super().__init__(*args, **kwargs)
+        _all_mps.add(self)
 
     @property
     def tripped(self):
@@ -126,6 +142,26 @@ class MPS(MPSBase, Device):
         self.fault.subscribe(self._fault_change, run=False)
         self.bypass.subscribe(self._fault_change, run=False)
 
+    def _fault_signals(self):
+        """The signals that the fault and bypass states are derived from."""
+        return [self.fault, self.bypass]
+
+    def _get_fault_state(self, get_value):
+        """
+        Determine the faulted and bypassed states.
+
+        Parameters
+        ----------
+        get_value : callable
+            Called with each signal from :meth:`_fault_signals` to get its
+            value, e.g. from a cache of monitor updates.
+
+        Returns
+        -------
+        faulted, bypassed : bool
+        """
+        return bool(get_value(self.fault)), bool(get_value(self.bypass))
+
 
 def mps_factory(clsname, cls, *args, mps_prefix, veto=False, **kwargs):
     """
@@ -155,9 +191,33 @@ def mps_factory(clsname, cls, *args, mps_prefix, veto=False, **kwargs):
     kwargs:
         Passed to device constructor.
     """
-    comp = FCpt(MPS, mps_prefix, veto=veto)
-    cls = type(clsname, (cls,), {'mps': comp})
-    return cls(*args, **kwargs)
+    cls = _get_mps_class(clsname, cls, veto)
+    return cls(*args, mps_prefix=mps_prefix, **kwargs)
+
+
+def _get_mps_class(clsname, cls, veto):
+    """
+    Get the class used by `mps_factory`, creating it on first use.
+
+    The MPS prefix is passed per instance, so one class is shared by all
+    devices with the same name, base class and veto setting.
+    """
+    key = (clsname, cls, MPS, bool(veto))
+    try:
+        return _mps_class_cache[key]
+    except KeyError:
+        pass
+
+    def __init__(self, *args, mps_prefix, **kwargs):
+        self._mps_prefix = mps_prefix
+        super(new_cls, self).__init__(*args, **kwargs)
+
+    new_cls = type(clsname, (cls,), {
+        'mps': FCpt(MPS, '{self._mps_prefix}', veto=veto),
+        '__init__': __init__,
+    })
+    _mps_class_cache[key] = new_cls
+    return new_cls
 
 
 def must_be_out(in_limit, out_limit):
@@ -260,3 +320,279 @@ class MPSLimits(MPSBase, Device):
                                 event_type=self.in_limit.SUB_FAULT_CH)
         self.out_limit.subscribe(self._fault_change,
                                  event_type=self.out_limit.SUB_FAULT_CH)
+
+    def _fault_signals(self):
+        return (self.in_limit._fault_signals()
+                + self.out_limit._fault_signals())
+
+    def _get_fault_state(self, get_value):
+        in_faulted, in_bypassed = self.in_limit._get_fault_state(get_value)
+        out_faulted, out_bypassed = self.out_limit._get_fault_state(get_value)
+        return (bool(self.logic(in_faulted, out_faulted)),
+                in_bypassed or out_bypassed)
+
+
+@dataclasses.dataclass(frozen=True)
+class MPSBitChange:
+    """
+    A change in the state of one bit tracked by `MPSAggregator`.
+
+    Attributes
+    ----------
+    index : int
+        The bit index in the aggregator.
+    device : MPSBase
+        The MPS device.
+    faulted : bool
+        The new faulted state.
+    bypassed : bool
+        The new bypassed state.
+    tripped : bool
+        The new tripped state.
+    flipped : tuple of str
+        Which of "faulted", "bypassed" and "tripped" changed.
+    """
+    index: int
+    device: MPSBase
+    faulted: bool
+    bypassed: bool
+    tripped: bool
+    flipped: tuple[str, ...]
+
+
+class MPSAggregator:
+    """
+    Hutch-wide index of MPS faults, maintained from monitors.
+
+    Each registered `MPSBase` gets a bit index. The faulted, bypassed and
+    tripped states of all bits are kept as integer bitsets that are
+    updated from the fault and bypass signal monitors, so queries never
+    need to talk to EPICS.
+
+    Subscribe with :meth:`subscribe` to get a list of `MPSBitChange` each
+    time bits flip.
+
+    Parameters
+    ----------
+    devices : iterable of MPSBase, optional
+        Devices to register right away.
+    """
+    def __init__(self, devices: Iterable[MPSBase] = ()):
+        self._lock = threading.RLock()
+        self._devices: list[MPSBase | None] = []
+        self._index: dict[MPSBase, int] = {}
+        self._signal_to_indices: dict[Any, set[int]] = {}
+        self._cids: dict[Any, int] = {}
+        self._values: dict[Any, Any] = {}
+        self._faulted = 0
+        self._bypassed = 0
+        self._known = 0
+        self._registered = 0
+        self._callbacks: dict[int, Callable] = {}
+        self._cb_count = itertools.count()
+        for device in devices:
+            self.register(device)
+
+    def register(self, device: MPSBase) -> int:
+        """
+        Track ``device`` and return its bit index.
+
+        Registering a device twice returns the existing index.
+        """
+        with self._lock:
+            try:
+                return self._index[device]
+            except KeyError:
+                pass
+            index = len(self._devices)
+            self._devices.append(device)
+            self._index[device] = index
+            for sig in device._fault_signals():
+                self._signal_to_indices.setdefault(sig, set()).add(index)
+                if sig not in self._cids:
+                    # run=True only replays values we already have, this
+                    # does not block on EPICS
+                    self._cids[sig] = sig.subscribe(
+                        self._value_changed, event_type=sig.SUB_VALUE,
+                        run=True,
+                    )
+            self._registered |= 1 << index
+            changes = self._update_bits([index])
+        self._notify(changes)
+        return index
+
+    def register_all(self) -> list[int]:
+        """
+        Register every top-level `MPSBase` instance that currently exists.
+
+        Bits that are components of another MPS device, such as the limits
+        of an `MPSLimits`, are skipped: their parent combines them with its
+        own logic.
+        """
+        return [self.register(device) for device in list(_all_mps)
+                if not isinstance(device.parent, MPSBase)]
+
+    def unregister(self, device: MPSBase) -> None:
+        """Stop tracking ``device``. Its bit index is not reused."""
+        with self._lock:
+            index = self._index.pop(device)
+            self._devices[index] = None
+            for sig in device._fault_signals():
+                indices = self._signal_to_indices.get(sig, set())
+                indices.discard(index)
+                if not indices:
+                    self._signal_to_indices.pop(sig, None)
+                    self._values.pop(sig, None)
+                    sig.unsubscribe(self._cids.pop(sig))
+            mask = ~(1 << index)
+            self._registered &= mask
+            self._faulted &= mask
+            self._bypassed &= mask
+            self._known &= mask
+
+    def _value_changed(self, value=None, obj=None, **kwargs):
+        """Signal callback: update the bits that depend on ``obj``."""
+        with self._lock:
+            self._values[obj] = value
+            changes = self._update_bits(
+                sorted(self._signal_to_indices.get(obj, ()))
+            )
+        self._notify(changes)
+
+    def _update_bits(self, indices: Iterable[int]) -> list[MPSBitChange]:
+        """Recompute ``indices`` from the cached values, report changes."""
+        changes = []
+        for index in indices:
+            device = self._devices[index]
+            if device is None:
+                continue
+            bit = 1 << index
+            signals = device._fault_signals()
+            if all(sig in self._values for sig in signals):
+                self._known |= bit
+            else:
+                self._known &= ~bit
+            faulted, bypassed = device._get_fault_state(self._values.get)
+            old = (bool(self._faulted & bit), bool(self._bypassed & bit))
+            if faulted:
+                self._faulted |= bit
+            else:
+                self._faulted &= ~bit
+            if bypassed:
+                self._bypassed |= bit
+            else:
+                self._bypassed &= ~bit
+            tripped = faulted and not bypassed
+            old_tripped = old[0] and not old[1]
+            flipped = tuple(
+                name for name, before, after in (
+                    ('faulted', old[0], faulted),
+                    ('bypassed', old[1], bypassed),
+                    ('tripped', old_tripped, tripped),
+                )
+                if before != after
+            )
+            if flipped:
+                changes.append(
+                    MPSBitChange(
+                        index=index, device=device, faulted=faulted,
+                        bypassed=bypassed, tripped=tripped, flipped=flipped,
+                    )
+                )
+        return changes
+
+    def _notify(self, changes: list[MPSBitChange]) -> None:
+        """Send ``changes`` to all subscribers."""
+        if not changes:
+            return
+        for cb in list(self._callbacks.values()):
+            try:
+                cb(changes=changes, aggregator=self)
+            except Exception:
+                logger.exception('MPS aggregator callback %s failed', cb)
+
+    def subscribe(self, cb: Callable) -> int:
+        """
+        Call ``cb(changes=..., aggregator=...)`` whenever bits flip.
+
+        Returns
+        -------
+        cid : int
+            The id to pass to :meth:`unsubscribe`.
+        """
+        cid = next(self._cb_count)
+        self._callbacks[cid] = cb
+        return cid
+
+    def unsubscribe(self, cid: int) -> None:
+        """Remove a callback added with :meth:`subscribe`."""
+        self._callbacks.pop(cid, None)
+
+    def _bit(self, device: MPSBase) -> int:
+        return 1 << self._index[device]
+
+    def is_faulted(self, device: MPSBase) -> bool:
+        """Whether ``device`` is faulted, from the cached state."""
+        return bool(self._faulted & self._bit(device))
+
+    def is_bypassed(self, device: MPSBase) -> bool:
+        """Whether ``device`` is bypassed, from the cached state."""
+        return bool(self._bypassed & self._bit(device))
+
+    def is_tripped(self, device: MPSBase) -> bool:
+        """Whether ``device`` trips the MPS, from the cached state."""
+        return bool(self.tripped_bits & self._bit(device))
+
+    @property
+    def faulted_bits(self) -> int:
+        """Bitset of the faulted devices."""
+        return self._faulted
+
+    @property
+    def bypassed_bits(self) -> int:
+        """Bitset of the bypassed devices."""
+        return self._bypassed
+
+    @property
+    def tripped_bits(self) -> int:
+        """Bitset of the devices that trip the MPS."""
+        return self._faulted & ~self._bypassed
+
+    @property
+    def unknown_bits(self) -> int:
+        """Bitset of devices missing a fault or bypass value."""
+        return self._registered & ~self._known
+
+    @property
+    def any_tripped(self) -> bool:
+        """Whether anything registered trips the MPS."""
+        return bool(self.tripped_bits)
+
+    def devices_from_bits(self, bits: int) -> list[MPSBase]:
+        """The devices whose bits are set in ``bits``."""
+        devices = []
+        while bits:
+            low = bits & -bits
+            device = self._devices[low.bit_length() - 1]
+            if device is not None:
+                devices.append(device)
+            bits ^= low
+        return devices
+
+    @property
+    def tripped(self) -> list[MPSBase]:
+        """The devices that currently trip the MPS."""
+        return self.devices_from_bits(self.tripped_bits)
+
+    @property
+    def faulted(self) -> list[MPSBase]:
+        """The devices that are currently faulted."""
+        return self.devices_from_bits(self._faulted)
+
+    @property
+    def bypassed(self) -> list[MPSBase]:
+        """The devices that are currently bypassed."""
+        return self.devices_from_bits(self._bypassed)
+
+    def __len__(self) -> int:
+        return len(self._index)
@@ -1,6 +1,7 @@
 import copy
 import enum
 import logging
+import threading
 import time
 import warnings
 
@@ -20,7 +21,8 @@ from .device import InterfaceDevice
 from .interface import FltMvInterface
 from .signal import NotepadLinkedSignal
 from .sim import FastMotor
-from .utils import convert_unit, get_status_float, get_status_value
+from .utils import (convert_unit, get_status_float, get_status_value,
+                    schedule_task)
 
 logger = logging.getLogger(__name__)
 
@@ -120,13 +122,41 @@ class PseudoPositioner(ophyd.pseudopos.PseudoPositioner):
     * Makes scalar ``RealPosition`` and ``PseudoPosition`` easily convert
       to floating point values.
     * Adds a set_current_position helper method
+    * Optionally limits the rate of pseudo position updates from real motor
+      readbacks and of notepad readback writes, see ``readback_max_rate``
+      and ``notepad_max_rate``.
 
     """ + ophyd.pseudopos.PseudoPositioner.__doc__
 
-    def __init__(self, *args, **kwargs):
+    #: Maximum rate in Hz to recompute the pseudo position from real motor
+    #: readbacks. Readbacks arriving faster than this are coalesced and the
+    #: latest values are used. None means no limit.
+    readback_max_rate = None
+    #: Maximum rate in Hz to write readbacks to the notepad IOC. Writes for
+    #: all pseudo axes are batched together. None means no limit.
+    notepad_max_rate = None
+
+    def __init__(self, *args, readback_max_rate=None, notepad_max_rate=None,
+                 **kwargs):
         self._my_move = False
         self._move_time = 0
         self._my_move_timeout = 10
+        if readback_max_rate is not None:
+            self.readback_max_rate = readback_max_rate
+        if notepad_max_rate is not None:
+            self.notepad_max_rate = notepad_max_rate
+        self._readback_lock = threading.Lock()
+        self._readback_scheduled = False
+        self._last_readback_update = 0.
+        self._notepad_lock = threading.Lock()
+        self._notepad_pending = {}
+        self._notepad_scheduled = False
+        self._last_notepad_write = 0.
+        self.update_stats = dict.fromkeys(
+            ('readback_updates', 'readback_merged', 'notepad_writes',
+             'notepad_merged', 'notepad_unchanged'),
+            0
+        )
         super().__init__(*args, **kwargs)
 
         if len(self.RealPosition._fields) == 1:
@@ -160,6 +190,9 @@ class PseudoPositioner(ophyd.pseudopos.PseudoPositioner):
                             signal.put(value, wait=False)
                         else:
                             signal.put(value)
+                        self.update_stats['notepad_writes'] += 1
+                    else:
+                        self.update_stats['notepad_unchanged'] += 1
             except Exception as ex:
                 self.log.debug('Failed to update notepad %s to position %s',
                                attr, value, exc_info=ex)
@@ -206,13 +239,91 @@ class PseudoPositioner(ophyd.pseudopos.PseudoPositioner):
         self._update_notepad_ioc(position, 'notepad_setpoint')
         return status
 
+    def _queue_notepad_update(self, position, attr):
+        """
+        Update the notepad IOC, no faster than ``notepad_max_rate``.
+
+        Only the latest position per ``attr`` is kept until the next write.
+        """
+        if not self.notepad_max_rate:
+            self._update_notepad_ioc(position, attr)
+            return
+
+        with self._notepad_lock:
+            if attr in self._notepad_pending:
+                self.update_stats['notepad_merged'] += 1
+            self._notepad_pending[attr] = position
+            if self._notepad_scheduled:
+                return
+            delay = (self._last_notepad_write + 1 / self.notepad_max_rate
+                     - time.monotonic())
+            if delay > 0:
+                self._notepad_scheduled = True
+                schedule_task(self._flush_notepad, delay=delay)
+                return
+        self._flush_notepad()
+
+    def _flush_notepad(self):
+        """Write all pending notepad updates."""
+        with self._notepad_lock:
+            pending = self._notepad_pending
+            self._notepad_pending = {}
+            self._notepad_scheduled = False
+            self._last_notepad_write = time.monotonic()
+        for attr, position in pending.items():
+            self._update_notepad_ioc(position, attr)
+
     def _update_position(self):
         """Update the pseudo position based on that of the real positioners."""
         position = super()._update_position()
+        self.update_stats['readback_updates'] += 1
         if self._my_move:
-            self._update_notepad_ioc(position, 'notepad_readback')
+            self._queue_notepad_update(position, 'notepad_readback')
         return position
 
+    def _real_pos_update(self, obj=None, value=None, **kwargs):
+        """
+        Callback: A single real positioner has moved.
+
+        If ``readback_max_rate`` is set, recomputing the pseudo position is
+        deferred until enough time has passed since the last update.
+        """
+        if not self.readback_max_rate:
+            return super()._real_pos_update(obj=obj, value=value, **kwargs)
+
+        self._real_cur_pos[obj] = value
+        self._required_for_connection.pop(obj, None)
+        with self._readback_lock:
+            if self._readback_scheduled:
+                # The pending update will pick up this value
+                self.update_stats['readback_merged'] += 1
+                return
+            delay = (self._last_readback_update + 1 / self.readback_max_rate
+                     - time.monotonic())
+            if delay > 0:
+                self._readback_scheduled = True
+                schedule_task(self._flush_readback, delay=delay)
+                return
+        self._flush_readback()
+
+    def _flush_readback(self):
+        """Recompute the pseudo position from the latest real readbacks."""
+        with self._readback_lock:
+            self._readback_scheduled = False
+            self._last_readback_update = time.monotonic()
+        try:
+            self._update_position()
+        except ophyd.utils.DisconnectedError:
+            pass
+
+    def _done_moving(self, success=True):
+        """Flush pending updates so SUB_DONE sees the final position."""
+        if self._readback_scheduled:
+            self._flush_readback()
+        if self._notepad_pending:
+            self._flush_notepad()
+        super()._done_moving(success=success)
+
     def set_current_position(self, position):
         """
         Adjust all offsets so that the pseudo position matches the input.
@@ -464,6 +575,8 @@ class SyncAxis(FltMvInterface, PseudoPositioner):
     fix_sync_keep_still = None
     # tuple of two floats that defines if we should add limits to the sync axis
     sync_limits = None
+    # batch notepad readback writes from the synchronized encoders
+    notepad_max_rate = 10
 
     def __init__(self, *args, **kwargs):
         self._check_settings()
@@ -8,7 +8,9 @@ from ophyd import Device, EpicsSignal, EpicsSignalRO, EpicsSignalWithRBV
 from ophyd import FormattedComponent as FCpt
 
 from .doc_stubs import IonPump_base
+from .gauge import PRESSURE_HISTORY_SIZE
 from .interface import BaseInterface
+from .signal import ScalarHistorySignal
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +74,7 @@ class IonPumpBase(BaseInterface, Device):
     __doc__ = (__doc__ % IonPump_base).replace('Ion Pump',
                                                'Ion Pump Base Class')
 
-    _pressure = Cpt(EpicsSignalRO, ':PMON', kind='hinted')
+    _pressure = Cpt(EpicsSignalRO, ':PMON', kind='hinted', auto_monitor=True)
     _egu = Cpt(EpicsSignalRO, ':PMON.EGU', kind='omitted')
     current = Cpt(EpicsSignalRO, ':IMON', kind='normal')
     voltage = Cpt(EpicsSignalRO, ':VMON', kind='normal')
@@ -80,7 +82,7 @@ class IonPumpBase(BaseInterface, Device):
     status = Cpt(EpicsSignalRO, ':STATUS', kind='normal')
     # check if this work as its an enum
     state = Cpt(EpicsSignal, ':STATEMON', write_pv=':STATEDES', kind='normal',
-                string=True)
+                string=True, auto_monitor=True)
     # state_cmd = Cpt(EpicsSignal, ':STATEDES', kind='normal')
 
     pumpsize = Cpt(EpicsSignal, ':PUMPSIZEDES', write_pv=':PUMPSIZE',
@@ -92,6 +94,11 @@ class IonPumpBase(BaseInterface, Device):
     aomode = Cpt(EpicsSignal, ':AOMODEDES', write_pv=':AOMODE', kind='config')
     calfactor = Cpt(EpicsSignal, ':CALFACTORDES', write_pv=':CALFACTOR',
                     kind='config')
+    pressure_history = Cpt(ScalarHistorySignal, signal='_pressure',
+                           size=PRESSURE_HISTORY_SIZE, lazy=True,
+                           kind='omitted',
+                           doc='timestamped history of the pressure '
+                               'updates, recorded once accessed')
 
     tab_whitelist = ['on', 'off', 'info', 'pressure']
     tab_component_names = True
@@ -155,7 +162,12 @@ class PIPPLC(Device):
     """
 
     pressure = Cpt(EpicsSignalRO, ':PRESS_RBV', kind='hinted',
-                   doc='pressure reading')
+                   auto_monitor=True, doc='pressure reading')
+    pressure_history = Cpt(ScalarHistorySignal, signal='pressure',
+                           size=PRESSURE_HISTORY_SIZE, lazy=True,
+                           kind='omitted',
+                           doc='timestamped history of the pressure '
+                               'updates, recorded once accessed')
     high_voltage_do = Cpt(EpicsSignalRO, ':HV_DO_RBV', kind='normal',
                           doc='high voltage digital output')
     high_voltage_in = Cpt(EpicsSignalRO, ':HV_DI_RBV', kind='normal',
@@ -15,6 +15,7 @@ import inspect
 import itertools
 import logging
 import numbers
+import time
 import typing
 from threading import RLock
 from typing import Any, Generator, Mapping, Optional, Union
@@ -866,6 +867,439 @@ class InternalSignal(SignalRO):
         return Signal.set(self, value, timestamp=timestamp, force=force)
 
 
+class ArrayHistorySignal(InternalSignal):
+    """
+    Signal that keeps a history of the last shots of an array signal.
+
+    This will subscribe to a signal that returns 1D arrays (e.g. a spectrum
+    or a digitizer waveform) and copy each update into a preallocated
+    buffer. The value of this signal is the number of shots in the history.
+
+    The buffer holds every shot twice, at ``index`` and ``index + size``,
+    so that the last ``n`` shots are always a contiguous slice. `latest`
+    returns that slice as a view, and the reductions run on it directly
+    without copying or reordering the history.
+
+    The buffer is allocated on the first update, using the length and dtype
+    of that array. If the array length changes, the history is cleared.
+
+    Parameters
+    ----------
+    signal : Signal or str
+        The array signal to record, or the attribute name of a sibling
+        signal on the parent device.
+
+    size : int
+        The number of shots to keep.
+
+    filename : str, optional
+        If provided, back the buffer with a memory-mapped file at this path
+        instead of memory. The file holds ``2 * size`` rows, see above.
+
+    dtype : numpy.dtype, optional
+        The dtype of the buffer. Defaults to the dtype of the first update.
+    """
+
+    def __init__(self, signal, size, *, filename=None, dtype=None, name,
+                 parent=None, **kwargs):
+        kwargs.setdefault('value', 0)
+        super().__init__(name=name, parent=parent, **kwargs)
+        if isinstance(signal, str):
+            signal = getattr(parent, signal)
+        self.raw_sig = signal
+        self.filename = filename
+        self._dtype = dtype
+        self._lock = RLock()
+        self._buffer = None
+        self._index = 0
+        self._count = 0
+        self.size = size
+        self.raw_sig.subscribe(self._update_history)
+
+    @property
+    def connected(self):
+        return self.raw_sig.connected
+
+    @property
+    def size(self):
+        """The number of shots to keep. Setting this clears the history."""
+        return self._size
+
+    @size.setter
+    def size(self, size):
+        size = int(size)
+        if size < 1:
+            raise ValueError(f'History size must be positive, got {size}')
+        with self._lock:
+            self._size = size
+            self._buffer = None
+            self._index = 0
+            self._count = 0
+
+    @property
+    def count(self):
+        """The number of shots currently in the history."""
+        return self._count
+
+    @property
+    def width(self):
+        """The length of each recorded array, or None before any update."""
+        if self._buffer is None:
+            return None
+        return self._buffer.shape[1]
+
+    def clear(self):
+        """Drop all recorded shots, keeping the allocated buffer."""
+        with self._lock:
+            self._index = 0
+            self._count = 0
+        super().put(0, force=True)
+
+    def flush(self):
+        """Flush a memory-mapped buffer to disk."""
+        with self._lock:
+            if isinstance(self._buffer, np.memmap):
+                self._buffer.flush()
+
+    def _allocate(self, width, dtype):
+        """Allocate a new, empty buffer for arrays of this length."""
+        shape = (2 * self._size, width)
+        dtype = np.dtype(self._dtype or dtype)
+        if self.filename is None:
+            self._buffer = np.zeros(shape, dtype=dtype)
+        else:
+            self._buffer = np.memmap(self.filename, dtype=dtype, mode='w+',
+                                     shape=shape)
+        self._index = 0
+        self._count = 0
+
+    def _update_history(self, *args, value, timestamp=None, **kwargs):
+        """Copy a new array into the history, overriding the oldest shot."""
+        if value is None:
+            return
+        self._record(np.ravel(value), timestamp)
+
+    def _record(self, array, timestamp):
+        """Store one 1D array in the history."""
+        with self._lock:
+            if self._buffer is None or array.shape[0] != self.width:
+                if self._buffer is not None:
+                    logger.debug('%s array length changed to %d, clearing '
+                                 'history', self.name, array.shape[0])
+                self._allocate(array.shape[0], array.dtype)
+            index = self._index
+            self._buffer[index] = array
+            self._buffer[index + self._size] = array
+            self._index = (index + 1) % self._size
+            self._count = min(self._count + 1, self._size)
+            count = self._count
+        super().put(count, timestamp=timestamp, force=True)
+
+    def latest(self, n=None):
+        """
+        Get the last ``n`` shots, oldest first.
+
+        This is a view into the history buffer, not a copy: it is
+        overwritten as new shots arrive. Copy it to keep it around.
+
+        Parameters
+        ----------
+        n : int, optional
+            The number of shots to return. Defaults to all of the recorded
+            shots, and is limited to the recorded shots.
+
+        Returns
+        -------
+        shots : np.ndarray
+            Array of shape (n, width).
+        """
+        with self._lock:
+            if self._buffer is None:
+                return np.empty((0, 0))
+            n = self._count if n is None else min(int(n), self._count)
+            end = self._index + self._size
+            return self._buffer[end - n:end]
+
+    def apply(self, func, n=None, **kwargs):
+        """
+        Apply ``func`` to the last ``n`` shots while holding the buffer.
+
+        ``func`` is called as ``func(shots, **kwargs)`` where ``shots`` is
+        the view returned by `latest`.
+        """
+        with self._lock:
+            return func(self.latest(n), **kwargs)
+
+    def mean(self, n=None):
+        """The mean array over the last ``n`` shots."""
+        return self.apply(np.mean, n, axis=0)
+
+    def std(self, n=None):
+        """The standard deviation array over the last ``n`` shots."""
+        return self.apply(np.std, n, axis=0)
+
+    def peak_index(self, n=None):
+        """The index of the maximum of each of the last ``n`` shots."""
+        return self.apply(np.argmax, n, axis=1)
+
+
+def _linear_fit(x, y):
+    """
+    Least-squares fit of ``y = intercept + slope * x``.
+
+    Returns (slope, intercept), or NaNs if there are fewer than two points or
+    no spread in ``x``.
+    """
+    if len(x) < 2:
+        return np.nan, np.nan
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    denom = np.dot(dx, dx)
+    if denom == 0:
+        return np.nan, np.nan
+    slope = np.dot(dx, y - y_mean) / denom
+    return slope, y_mean - slope * x_mean
+
+
+class ScalarHistorySignal(ArrayHistorySignal):
+    """
+    Signal that keeps a timestamped history of a scalar signal.
+
+    Each update of the scalar signal is recorded as a (timestamp, value)
+    row, using the timestamp of the update. The trend queries below all
+    work on the recorded rows directly, optionally restricted to the last
+    ``seconds`` before the newest row.
+
+    Parameters
+    ----------
+    signal : Signal or str
+        The scalar signal to record, or the attribute name of a sibling
+        signal on the parent device.
+
+    size : int
+        The number of updates to keep.
+
+    filename : str, optional
+        If provided, back the buffer with a memory-mapped file at this path
+        instead of memory.
+    """
+
+    def __init__(self, signal, size, *, filename=None, name, parent=None,
+                 **kwargs):
+        kwargs.pop('dtype', None)
+        super().__init__(signal, size, filename=filename, dtype=np.float64,
+                         name=name, parent=parent, **kwargs)
+
+    def _update_history(self, *args, value, timestamp=None, **kwargs):
+        """Record a new (timestamp, value) row."""
+        if value is None:
+            return
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            logger.debug('%s ignoring non-scalar value %r', self.name, value)
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        self._record(np.array((timestamp, value)), timestamp)
+
+    def latest(self, n=None):
+        """Get the last ``n`` rows, see `ArrayHistorySignal.latest`."""
+        with self._lock:
+            if self._buffer is None:
+                return np.empty((0, 2))
+            return super().latest(n)
+
+    def window(self, seconds=None):
+        """
+        Get the rows recorded in the last ``seconds``, oldest first.
+
+        Like `latest`, this is a view into the history buffer.
+
+        Parameters
+        ----------
+        seconds : float, optional
+            The length of the window, counted back from the newest row.
+            Defaults to the whole history.
+
+        Returns
+        -------
+        rows : np.ndarray
+            Array of shape (n, 2) with timestamps and values.
+        """
+        with self._lock:
+            rows = self.latest()
+            if seconds is None or not len(rows):
+                return rows
+            start = np.searchsorted(rows[:, 0], rows[-1, 0] - seconds,
+                                    side='left')
+            return rows[start:]
+
+    def times(self, seconds=None):
+        """The timestamps recorded in the last ``seconds``."""
+        return self.window(seconds)[:, 0]
+
+    def values(self, seconds=None):
+        """The values recorded in the last ``seconds``."""
+        return self.window(seconds)[:, 1]
+
+    def min(self, seconds=None):
+        """The lowest value in the last ``seconds``, or NaN if empty."""
+        values = self.values(seconds)
+        return values.min() if len(values) else np.nan
+
+    def max(self, seconds=None):
+        """The highest value in the last ``seconds``, or NaN if empty."""
+        values = self.values(seconds)
+        return values.max() if len(values) else np.nan
+
+    def fit(self, seconds=None, log=False):
+        """
+        Fit a line to the values in the last ``seconds``.
+
+        Parameters
+        ----------
+        seconds : float, optional
+            The fit window, see `window`.
+        log : bool, optional
+            Fit ``log10(value)`` instead, e.g. for a pump-down. Values that
+            are not positive are left out.
+
+        Returns
+        -------
+        slope, intercept : float
+            The fit parameters with time in seconds, relative to the newest
+            row. NaN if there are not enough points to fit.
+        """
+        with self._lock:
+            rows = self.window(seconds)
+            if not len(rows):
+                return np.nan, np.nan
+            times = rows[:, 0] - rows[-1, 0]
+            values = rows[:, 1]
+            if log:
+                positive = values > 0
+                times = times[positive]
+                values = np.log10(values[positive])
+            return _linear_fit(times, values)
+
+    def rate_of_rise(self, seconds=None):
+        """
+        The fitted rate of change of the value per second.
+
+        For a pressure, this is the rate of rise used for leak checks.
+        """
+        return self.fit(seconds)[0]
+
+    def time_to_threshold(self, threshold, seconds=None, log=False):
+        """
+        Extrapolate the fitted trend to find when it reaches ``threshold``.
+
+        Parameters
+        ----------
+        threshold : float
+            The value to reach.
+        seconds : float, optional
+            The fit window, see `window`.
+        log : bool, optional
+            Extrapolate in ``log10(value)``, see `fit`.
+
+        Returns
+        -------
+        seconds : float
+            The time from the newest row until the trend reaches the
+            threshold: 0 if it is already past it, ``inf`` if the trend is
+            flat and NaN if there are not enough points to fit.
+        """
+        slope, intercept = self.fit(seconds, log=log)
+        if np.isnan(slope):
+            return np.nan
+        if log:
+            threshold = np.log10(threshold)
+        if slope == 0:
+            return 0.0 if intercept == threshold else np.inf
+        return max((threshold - intercept) / slope, 0.0)
+
+
+class ThresholdSignal(InternalSignal):
+    """
+    Boolean signal that tracks whether another signal is past a threshold.
+
+    The state is kept as a plain attribute and only put, and therefore only
+    emitted to subscribers, when it changes. Updates of the source signal
+    that do not cross the threshold cost a comparison.
+
+    Parameters
+    ----------
+    signal : OphydObject or str
+        The source to watch, or the attribute name of a sibling component
+        on the parent device. Its default event is used, so this can also
+        be a positioner, whose default event is its readback.
+
+    above : float, optional
+        The state is True when the source value is above this.
+
+    below : float, optional
+        The state is True when the source value is below this. Exactly one
+        of ``above`` and ``below`` must be given.
+
+    hysteresis : float, optional
+        Once True, the state only becomes False again once the source value
+        is past the threshold by this much, e.g. below ``above -
+        hysteresis``. This keeps a noisy source near the threshold from
+        flipping the state back and forth.
+
+    invert : bool, optional
+        Report the opposite state, e.g. "removed" as "not below" the
+        insertion threshold.
+    """
+
+    def __init__(self, signal, *, above=None, below=None, hysteresis=0.0,
+                 invert=False, name, parent=None, **kwargs):
+        if (above is None) == (below is None):
+            raise ValueError('Exactly one of above and below is required')
+        kwargs.setdefault('value', None)
+        super().__init__(name=name, parent=parent, **kwargs)
+        if isinstance(signal, str):
+            signal = getattr(parent, signal)
+        self.source = signal
+        self.above = above
+        self.below = below
+        self.hysteresis = float(hysteresis)
+        self.invert = invert
+        # The threshold condition before inversion, and the reported state
+        self._active = False
+        self.state = None
+        self.source.subscribe(self._source_changed)
+
+    @property
+    def connected(self):
+        return self.source.connected
+
+    def _check(self, value):
+        """Is the threshold condition met, including the hysteresis?"""
+        if self.above is not None:
+            threshold = self.above
+            if self._active:
+                threshold -= self.hysteresis
+            return value > threshold
+        threshold = self.below
+        if self._active:
+            threshold += self.hysteresis
+        return value < threshold
+
+    def _source_changed(self, *args, value=None, timestamp=None, **kwargs):
+        """Update the state from a new source value."""
+        if value is None:
+            return
+        self._active = self._check(value)
+        state = self._active != self.invert
+        if state != self.state:
+            self.state = state
+            super().put(state, timestamp=timestamp, force=True)
+
+
 class _OptionalEpicsSignal(Signal):
     """
     An EPICS Signal which may or may not exist.
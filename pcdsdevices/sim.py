@@ -1,3 +1,4 @@
+import logging
 import threading
 import time
 
@@ -10,6 +11,8 @@ from ophyd.sim import SynAxis
 
 from .interface import FltMvInterface, tweak_base
 
+logger = logging.getLogger(__name__)
+
 
 class SynMotor(FltMvInterface, SynAxis):
     """
@@ -47,14 +50,167 @@ class FastMotor(FltMvInterface, SoftPositioner, Device):
         self._set_position(position)
 
 
+class SimClock:
+    """
+    Shared clock that advances all moving simulated axes.
+
+    Instead of one thread per move, every moving axis registers with a clock.
+    A single thread then ticks at ``tick`` second intervals and advances all
+    of the registered axes by the elapsed simulated time. The thread only
+    runs while something is moving.
+
+    Parameters
+    ----------
+    tick : float, optional
+        The wall-clock time between updates, in seconds.
+    speedup : float, optional
+        The ratio of simulated time to wall-clock time. Use values above 1
+        to run moves faster than real time.
+    realtime : bool, optional
+        If False, never start the clock thread. Time then only advances
+        through explicit calls to `advance` or `run_until_idle`, which is
+        deterministic and as fast as possible.
+    """
+
+    def __init__(self, tick=0.1, speedup=1.0, realtime=True):
+        self.tick = tick
+        self.speedup = speedup
+        self.realtime = realtime
+        #: The total simulated time, in seconds
+        self.time = 0.0
+        self._axes = {}
+        self._lock = threading.RLock()
+        self._thread = None
+
+    @property
+    def active(self):
+        """The axes that are currently being advanced."""
+        with self._lock:
+            return list(self._axes)
+
+    def register(self, axis):
+        """
+        Advance ``axis`` on every tick until its move finishes.
+
+        The axis must implement ``_sim_advance(dt)``, returning True once
+        its move is complete.
+        """
+        with self._lock:
+            self._axes[axis] = None
+            if self.realtime and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='pcdsdevices_sim_clock',
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def unregister(self, axis):
+        """Stop advancing ``axis``."""
+        with self._lock:
+            self._axes.pop(axis, None)
+
+    def advance(self, dt):
+        """
+        Advance the simulated time and all active axes by ``dt`` seconds.
+
+        Returns
+        -------
+        n_active : int
+            The number of axes that are still moving.
+        """
+        with self._lock:
+            self.time += dt
+            axes = list(self._axes)
+        finished = []
+        for axis in axes:
+            try:
+                done = axis._sim_advance(dt)
+            except Exception:
+                logger.exception('Error advancing simulated axis %s',
+                                 getattr(axis, 'name', axis))
+                done = True
+            if done:
+                finished.append(axis)
+        with self._lock:
+            for axis in finished:
+                self._axes.pop(axis, None)
+            return len(self._axes)
+
+    def run_until_idle(self, dt=None, max_time=None):
+        """
+        Advance the clock without waiting until nothing is moving.
+
+        Parameters
+        ----------
+        dt : float, optional
+            The simulated time per step. Defaults to ``tick``.
+        max_time : float, optional
+            Give up after this much simulated time.
+
+        Returns
+        -------
+        elapsed : float
+            The simulated time that was needed.
+        """
+        dt = self.tick if dt is None else dt
+        elapsed = 0.0
+        while self._axes:
+            if max_time is not None and elapsed >= max_time:
+                break
+            self.advance(dt)
+            elapsed += dt
+        return elapsed
+
+    def _run(self):
+        """Clock thread: tick until there is nothing left to move."""
+        last = time.monotonic()
+        while True:
+            time.sleep(self.tick)
+            now = time.monotonic()
+            # Use the measured interval so that slow ticks do not drift
+            self.advance((now - last) * self.speedup)
+            last = now
+            with self._lock:
+                if not self._axes:
+                    self._thread = None
+                    return
+
+
+#: The clock used by simulated motors that are not given one explicitly
+sim_clock = SimClock()
+
+
 class SlowMotor(FastMotor):
     """
     Simulated slow-moving motor.
 
     Unlike the `FastMotor`, this takes some time to reach the
     destination. Use this when you need some sort of delay.
+
+    All slow motors are advanced by a shared `SimClock` rather than by a
+    thread per move, so many of them can move at once.
+
+    Parameters
+    ----------
+    velocity : float, optional
+        The maximum speed, in units per second.
+    acceleration : float, optional
+        The acceleration and deceleration, in units per second squared.
+        By default the motor moves at full speed immediately.
+    clock : SimClock, optional
+        The clock to use. Defaults to the module-level ``sim_clock``.
     """
 
+    def __init__(self, *args, velocity=10.0, acceleration=None, clock=None,
+                 **kwargs):
+        self.velocity = velocity
+        self.acceleration = acceleration
+        self.clock = clock or sim_clock
+        self._goal = None
+        self._speed = 0.0
+        self._stop = False
+        super().__init__(*args, **kwargs)
+
     def _setup_move(self, position, status):
         if self.position is None:
             # Initialize position during __init__'s set call
@@ -62,31 +218,52 @@ class SlowMotor(FastMotor):
             self._done_moving(success=True)
             return
 
-        def update_thread(positioner, goal):
-            positioner._moving = True
-            if positioner.position == goal:
-                # if already at the requested position, mark success
-                positioner._set_position(goal)  # needed for LiveTable format
-                positioner._done_moving(success=True)
-                return
-
-            while positioner.position != goal and not self._stop:
-                if goal - positioner.position > 1:
-                    positioner._set_position(positioner.position + 1)
-                elif goal - positioner.position < -1:
-                    positioner._set_position(positioner.position - 1)
-                else:
-                    positioner._set_position(goal)
-                    positioner._done_moving(success=True)
-                    return
-                time.sleep(0.1)
-            positioner._done_moving(success=False)
-        self.stop()
         self._started_moving = True
+        self._moving = True
+        if self.position == position:
+            # if already at the requested position, mark success
+            self.clock.unregister(self)
+            self._set_position(position)  # needed for LiveTable format
+            self._done_moving(success=True)
+            return
+        if self._goal is None:
+            self._speed = 0.0
+        self._goal = position
         self._stop = False
-        t = threading.Thread(target=update_thread,
-                             args=(self, position))
-        t.start()
+        self.clock.register(self)
+
+    def _sim_advance(self, dt):
+        """
+        Move towards the goal by ``dt`` seconds of simulated time.
+
+        Returns True once the move is over.
+        """
+        goal = self._goal
+        if goal is None:
+            return True
+        if self._stop:
+            self._goal = None
+            self._speed = 0.0
+            self._done_moving(success=False)
+            return True
+        distance = abs(goal - self.position)
+        if self.acceleration:
+            # Trapezoidal profile: slow down in time to stop at the goal
+            self._speed = min(self.velocity,
+                              self._speed + self.acceleration * dt,
+                              (2 * self.acceleration * distance) ** 0.5)
+        else:
+            self._speed = self.velocity
+        step = self._speed * dt
+        if step >= distance:
+            self._goal = None
+            self._speed = 0.0
+            self._set_position(goal)
+            self._done_moving(success=True)
+            return True
+        direction = 1 if goal > self.position else -1
+        self._set_position(self.position + direction * step)
+        return False
 
     def stop(self, *, success: bool = False):
         self._stop = True
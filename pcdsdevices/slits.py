@@ -12,7 +12,10 @@ the manipulation will be done on the size of the aperture not the position,
 however, if control of the center is desired the ``center`` sub-devices can be
 used.
 """
+import contextlib
 import logging
+import threading
+import time
 from collections import OrderedDict
 
 from lightpath import LightpathState
@@ -51,6 +54,12 @@ class SlitsBase(MvInterface, GroupDevice, LightpathMixin):
     # QIcon for UX
     _icon = 'fa.th-large'
 
+    # Run when the slits go from inserted to removed or back
+    SUB_STATE = 'state'
+    _default_sub = SUB_STATE
+    # Run with the new xwidth and ywidth when the aperture changes
+    SUB_APERTURE = 'aperture'
+
     # Mark as parent class for lightpath interface
     _lightpath_mixin = True
     lightpath_cpts = ['xwidth.user_readback', 'ywidth.user_readback']
@@ -71,10 +80,22 @@ class SlitsBase(MvInterface, GroupDevice, LightpathMixin):
     # The gap opens/closes when we move the slits device
     stage_group = [xwidth, ywidth]
 
-    def __init__(self, *args, nominal_aperture=5.0, **kwargs):
+    def __init__(self, *args, nominal_aperture=5.0, aperture_rate_limit=None,
+                 **kwargs):
         self._has_subscribed = False
+        # Latest readbacks and insertion state, for the SUB_STATE and
+        # SUB_APERTURE events
+        self._widths = {'xwidth': None, 'ywidth': None}
+        self._aperture_inserted = None
+        self._aperture_lock = threading.Lock()
+        self._aperture_pending = False
+        self._last_aperture_event = -float('inf')
+        self.aperture_rate_limit = aperture_rate_limit
+        self._nominal_aperture = float(nominal_aperture)
         super().__init__(*args, **kwargs)
         self.nominal_aperture.put(nominal_aperture)
+        self.nominal_aperture.subscribe(self._nominal_aperture_changed,
+                                        run=False)
         self.hg = self.xwidth
         self.vg = self.ywidth
         self.ho = self.xcenter
@@ -239,7 +260,7 @@ class SlitsBase(MvInterface, GroupDevice, LightpathMixin):
         """
 
         # Use nominal_aperture by default
-        size = size or self.nominal_aperture
+        size = size or self._nominal_aperture
         if size > min(self.current_aperture):
             return self.move(size, wait=wait, timeout=timeout, **kwargs)
         else:
@@ -286,21 +307,71 @@ class SlitsBase(MvInterface, GroupDevice, LightpathMixin):
 
         # Avoid making child subscriptions unless a client cares
         if not self._has_subscribed:
-            # Subscribe to changes in aperture
-            self.xwidth.readback.subscribe(self._aperture_changed,
-                                           run=False)
-            self.ywidth.readback.subscribe(self._aperture_changed,
-                                           run=False)
             self._has_subscribed = True
+            # Subscribe to changes in aperture
+            self.xwidth.readback.subscribe(self._aperture_changed)
+            self.ywidth.readback.subscribe(self._aperture_changed)
         return super().subscribe(cb, event_type=event_type, run=run)
 
-    def _aperture_changed(self, *args, **kwargs):
+    def _nominal_aperture_changed(self, *args, value, **kwargs):
+        """Callback run when the nominal aperture is changed."""
+        self._nominal_aperture = float(value)
+        self._update_aperture_state()
+        if self._summary_initialized:
+            self._calc_cache_lightpath_state()
+
+    def _aperture_changed(self, *args, obj, value, **kwargs):
         """Callback run when slit size is adjusted."""
         # Avoid duplicate keywords
         kwargs.pop('sub_type', None)
-        kwargs.pop('obj', None)
-        # Run subscriptions
-        self._run_subs(sub_type=self.SUB_STATE, obj=self, **kwargs)
+        if obj is self.xwidth.readback:
+            self._widths['xwidth'] = value
+        else:
+            self._widths['ywidth'] = value
+        self._update_aperture_state(value=value, **kwargs)
+        self._queue_aperture_event()
+
+    def _update_aperture_state(self, **kwargs):
+        """Run the SUB_STATE subscriptions if the insertion state changed."""
+        widths = list(self._widths.values())
+        if None in widths:
+            return
+        inserted = min(widths) < self._nominal_aperture
+        if inserted == self._aperture_inserted:
+            return
+        self._aperture_inserted = inserted
+        self._run_subs(sub_type=self.SUB_STATE, obj=self, inserted=inserted,
+                       removed=not inserted, **kwargs)
+
+    def _queue_aperture_event(self):
+        """
+        Run the SUB_APERTURE subscriptions, at most once per
+        ``aperture_rate_limit`` seconds if set.
+
+        Updates inside the rate limit are combined into one event with the
+        latest widths at the end of the interval.
+        """
+        with self._aperture_lock:
+            if self._aperture_pending:
+                return
+            interval = self.aperture_rate_limit
+            if interval:
+                delay = (self._last_aperture_event + interval
+                         - time.monotonic())
+                if delay > 0:
+                    self._aperture_pending = True
+                    schedule_task(self._emit_aperture_event, delay=delay)
+                    return
+        self._emit_aperture_event()
+
+    def _emit_aperture_event(self):
+        with self._aperture_lock:
+            self._aperture_pending = False
+            self._last_aperture_event = time.monotonic()
+        self._run_subs(sub_type=self.SUB_APERTURE, obj=self,
+                       xwidth=self._widths['xwidth'],
+                       ywidth=self._widths['ywidth'],
+                       timestamp=time.time())
 
     def calc_lightpath_state(
         self,
@@ -308,7 +379,7 @@ class SlitsBase(MvInterface, GroupDevice, LightpathMixin):
         ywidth: float
     ) -> LightpathState:
         widths = [xwidth, ywidth]
-        self._inserted = (min(widths) < self.nominal_aperture.get())
+        self._inserted = (min(widths) < self._nominal_aperture)
         self._removed = not self._inserted
         self._transmission = 1.0 if self._inserted else 0.0
 
@@ -409,6 +480,12 @@ class LusiSlits(SlitsBase):
     nominal_aperture : float, optional
         Nominal slit size that will encompass the beam without blocking.
 
+    aperture_rate_limit : float, optional
+        Minimum time in seconds between ``SUB_APERTURE`` events. Defaults to
+        an event for every width update. ``SUB_STATE`` events are only run
+        when the slits go from inserted to removed or back, and are never
+        rate-limited.
+
     Notes
     -----
     The slits represent a unique device when forming the lightpath because
@@ -485,7 +562,8 @@ class BeckhoffSlitPositioner(BadSlitPositionerBase):
     @actuate.sub_value
     def _execute_move(self, *args, value, **kwargs):
         if value == 1:
-            self.parent.exec_queue.put(1)
+            # Slits are a GroupDevice, so our parent is not set
+            self.biological_parent._queue_move(self)
 
     @done.sub_value
     def _reset_actuate(self, *args, value, old_value, **kwargs):
@@ -521,20 +599,100 @@ class BeckhoffSlits(SlitsBase):
 
     lightpath_cpts = ['xwidth.readback', 'ywidth.readback']
 
+    # Bits of each blade in the done-moving mask
+    _done_bits = {'top': 0b0001, 'bottom': 0b0010, 'north': 0b0100,
+                  'south': 0b1000}
+    _all_done = 0b1111
+    # Bits of each positioner in the move group masks
+    _positioner_bits = {'xwidth': 0b0001, 'ywidth': 0b0010,
+                        'xcenter': 0b0100, 'ycenter': 0b1000}
+
     def __init__(self, prefix, *, name, **kwargs):
         self._started_move = False
-        self._top_done = False
-        self._bottom_done = False
-        self._north_done = False
-        self._south_done = False
+        self._done_lock = threading.RLock()
+        self._done_mask = 0
+        # None until the first blade update, so that it is always sent
+        self._done = None
+        self._group_lock = threading.RLock()
+        # Positioners in an open move group that still have to request
+        self._pending_moves = 0
+        # Positioners that requested a move that has not been executed
+        self._queued_moves = 0
         super().__init__(prefix, name=name, nominal_aperture=3, **kwargs)
 
+    def _positioner_bit(self, positioner) -> int:
+        try:
+            return self._positioner_bits[positioner.attr_name]
+        except (AttributeError, KeyError):
+            raise ValueError(
+                f'{positioner} is not a positioner of {self.name}'
+            ) from None
+
+    @contextlib.contextmanager
+    def move_group(self, *positioners):
+        """
+        Execute the moves of several positioners together.
+
+        Moves requested by ``positioners`` inside this context are only
+        executed once all of them have acknowledged their setpoints, or when
+        the context exits, whichever comes first.
+
+        Parameters
+        ----------
+        *positioners : BeckhoffSlitPositioner
+            Any of ``xwidth``, ``ywidth``, ``xcenter`` and ``ycenter``.
+
+        Examples
+        --------
+        >>> with slits.move_group(slits.xwidth, slits.xcenter):
+        ...     slits.xwidth.move(1, wait=False)
+        ...     slits.xcenter.move(0.5, wait=False)
+        """
+        bits = 0
+        for positioner in positioners:
+            bits |= self._positioner_bit(positioner)
+        with self._group_lock:
+            self._pending_moves |= bits
+        try:
+            yield
+        finally:
+            with self._group_lock:
+                self._pending_moves &= ~bits
+                execute = bool(self._queued_moves) and not self._pending_moves
+                if execute:
+                    self._queued_moves = 0
+            if execute:
+                # A positioner of the group never requested its move
+                self.exec_queue.put(1)
+
+    def _queue_move(self, positioner):
+        """
+        A positioner has acknowledged its setpoint and requested its move.
+
+        The move is executed right away unless other positioners of an open
+        `move_group` have yet to request theirs.
+        """
+        bit = self._positioner_bit(positioner)
+        with self._group_lock:
+            self._pending_moves &= ~bit
+            self._queued_moves |= bit
+            if self._pending_moves:
+                return
+            self._queued_moves = 0
+        self.exec_queue.put(1)
+
+    def move(self, width, height=None, **kwargs):
+        with self.move_group(self.xwidth, self.ywidth):
+            return super().move(width, height, **kwargs)
+
+    move.__doc__ = SlitsBase.move.__doc__
+
     @exec_queue.sub_value
     def _exec_handler(self, *args, value, old_value, **kwargs):
-        """Wait just a moment to queue up move requests."""
+        """Execute the queued move requests."""
         if value == 1 and old_value == 0:
             self._started_move = True
-            schedule_task(self.exec_move.put, args=(1,), delay=0.2)
+            schedule_task(self.exec_move.put, args=(1,))
 
     @done_all.sub_value
     def _reset_exec_move(self, *args, value, old_value, **kwargs):
@@ -547,48 +705,49 @@ class BeckhoffSlits(SlitsBase):
     @done_all.sub_value
     def _dmov_fanout(self, *args, value, **kwargs):
         """When we're done moving, tell our pv positioners."""
-        self.xwidth.done.put(value)
-        self.ywidth.done.put(value)
-        self.xcenter.done.put(value)
-        self.ycenter.done.put(value)
+        for positioner in (self.xwidth, self.ywidth, self.xcenter,
+                           self.ycenter):
+            if positioner.done.get() != value:
+                positioner.done.put(value)
 
     @done_top.sub_value
     def _update_top_done(self, value, *args, **kwargs):
         """Update axis done flag, and then the group done if applicable"""
-        self._top_done = value
-        self._update_dmov()
+        self._update_dmov('top', value)
 
     @done_bottom.sub_value
     def _update_bottom_done(self, value, *args, **kwargs):
         """Update axis done flag, and then the group done if applicable"""
-        self._bottom_done = value
-        self._update_dmov()
+        self._update_dmov('bottom', value)
 
     @done_north.sub_value
     def _update_north_done(self, value, *args, **kwargs):
         """Update axis done flag, and then the group done if applicable"""
-        self._north_done = value
-        self._update_dmov()
+        self._update_dmov('north', value)
 
     @done_south.sub_value
     def _update_south_done(self, value, *args, **kwargs):
         """Update axis done flag, and then the group done if applicable"""
-        self._south_done = value
-        self._update_dmov()
+        self._update_dmov('south', value)
 
-    def _update_dmov(self, *args, **kwargs):
+    def _update_dmov(self, blade, value):
         """
         Call this inside a callback to update the done_all signal.
 
-        Each direction's done moving signal should update its
-        individual done moving boolean in a callback and then call
-        this method to update the aggregate done_all signal.
+        Each blade's done moving signal sets or clears its bit in the done
+        mask. The aggregate done_all signal is only updated when the
+        combined state changes.
         """
-        done = all((self._top_done,
-                    self._bottom_done,
-                    self._north_done,
-                    self._south_done))
-        if done != self.done_all.get():
+        bit = self._done_bits[blade]
+        with self._done_lock:
+            if value:
+                self._done_mask |= bit
+            else:
+                self._done_mask &= ~bit
+            done = self._done_mask == self._all_done
+            if done == self._done:
+                return
+            self._done = done
             self.done_all.put(done)
 
     def calc_lightpath_state(
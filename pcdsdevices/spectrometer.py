@@ -11,7 +11,7 @@ from .epics_motor import (IMS, BeckhoffAxis, BeckhoffAxisNoOffset,
                           EpicsMotorInterface)
 from .interface import BaseInterface, LightpathMixin
 from .pmps import TwinCATStatePMPS
-from .signal import InternalSignal, PytmcSignal
+from .signal import PytmcSignal, ThresholdSignal
 from .state import StateRecordPositioner
 
 
@@ -49,41 +49,18 @@ class Kmono(BaseInterface, GroupDevice, LightpathMixin):
     diode_horiz = Cpt(BeckhoffAxisNoOffset, ':DIODE_HORIZ', kind='normal')
     diode_vert = Cpt(BeckhoffAxisNoOffset, ':DIODE_VERT', kind='normal')
 
-    xtal_in = Cpt(InternalSignal, value=None, kind='omitted')
-    xtal_out = Cpt(InternalSignal, value=None, kind='omitted')
-    ret_in = Cpt(InternalSignal, value=None, kind='omitted')
-    ret_out = Cpt(InternalSignal, value=None, kind='omitted')
-    diode_in = Cpt(InternalSignal, value=None, kind='omitted')
-    diode_out = Cpt(InternalSignal, value=None, kind='omitted')
-
-    def _update_if_changed(self, value, signal):
-        if value != signal.get():
-            signal.put(value, force=True)
-
-    def _update_state(self, inserted, removed, state):
-        self._update_if_changed(inserted, getattr(self, state + '_in'))
-        self._update_if_changed(removed, getattr(self, state + '_out'))
-
-    @xtal_vert.sub_default
-    def _xtal_state(self, *args, value, **kwargs):
-        if value is not None:
-            inserted = value > 50
-            removed = value < 2
-            self._update_state(inserted, removed, 'xtal')
-
-    @ret_vert.sub_default
-    def _ret_state(self, *args, value, **kwargs):
-        if value is not None:
-            inserted = value < -0.5
-            removed = not inserted
-            self._update_state(inserted, removed, 'ret')
-
-    @diode_vert.sub_default
-    def _diode_state(self, *args, value, **kwargs):
-        if value is not None:
-            inserted = value < 2
-            removed = value > 96.5
-            self._update_state(inserted, removed, 'diode')
+    xtal_in = Cpt(ThresholdSignal, signal='xtal_vert', above=50,
+                  kind='omitted')
+    xtal_out = Cpt(ThresholdSignal, signal='xtal_vert', below=2,
+                   kind='omitted')
+    ret_in = Cpt(ThresholdSignal, signal='ret_vert', below=-0.5,
+                 kind='omitted')
+    ret_out = Cpt(ThresholdSignal, signal='ret_vert', below=-0.5, invert=True,
+                  kind='omitted')
+    diode_in = Cpt(ThresholdSignal, signal='diode_vert', below=2,
+                   kind='omitted')
+    diode_out = Cpt(ThresholdSignal, signal='diode_vert', above=96.5,
+                    kind='omitted')
 
     def calc_lightpath_state(
         self,
@@ -3,6 +3,7 @@ import threading
 import time
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 from ophyd.sim import make_fake_device
 from ophyd.status import wait as status_wait
@@ -55,6 +56,27 @@ def fake_move_transition(att, status, goal):
     assert status.success
 
 
+def fake_calculation(att, ceil, floor, delay=0):
+    """
+    Act like the IOC: after each setpoint put, raise calcpend, post the new
+    ceiling and floor, then clear calcpend. With a delay, all of these
+    monitors arrive after the move has started waiting.
+    """
+    def calculate():
+        att.calcpend.sim_put(1)
+        att.trans_ceil.sim_put(ceil)
+        att.trans_floor.sim_put(floor)
+        att.calcpend.sim_put(0)
+
+    def start_calc(*args, **kwargs):
+        if delay:
+            threading.Timer(delay, calculate).start()
+        else:
+            calculate()
+
+    return att.setpoint.subscribe(start_calc, run=False)
+
+
 @pytest.mark.timeout(5)
 def test_attenuator_motion(fake_att):
     logger.debug('test_attenuator_motion')
@@ -62,6 +84,7 @@ def test_attenuator_motion(fake_att):
     # Set up the ceil and floor
     att.trans_ceil.sim_put(0.8001)
     att.trans_floor.sim_put(0.5001)
+    fake_calculation(att, 0.8001, 0.5001)
     # Move to ceil
     status = att.move(0.8, wait=False)
     fake_move_transition(att, status, 0.8001)
@@ -135,6 +158,73 @@ def test_attenuator_calcpend(fake_att):
     assert time.time() - start >= 1
 
 
+@pytest.mark.timeout(5)
+@pytest.mark.parametrize('n_filters', [1, 4, MAX_FILTERS])
+def test_attenuator_move_timing(n_filters):
+    logger.debug('test_attenuator_move_timing')
+    att = Attenuator('TST:ATT', n_filters, name='test_att')
+    att.readback.sim_put(1)
+    att.done.sim_put(0)
+    att.calcpend.sim_put(0)
+    att.trans_ceil.sim_put(0.8001)
+    att.trans_floor.sim_put(0.5001)
+    # Calculation finishes with the put: no waiting at all
+    cid = fake_calculation(att, 0.8001, 0.5001)
+    status = att.move(0.8, wait=False)
+    fake_move_transition(att, status, 0.8001)
+    assert att.last_move_timing['calc_wait'] < 0.1
+    assert att.last_move_timing['total'] >= att.last_move_timing['calc_wait']
+    att.setpoint.unsubscribe(cid)
+
+    # Slow calculation: we wake up as soon as calcpend goes back to 0
+    fake_calculation(att, 0.8001, 0.5001, delay=0.2)
+    status = att.move(0.5, wait=False)
+    fake_move_transition(att, status, 0.5001)
+    assert 0.1 < att.last_move_timing['calc_wait'] < 0.9
+    assert att.actuate_value == 2
+
+
+@pytest.mark.timeout(5)
+def test_attenuator_calc_after_put(fake_att):
+    logger.debug('test_attenuator_calc_after_put')
+    att = fake_att
+    att.trans_ceil.sim_put(0.8001)
+    att.trans_floor.sim_put(0.5001)
+    # No calcpend, ceil or floor monitors until well after the put
+    fake_calculation(att, 0.1001, 0.0501, delay=0.2)
+    status = att.move(0.1, wait=False)
+    fake_move_transition(att, status, 0.1001)
+    # The stale ceil and floor would have picked the floor
+    assert att.actuate.get() == 3
+    assert att.last_move_timing['calc_wait'] > 0.1
+
+
+@pytest.mark.timeout(5)
+def test_attenuator_calc_fallback(fake_att, monkeypatch):
+    logger.debug('test_attenuator_calc_fallback')
+    att = fake_att
+    att.calcpend_timeout = 0.2
+    att.trans_ceil.sim_put(0.8001)
+    att.trans_floor.sim_put(0.5001)
+    uncached = []
+    for sig in (att.calcpend, att.trans_ceil, att.trans_floor):
+        def get(*, use_monitor=True, _get=sig.get, _sig=sig, **kwargs):
+            if not use_monitor:
+                uncached.append(_sig)
+            return _get(**kwargs)
+        monkeypatch.setattr(sig, 'get', get)
+    # calcpend never changes: give up and ask the IOC
+    status = att.move(0.8, wait=False)
+    fake_move_transition(att, status, 0.8001)
+    assert att.actuate.get() == 3
+    assert att.last_move_timing['calc_wait'] >= 0.2
+    assert set(uncached) == {att.calcpend, att.trans_ceil, att.trans_floor}
+    # calcpend was 0, so a later read does not wait again
+    start = time.monotonic()
+    assert att.actuate_value == 3
+    assert time.monotonic() - start < 0.1
+
+
 @pytest.mark.timeout(5)
 def test_attenuator_set_energy(fake_att):
     logger.debug('test_attenuator_set_energy')
@@ -233,6 +323,38 @@ def at2l0(request):
     return at2l0
 
 
+def test_at2l0_calculate_local(at2l0):
+    calc = at2l0.calculator
+    for idx, filt in calc.filters_by_index.items():
+        filt.material.sim_put('Si')
+        filt.thickness.sim_put(10 * 2 ** (idx - calc.first_filter))
+        filt.active.sim_put(1)
+        filt.is_stuck.sim_put(0)
+    # The last filter can not be used
+    filt.is_stuck.sim_put(1)
+    calc.energy_actual.sim_put(8000.)
+
+    blades = calc.get_filter_specs()
+    assert len(blades) == calc.num_filters
+    assert not blades[-1][0].usable
+
+    def attenuation_length(material, energy):
+        return np.asarray(energy, dtype=float) / 100.
+
+    solver = calc.make_solver(attenuation_length=attenuation_length,
+                              blades=blades)
+    configs = calc.calculate_local([0.1, 0.5, 1.0], solver=solver)
+    assert configs.shape == (3, calc.num_filters)
+    assert not np.any(configs[:, -1])
+    assert not np.any(configs[2])
+    ceil_configs = calc.calculate_local([0.1, 0.5], energy=8000.,
+                                        use_floor=False, solver=solver)
+    floor_trans = solver.transmission_of(configs[:2], 8000.)
+    ceil_trans = solver.transmission_of(ceil_configs, 8000.)
+    assert np.all(floor_trans <= [0.1, 0.5])
+    assert np.all(ceil_trans >= [0.1, 0.5])
+
+
 def test_at2l0_error_summary(at2l0):
     assert at2l0.error_summary.get() == "No Errors"
     at2l0.blade_05.state.error_message.sim_put("test error")
@@ -262,3 +384,12 @@ def test_at2l0_clear_errors(at2l0):
     at2l0.clear_errors()
     for sig in signals:
         assert sig.get()
+
+
+def test_new_attenuator_filter_specs(fake_new_attenuator):
+    calc = getattr(fake_new_attenuator, 'calculator', None)
+    if calc is None:
+        calc = fake_new_attenuator
+    blades = calc.get_filter_specs()
+    assert len(blades) == len(calc.filters_by_index)
+    assert all(len(blade) >= 1 for blade in blades)
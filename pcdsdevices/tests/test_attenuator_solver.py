@@ -0,0 +1,110 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from ..attenuator_solver import FilterSpec, SolidAttenuatorSolver
+
+THICKNESSES = [10, 20, 40, 80, 160]
+
+
+def fake_attenuation_length(material, energy):
+    """Attenuation length in microns, growing linearly with energy."""
+    scale = {'Si': 1.0, 'C': 4.0}[material]
+    return scale * np.asarray(energy, dtype=float) / 100.
+
+
+def brute_force(blades, transmission, energy):
+    """Slow reference implementation of the floor/ceiling search."""
+    results = []
+    options = [range(len(blade) + 1) for blade in blades]
+    for config in itertools.product(*options):
+        log_trans = 0.
+        for blade, choice in zip(blades, config):
+            if choice:
+                filt = blade[choice - 1]
+                if not filt.usable:
+                    break
+                log_trans -= filt.thickness / fake_attenuation_length(
+                    filt.material, energy)
+        else:
+            results.append((np.exp(log_trans), config))
+    below = [res for res in results if res[0] <= transmission]
+    above = [res for res in results if res[0] >= transmission]
+    floor = max(below)[0] if below else min(results)[0]
+    ceil = min(above)[0] if above else max(results)[0]
+    return floor, ceil
+
+
+@pytest.fixture(scope='function')
+def solver():
+    return SolidAttenuatorSolver.from_table(
+        ['Si'] * len(THICKNESSES), THICKNESSES,
+        attenuation_length=fake_attenuation_length,
+    )
+
+
+def test_solver_matches_brute_force(solver):
+    transmissions = np.linspace(0, 1, 23)
+    energies = np.asarray([5000., 8000.])
+    trans_grid, energy_grid = np.meshgrid(transmissions, energies)
+    solution = solver.solve(trans_grid, energy_grid)
+    assert solution.floor_config.shape == (trans_grid.size, len(THICKNESSES))
+    for idx, (trans, energy) in enumerate(
+        zip(trans_grid.ravel(), energy_grid.ravel())
+    ):
+        floor, ceil = brute_force(solver.blades, trans, energy)
+        assert solution.floor_transmission[idx] == pytest.approx(floor)
+        assert solution.ceiling_transmission[idx] == pytest.approx(ceil)
+        assert solution.floor_transmission[idx] <= max(trans, floor)
+        assert solution.ceiling_transmission[idx] >= min(trans, ceil)
+
+    np.testing.assert_allclose(
+        solver.transmission_of(solution.floor_config, solution.energy),
+        solution.floor_transmission,
+    )
+    np.testing.assert_allclose(
+        solver.transmission_of(solution.ceiling_config, solution.energy),
+        solution.ceiling_transmission,
+    )
+
+
+def test_solver_limits(solver):
+    solution = solver.solve([0, 1], 8000.)
+    # Nothing is below 0: use the thickest configuration
+    assert np.all(solution.floor_config[0] == 1)
+    # Everything removed for full transmission
+    assert np.all(solution.floor_config[1] == 0)
+    assert solution.floor_transmission[1] == 1
+    assert solution.ceiling_transmission[1] == 1
+    with pytest.raises(ValueError):
+        solver.solve(1.5, 8000.)
+
+
+def test_solver_multi_filter_blades():
+    blades = [
+        [FilterSpec('Si', 10), FilterSpec('C', 50), FilterSpec('Si', 30)],
+        [FilterSpec('Si', 20), FilterSpec('Si', 40, usable=False)],
+    ]
+    solver = SolidAttenuatorSolver(
+        blades, attenuation_length=fake_attenuation_length
+    )
+    assert solver.n_combinations == 4 * 2
+    solution = solver.solve(np.linspace(0, 1, 11), 6000.)
+    # The unusable filter is never inserted
+    assert not np.any(solution.floor_config[:, 1] == 2)
+    assert not np.any(solution.ceiling_config[:, 1] == 2)
+    for idx, trans in enumerate(solution.transmission):
+        floor, ceil = brute_force(blades, trans, 6000.)
+        assert solution.floor_transmission[idx] == pytest.approx(floor)
+        assert solution.ceiling_transmission[idx] == pytest.approx(ceil)
+    with pytest.raises(ValueError):
+        solver.transmission_of([0, 2], 6000.)
+
+
+def test_solver_cache(solver):
+    solver.max_cached_energies = 2
+    solver.solve(0.5, [1000., 2000., 3000.])
+    assert len(solver._table_cache) == 2
+    solver.clear_cache()
+    assert not solver._table_cache
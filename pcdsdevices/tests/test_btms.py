@@ -1,13 +1,17 @@
+import random
 from typing import Optional
 
 import pytest
+from ophyd.sim import make_fake_device
 
-from ..lasers.btms_config import (BtmsDestinationState, BtmsSourceState,
-                                  BtmsState, DestinationInControlError,
+from ..lasers.btms_config import (BtmsDestinationState, BtmsMoveMatrix,
+                                  BtmsSourceState, BtmsState,
+                                  DestinationInControlError,
                                   DestinationInUseError, DestinationPosition,
                                   MaintenanceModeActiveError,
                                   MovingActiveSource, PathCrossedError,
                                   PositionInvalidError, SourcePosition)
+from ..lasers.btps import BtpsState
 
 
 @pytest.mark.parametrize(
@@ -449,3 +453,100 @@ def test_destination_acknowledgement():
         # Yield control and try again
         state.destinations[DestinationPosition.ld1].yields_control = True
         state.check_move(source, None, DestinationPosition.ld1)
+
+
+def assert_matrix_matches(matrix: BtmsMoveMatrix, state: BtmsState):
+    for source in matrix.sources:
+        for dest in matrix.destinations:
+            expected = [str(err) for err in state.check_move_all(source, None, dest)]
+            assert [str(err) for err in matrix.conflicts(source, dest)] == expected
+            assert matrix.is_allowed(source, dest) is (not expected)
+
+
+def test_move_matrix_incremental():
+    rng = random.Random(0)
+    sources = list(SourcePosition)
+    destinations = list(DestinationPosition)
+    matrix = BtmsMoveMatrix(sources=sources, destinations=destinations)
+    assert_matrix_matches(matrix, matrix.state)
+
+    for _ in range(200):
+        action = rng.random()
+        if action < 0.8:
+            matrix.update_source(
+                rng.choice(sources),
+                rng.choice(destinations + [None]),
+                rng.random() < 0.5,
+            )
+        elif action < 0.95:
+            matrix.update_yields_control(
+                rng.choice(destinations), rng.random() < 0.5
+            )
+        else:
+            matrix.update_maintenance_mode(rng.random() < 0.5)
+        assert_matrix_matches(matrix, matrix.state)
+
+    assert set(matrix.to_dict()) == set(sources)
+
+
+def test_move_matrix_update_is_incremental():
+    matrix = BtmsMoveMatrix(
+        sources=list(SourcePosition), destinations=list(DestinationPosition)
+    )
+    for source, dest in zip(SourcePosition, DestinationPosition):
+        matrix.update_source(source, dest, False)
+
+    computed = matrix.entries_computed
+    assert not matrix.update_source(
+        SourcePosition.ls1, matrix.state.sources[SourcePosition.ls1].destination,
+        False,
+    )
+    assert matrix.entries_computed == computed
+
+    assert matrix.update_yields_control(DestinationPosition.ld3, False)
+    # Only the row of the source at LD3 is recomputed
+    assert matrix.entries_computed == computed + len(DestinationPosition)
+    assert_matrix_matches(matrix, matrix.state)
+
+
+def test_btps_live_state():
+    btps = make_fake_device(BtpsState)("", name="btps")
+    for source, dest in zip(btps.sources.values(), btps.destinations):
+        source.current_destination.sim_put(dest.index)
+        source.lss.opened_status.sim_put(0)
+    for dest in btps.destinations.values():
+        dest.exit_valve_ready.sim_put(1)
+        dest.yields_control.sim_put(1)
+        for source_to_dest in dest.sources.values():
+            source_to_dest.entry_valve_ready.sim_put(1)
+    btps.config.maintenance_mode.sim_put(0)
+
+    updates = []
+    btps.subscribe(
+        lambda matrix, **kwargs: updates.append(matrix),
+        event_type=btps.SUB_MOVE_MATRIX,
+        run=False,
+    )
+
+    def check():
+        assert_matrix_matches(btps.move_matrix, btps.to_btms_state())
+        assert btps.live_state.sources == btps.to_btms_state().sources
+
+    check()
+    btps.ls1.lss.opened_status.sim_put(1)
+    check()
+    btps.ls3.current_destination.sim_put(DestinationPosition.ld14.index)
+    check()
+    btps.ld2.yields_control.sim_put(0)
+    check()
+    btps.ld1.exit_valve_ready.sim_put(0)
+    check()
+    btps.config.maintenance_mode.sim_put(1)
+    check()
+    # One update when the live state starts, then one per change
+    assert len(updates) == 6
+
+    btps.stop_live_state()
+    btps.ls1.lss.opened_status.sim_put(0)
+    # One update when the live state starts, then one per change
+    assert len(updates) == 6
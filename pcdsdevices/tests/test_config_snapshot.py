@@ -0,0 +1,121 @@
+import time
+
+import numpy as np
+import pytest
+from ophyd import Component as Cpt
+from ophyd import Device, Signal
+from ophyd.signal import SignalRO
+
+from ..config_snapshot import (MISSING, ConfigSnapshot, snapshot_configuration,
+                               values_equal)
+
+
+class SlowSignal(Signal):
+    """Signal that takes a while to read, like a blocking caget."""
+    delay = 0.05
+
+    def get(self, **kwargs):
+        time.sleep(self.delay)
+        return super().get(**kwargs)
+
+
+class SubConfig(Device):
+    gain = Cpt(Signal, value=1.0, kind='config')
+    waveform = Cpt(Signal, value=np.arange(4), kind='config')
+
+
+class ConfigDevice(Device):
+    mode = Cpt(Signal, value='fast', kind='config')
+    serial = Cpt(SignalRO, value=1234, kind='config')
+    data = Cpt(Signal, value=0, kind='normal')
+    sub = Cpt(SubConfig, '', kind='config')
+
+
+class SlowConfigDevice(Device):
+    one = Cpt(SlowSignal, value=1, kind='config')
+    two = Cpt(SlowSignal, value=2, kind='config')
+    three = Cpt(SlowSignal, value=3, kind='config')
+    four = Cpt(SlowSignal, value=4, kind='config')
+
+
+@pytest.fixture(scope='function')
+def devices():
+    return [ConfigDevice(name='dev1'), ConfigDevice(name='dev2')]
+
+
+def test_snapshot_matches_read_configuration(devices):
+    snap = snapshot_configuration(devices)
+    assert snap.device_names == ['dev1', 'dev2']
+    result = snap.to_dict()
+    for device in devices:
+        expected = {
+            key: reading['value']
+            for key, reading in device.read_configuration().items()
+        }
+        assert list(result[device.name]) == list(expected)
+        for key, value in expected.items():
+            assert values_equal(result[device.name][key], value)
+    assert 'dev1_data' not in result['dev1']
+    assert not snap.errors
+
+
+def test_snapshot_is_concurrent():
+    devices = [SlowConfigDevice(name=f'slow{idx}') for idx in range(5)]
+    start = time.monotonic()
+    snap = snapshot_configuration(devices, max_workers=20)
+    elapsed = time.monotonic() - start
+    assert len(snap) == 20
+    # Sequential reads would take 20 * 0.05 = 1 second
+    assert elapsed < 0.5
+
+
+def test_snapshot_timeout():
+    device = SlowConfigDevice(name='slow')
+    device.one.delay = 1.0
+    snap = snapshot_configuration([device], timeout=0.5)
+    assert 'slow_one' in snap.errors
+    assert 'slow_two' in snap.keys
+
+
+@pytest.mark.parametrize('filename', ['snap.json', 'snap.json.gz'])
+def test_snapshot_save_load(devices, tmp_path, filename):
+    snap = snapshot_configuration(devices)
+    path = tmp_path / filename
+    snap.save(path)
+    loaded = ConfigSnapshot.load(path)
+    assert loaded.keys == snap.keys
+    assert loaded.device_names == snap.device_names
+    assert not loaded.diff(snap)
+
+
+def test_snapshot_diff(devices):
+    reference = snapshot_configuration(devices)
+    devices[0].mode.put('slow')
+    devices[1].sub.gain.put(1.0 + 1e-9)
+    differences = reference.diff_live(devices)
+    assert [diff.key for diff in differences] == ['dev1_mode', 'dev2_sub_gain']
+    assert differences[0].old == 'fast'
+    assert differences[0].new == 'slow'
+    assert differences[0].device == 'dev1'
+    assert [diff.key for diff in reference.diff_live(devices, rtol=1e-6)] == [
+        'dev1_mode'
+    ]
+
+    partial = snapshot_configuration(devices[:1])
+    differences = reference.diff(partial)
+    assert all(diff.new == MISSING for diff in differences
+               if diff.device == 'dev2')
+
+
+def test_snapshot_restore(devices):
+    reference = snapshot_configuration(devices)
+    devices[0].mode.put('slow')
+    devices[1].sub.waveform.put(np.zeros(4))
+    devices[1].serial._readback = 0
+    status = reference.restore(devices)
+    status.wait(timeout=1)
+    assert devices[0].mode.get() == 'fast'
+    assert np.array_equal(devices[1].sub.waveform.get(), np.arange(4))
+    # Read-only signals are left alone
+    assert devices[1].serial.get() == 0
+    assert [diff.key for diff in reference.diff_live(devices)] == ['dev2_serial']
@@ -0,0 +1,121 @@
+import pytest
+from ophyd import Component as Cpt
+from ophyd import Device, Signal
+from ophyd.sim import FakeEpicsSignal
+
+from ..connection_profiler import ConnectionProfiler, profile_connections
+from ..signal import MultiDerivedSignalRO
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class Inner(Device):
+    a = Cpt(FakeEpicsSignal, 'A')
+    b = Cpt(FakeEpicsSignal, 'B')
+    total = Cpt(
+        MultiDerivedSignalRO,
+        attrs=['a', 'b'],
+        calculate_on_get=lambda mds, items: sum(items.values()),
+    )
+
+
+class Outer(Device):
+    inner = Cpt(Inner, 'INNER:')
+    fast = Cpt(Signal, value=0)
+
+
+def disconnect(signal):
+    signal._metadata['connected'] = False
+
+
+def reconnect(signal, value):
+    signal._metadata['connected'] = True
+    signal._run_metadata_callbacks()
+    signal.sim_put(value)
+
+
+@pytest.fixture(scope='function')
+def outer():
+    dev = Outer('TST:', name='outer')
+    dev.inner.a.sim_put(1)
+    disconnect(dev.inner.b)
+    yield dev
+    # Unsubscribe from a and b before they are destroyed
+    dev.inner.total.destroy()
+    dev.destroy()
+
+
+def test_profiler_timings(outer):
+    clock = ManualClock()
+    profiler = ConnectionProfiler(outer, clock=clock).start()
+    timings = profiler.timings
+    assert timings[outer.fast].ready == 0
+    # Soft signals without any puts never send a value event
+    assert timings[outer.fast].first_value is None
+    assert timings[outer.inner.a].ready == 0
+    assert timings[outer.inner.b].ready is None
+    assert timings[outer.inner.total].ready is None
+    assert timings[outer.inner.total].pending == [outer.inner.b.name]
+    assert timings[outer.inner.total].path == ('outer', 'inner', 'total')
+    assert not profiler.complete
+
+    clock.now += 1.5
+    reconnect(outer.inner.b, 2)
+    assert profiler.wait(timeout=1)
+    assert timings[outer.inner.b].metadata == 1.5
+    assert timings[outer.inner.b].ready == 1.5
+    assert timings[outer.inner.b].first_value == 1.5
+    assert timings[outer.inner.total].ready == 1.5
+    assert timings[outer.inner.total].pending == []
+    profiler.stop()
+
+    slowest = profiler.slowest()
+    assert {timing.name for timing in slowest[:2]} == {
+        outer.inner.b.name, outer.inner.total.name
+    }
+    assert slowest[-1].ready == 0
+
+
+def test_profiler_report_and_tree(outer):
+    clock = ManualClock()
+    profiler = ConnectionProfiler([outer], clock=clock).start()
+    clock.now += 2.0
+    profiler.poll()
+
+    report = profiler.report(n=2)
+    lines = report.splitlines()
+    # Header, 2 rows and 3 separators
+    assert len(lines) == 6
+    assert outer.inner.b.name in report
+    assert outer.fast.name not in report
+
+    tree = profiler.tree(width=10).splitlines()
+    assert tree[0].startswith('!' * 10)
+    assert 'not ready' in tree[0]
+    assert tree[0].endswith('outer (4 signals)')
+    assert tree[1].endswith('  inner (3 signals)')
+    assert profiler.tree(min_time=1.0).count('\n') == 3
+
+    reconnect(outer.inner.b, 2)
+    profiler.stop()
+    tree = profiler.tree(width=10).splitlines()
+    assert tree[0].startswith('#' * 10)
+    assert '2.000s' in tree[0]
+    # The fast signal takes no time and gets no bar
+    fast_line = [line for line in tree if line.endswith('fast')][0]
+    assert fast_line.startswith(' ' * 10)
+
+
+def test_profile_connections_timeout(outer):
+    profiler = profile_connections(outer, timeout=0.05)
+    assert not profiler.complete
+    assert profiler.timings[outer.inner.b].ready is None
+    # Stopped profilers no longer get updates
+    reconnect(outer.inner.b, 2)
+    assert profiler.timings[outer.inner.b].metadata is None
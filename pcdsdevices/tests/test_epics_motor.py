@@ -633,3 +633,123 @@ def test_limits_setter():
     # Same twice
     mot.limits = (90, 90)
     assert lims() == (0, 0)
+
+
+class FakePmgrObj:
+    """Just enough of pmgr.pmgrobj for the IMS configuration checks."""
+    def __init__(self, live):
+        self.live = live
+        self.fldmap = {
+            'FLD_VELO': {'pv': '.VELO', 'readonly': False, 'enum': []},
+            'FLD_DIR': {'pv': '.DIR', 'readonly': False,
+                        'enum': ['Pos', 'Neg']},
+            'FLD_EGU': {'pv': '.EGU', 'readonly': False, 'enum': []},
+            'FLD_PN': {'pv': '.PN', 'readonly': True, 'enum': []},
+        }
+        self.setflds = [['FLD_VELO', 'FLD_DIR'], ['FLD_EGU', 'FLD_PN']]
+        self.cfgflds = [dict(fld=fld, **info)
+                        for fld, info in self.fldmap.items()]
+        self.cfgs = {
+            10: {'id': 10, 'name': 'slow', 'FLD_VELO': 1.0, 'FLD_DIR': 'Pos',
+                 'FLD_EGU': 'mm', 'FLD_PN': 'PN1'},
+            11: {'id': 11, 'name': 'fast', 'FLD_VELO': 5.0, 'FLD_DIR': 'Pos',
+                 'FLD_EGU': None, 'FLD_PN': 'PN1'},
+        }
+        self.objs = {
+            idx: {'id': idx, 'rec_base': f'TST:MTR:{idx:02}', 'config': 10}
+            for idx in range(20)
+        }
+
+    def getActualConfig(self, idx):
+        base = self.objs[idx]['rec_base']
+        return {fld: self.live[base + info['pv']]
+                for fld, info in self.fldmap.items()}
+
+
+class FakePmgrAPI:
+    def __init__(self, live):
+        self.pm = FakePmgrObj(live)
+        self.updates = 0
+
+    def update_db(self):
+        self.updates += 1
+
+
+@pytest.fixture(scope='function')
+def fake_pmgr(monkeypatch):
+    live = {}
+    for idx in range(20):
+        base = f'TST:MTR:{idx:02}'
+        live.update({base + '.VELO': 1.0, base + '.DIR': 'Pos',
+                     base + '.EGU': 'mm', base + '.PN': 'PN2'})
+    pm = FakePmgrAPI(live)
+    reads = []
+
+    def reader(pvnames, enums):
+        reads.append(list(pvnames))
+        return [live[pvname] for pvname in pvnames]
+
+    monkeypatch.setattr(IMS, '_pm', pm)
+    monkeypatch.setattr(IMS, '_pm_init_error', False)
+    monkeypatch.setattr(IMS, '_pm_cache', None)
+    IMS.get_pmgr_cache().reader = reader
+    pm.reads = reads
+    return pm
+
+
+def test_pmgr_cache_lookup(fake_pmgr):
+    cache = IMS.get_pmgr_cache()
+    assert IMS.get_pmgr_cache() is cache
+    assert cache.get_config_name('TST:MTR:03') == 'slow'
+    assert cache.get_config_values('fast')['FLD_VELO'] == 5.0
+    # Lookups reuse the index until an explicit refresh
+    assert fake_pmgr.updates == 1
+    IMS.refresh_pmgr()
+    assert fake_pmgr.updates == 2
+    with pytest.raises(KeyError):
+        cache.get_object('NOT:A:MOTOR')
+    with pytest.raises(KeyError):
+        cache.get_config('nope')
+
+
+def test_ims_get_current_values(fake_pmgr):
+    motor = fake_motor(IMS, name='mot')
+    # pv defaults to the motor prefix, but can be overridden
+    with pytest.raises(KeyError):
+        motor.get_current_values()
+    fake_pmgr.pm.live['TST:MTR:01.VELO'] = 3.0
+    values = motor.get_current_values(pv='TST:MTR:01', refresh=False)
+    assert values['FLD_VELO'] == 3.0
+    assert fake_pmgr.updates == 1
+
+
+def test_ims_diff_configurations(fake_pmgr):
+    live = fake_pmgr.pm.live
+    motors = [IMS(f'TST:MTR:{idx:02}', name=f'mot{idx}') for idx in range(20)]
+    live['TST:MTR:02.VELO'] = 1.0 + 1e-12
+    live['TST:MTR:04.VELO'] = 2.0
+    live['TST:MTR:05.DIR'] = 'Neg'
+    diffs = IMS.diff_configurations(motors, as_dict=True)
+    # One database refresh and one grouped read for all motors
+    assert fake_pmgr.updates == 1
+    assert len(fake_pmgr.reads) == 1
+    # Read-only fields are never read
+    assert not any(pv.endswith('.PN') for pv in fake_pmgr.reads[0])
+    assert diffs['mot2'] == {}
+    assert diffs['mot4'] == {'FLD_VELO': (2.0, 1.0)}
+    assert diffs['mot5'] == {'FLD_DIR': ('Neg', 'Pos')}
+    assert sum(len(diff) for diff in diffs.values()) == 2
+
+    # Compare against another configuration, where unset fields are skipped
+    diffs = IMS.diff_configurations(motors[4:6], cfgname='fast',
+                                    refresh=False, as_dict=True)
+    assert fake_pmgr.updates == 1
+    assert not any(pv.endswith('.EGU') for pv in fake_pmgr.reads[1])
+    assert diffs['mot4'] == {'FLD_VELO': (2.0, 5.0)}
+    assert diffs['mot5'] == {'FLD_VELO': (1.0, 5.0),
+                             'FLD_DIR': ('Neg', 'Pos')}
+
+    table = IMS.diff_configurations(motors[4:6], cfgname={'mot5': 'fast'})
+    assert table.field_names == ['Motor', 'Parameter', 'Actual',
+                                 'Configuration']
+    assert len(table.rows) == 3
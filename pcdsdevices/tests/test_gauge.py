@@ -1,11 +1,13 @@
 import inspect
 import logging
 
+import numpy as np
 import pytest
 from ophyd.sim import make_fake_device
 
-from ..gauge import (GaugeSet, GaugeSetBase, GaugeSetMks, GaugeSetPirani,
-                     GaugeSetPiraniMks)
+from ..gauge import (GaugePLC, GaugeSet, GaugeSetBase, GaugeSetMks,
+                     GaugeSetPirani, GaugeSetPiraniMks, rank_by_rate_of_rise)
+from ..pump import IonPumpBase
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,37 @@ def test_gauge_pressure(fake_gauge_set):
     assert gs.pressure() == 99
 
 
+def test_gauge_pressure_history(fake_gauge_set):
+    logger.debug('test_gauge_pressure_history')
+    gs = fake_gauge_set
+    history = gs.pressure_history
+    assert history is gs.gcc.pressure_history
+    # Starts with the current reading
+    np.testing.assert_array_equal(history.values(), [99])
+    gs.gcc.pressure.sim_put(100)
+    gs.gcc.pressure.sim_put(101)
+    np.testing.assert_array_equal(history.values(), [99, 100, 101])
+
+
+def test_rank_by_rate_of_rise():
+    logger.debug('test_rank_by_rate_of_rise')
+    leaky = make_fake_device(GaugePLC)('TST:GCC:01', name='leaky')
+    tight = make_fake_device(GaugePLC)('TST:GCC:02', name='tight')
+    pump = make_fake_device(IonPumpBase)('TST:PIP:01', name='pump')
+    new = make_fake_device(GaugePLC)('TST:GCC:03', name='new')
+    devices = [new, tight, pump, leaky]
+    rank_by_rate_of_rise(devices)
+    for second in range(5):
+        timestamp = 100.0 + second
+        leaky.pressure.sim_put(1e-8 * (1 + second), timestamp=timestamp)
+        tight.pressure.sim_put(1e-9 * (1 + second), timestamp=timestamp)
+        pump._pressure.sim_put(1e-7 / (1 + second), timestamp=timestamp)
+    ranking = rank_by_rate_of_rise(devices, seconds=10)
+    assert [device for device, _ in ranking] == [leaky, tight, pump, new]
+    assert ranking[0][1] == pytest.approx(1e-8)
+    assert np.isnan(ranking[-1][1])
+
+
 def test_gauge_factory():
     m = GaugeSet('TST:MY', name='test_gauge', index='99')
     assert isinstance(m, GaugeSetPirani)
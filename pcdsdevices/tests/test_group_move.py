@@ -0,0 +1,171 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from lightpath import LightpathState
+from ophyd.status import Status
+
+from ..group_move import (DONE, FAILED, MOVING, SKIPPED, WAITING,
+                          GroupMoveError, insert_all, remove_all)
+
+logger = logging.getLogger(__name__)
+
+
+class FakeInOut:
+    """Stand-in for an in/out device with a monitored lightpath state."""
+
+    def __init__(self, name, z=None, removed=None, monitored=True):
+        self.name = name
+        if z is not None:
+            self.md = SimpleNamespace(z=z)
+        if removed is None:
+            self.state = None
+        else:
+            self.state = LightpathState(
+                inserted=not removed, removed=removed, output={}
+            )
+        self.monitored = monitored
+        self.calls = []
+        self.statuses = []
+        self.fail_start = False
+
+    def get_monitored_lightpath_state(self):
+        return self.state if self.monitored else None
+
+    def _move(self, action, timeout):
+        self.calls.append((action, timeout))
+        if self.fail_start:
+            raise RuntimeError('no connection')
+        status = Status(obj=self)
+        self.statuses.append(status)
+        return status
+
+    def insert(self, timeout=None):
+        return self._move('insert', timeout)
+
+    def remove(self, timeout=None):
+        return self._move('remove', timeout)
+
+    def finish(self, success=True):
+        if success:
+            self.statuses[-1].set_finished()
+        else:
+            self.statuses[-1].set_exception(RuntimeError('stuck'))
+
+
+def test_remove_all_concurrent_and_skip():
+    logger.debug('test_remove_all_concurrent_and_skip')
+    yag = FakeInOut('yag', removed=False)
+    ipm = FakeInOut('ipm')
+    out = FakeInOut('out', removed=True)
+    status = remove_all([yag, ipm, out], move_timeout=3)
+    # All moves are started at once, already removed devices are skipped
+    assert yag.calls == [('remove', 3)]
+    assert ipm.calls == [('remove', 3)]
+    assert out.calls == []
+    assert status.progress == {'yag': MOVING, 'ipm': MOVING, 'out': SKIPPED}
+    yag.finish()
+    assert status.progress['yag'] == DONE
+    assert status.fraction == pytest.approx(2 / 3)
+    assert not status.done
+    ipm.finish()
+    status.wait(timeout=1)
+    assert status.success
+
+
+def test_remove_all_unmonitored_state():
+    logger.debug('test_remove_all_unmonitored_state')
+    # A cached "removed" that monitors do not keep up to date may be stale
+    stale = FakeInOut('stale', removed=True, monitored=False)
+    status = remove_all([stale])
+    assert stale.calls == [('remove', None)]
+    assert status.progress == {'stale': MOVING}
+    stale.finish()
+    status.wait(timeout=1)
+    assert status.success
+
+
+def test_group_move_start_failure_tracks_started():
+    logger.debug('test_group_move_start_failure_tracks_started')
+    first = FakeInOut('first')
+    broken = FakeInOut('broken')
+    broken.fail_start = True
+    last = FakeInOut('last')
+    status = remove_all([first, broken, last])
+    with pytest.raises(GroupMoveError):
+        status.wait(timeout=1)
+    assert last.calls == []
+    assert status.progress == {'first': MOVING, 'broken': FAILED,
+                               'last': WAITING}
+    # The move that did start is still followed
+    first.finish()
+    assert status.progress['first'] == DONE
+
+
+def test_group_move_instant_moves():
+    logger.debug('test_group_move_instant_moves')
+    devices = [FakeInOut(f'dev{i}') for i in range(3)]
+    for dev in devices:
+        orig_move = dev._move
+
+        def move(action, timeout, orig_move=orig_move):
+            status = orig_move(action, timeout)
+            status.set_finished()
+            return status
+        dev._move = move
+    status = remove_all(devices, order=[devices[:2], devices[2:]])
+    status.wait(timeout=1)
+    assert status.success
+    assert all(dev.calls == [('remove', None)] for dev in devices)
+    assert set(status.progress.values()) == {DONE}
+
+
+def test_insert_all_upstream_order():
+    logger.debug('test_insert_all_upstream_order')
+    first = FakeInOut('first', z=10)
+    second_a = FakeInOut('second_a', z=20, removed=True)
+    second_b = FakeInOut('second_b', z=20, removed=True)
+    no_z = FakeInOut('no_z')
+    status = insert_all([no_z, second_b, first, second_a], order='upstream')
+    assert status.stages == [[first], [second_b, second_a], [no_z]]
+    assert status.progress == {'first': MOVING, 'second_b': WAITING,
+                               'second_a': WAITING, 'no_z': WAITING}
+    first.finish()
+    assert second_a.calls and second_b.calls and not no_z.calls
+    second_a.finish()
+    assert not no_z.calls
+    second_b.finish()
+    no_z.finish()
+    status.wait(timeout=1)
+    assert status.success
+
+    status = insert_all([first, second_a], order='downstream')
+    assert status.stages == [[second_a], [first]]
+
+
+def test_group_move_failure_stops_later_stages():
+    logger.debug('test_group_move_failure_stops_later_stages')
+    first = FakeInOut('first')
+    second = FakeInOut('second')
+    status = remove_all([first, second], order=[[first], [second]])
+    first.finish(success=False)
+    with pytest.raises(GroupMoveError):
+        status.wait(timeout=1)
+    assert status.progress == {'first': FAILED, 'second': WAITING}
+    assert second.calls == []
+
+
+def test_group_move_bad_order():
+    logger.debug('test_group_move_bad_order')
+    dev = FakeInOut('dev')
+    with pytest.raises(ValueError):
+        remove_all([dev], order='sideways')
+    with pytest.raises(ValueError):
+        remove_all([dev], order=[[dev], [dev]])
+
+
+def test_group_move_nothing_to_do():
+    logger.debug('test_group_move_nothing_to_do')
+    status = remove_all([FakeInOut('out', removed=True)], wait=True)
+    assert status.done and status.success
+    assert remove_all([]).success
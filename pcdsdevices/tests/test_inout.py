@@ -1,6 +1,7 @@
 import logging
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 from ophyd.sim import make_fake_device
 
@@ -39,6 +40,24 @@ def test_inout_trans(fake_inout):
     assert inout.transmission == 1
 
 
+def test_inout_transmission_table():
+    logger.debug('test_inout_transmission_table')
+
+    class Foil(InOutRecordPositioner):
+        _transmission = {'IN': 0.5}
+        _transmission_energy = {'IN': ([1000, 2000], [0.2, 0.6])}
+
+    foil = make_fake_device(Foil)('Test:Foil', name='foil')
+    foil.state.sim_put(0)
+    foil.state.sim_set_enum_strs(('Unknown', 'IN', 'OUT'))
+    np.testing.assert_allclose(foil.transmission_table(), [np.nan, 0.5, 1])
+    np.testing.assert_allclose(foil.transmission_table(energy=[1500, 3000]),
+                               [[np.nan, 0.4, 1], [np.nan, 0.6, 1]])
+    assert foil.check_transmission('IN') == 0.5
+    assert foil.check_transmission('IN', energy=1500) == pytest.approx(0.4)
+    assert foil.check_transmission('OUT', energy=1500) == 1
+
+
 def test_inout_motion(fake_inout):
     logger.debug('test_inout_motion')
     inout = fake_inout
@@ -6,10 +6,13 @@ import time
 
 import ophyd
 import pytest
+from lightpath import LightpathState
+from ophyd import Component as Cpt
+from ophyd import Signal
 
-from ..interface import (BaseInterface, TabCompletionHelperClass,
-                         get_engineering_mode, set_engineering_mode,
-                         setup_preset_paths)
+from ..interface import (BaseInterface, LightpathMixin,
+                         TabCompletionHelperClass, get_engineering_mode,
+                         set_engineering_mode, setup_preset_paths)
 from ..sim import FastMotor, SlowMotor
 from . import conftest
 
@@ -341,3 +344,128 @@ def test_tab_helper_class():
     tab.add('foobar')
     tab.reset()
     assert 'foobar' not in tab.get_filtered_dir_list()
+
+
+def test_tab_helper_copy_on_write():
+    class MyDevice(BaseInterface, ophyd.Device):
+        tab_whitelist = ['a']
+        a = 1
+        foobar = 2
+
+    one = MyDevice(name='one')
+    two = MyDevice(name='two')
+
+    # Instances share the class includes until customized
+    assert not one._tab.customized
+    assert one._tab._includes is MyDevice._class_tab._includes
+    assert two._tab._includes is MyDevice._class_tab._includes
+
+    one._tab.add('foobar')
+    assert one._tab.customized
+    assert one._tab._includes is not MyDevice._class_tab._includes
+    assert 'foobar' in one._tab.get_filtered_dir_list()
+    assert 'foobar' not in two._tab.get_filtered_dir_list()
+    assert 'foobar' not in MyDevice._class_tab._includes
+
+    one._tab.reset()
+    assert not one._tab.customized
+    assert 'foobar' not in one._tab.get_filtered_dir_list()
+
+
+def test_tab_helper_dir_cache():
+    class MyDevice(BaseInterface, ophyd.Device):
+        tab_whitelist = ['a']
+        a = 1
+        foobar = 2
+
+    instance = MyDevice(name='instance')
+    class_tab = MyDevice._class_tab
+
+    filtered = class_tab.get_class_dir(filtered=True)
+    assert 'a' in filtered
+    assert class_tab.get_class_dir(filtered=True) is filtered
+    assert class_tab.get_class_dir(filtered=False) is not filtered
+
+    # Changing the class includes invalidates the cache
+    class_tab.add('foobar')
+    assert 'foobar' in class_tab.get_class_dir(filtered=True)
+    assert 'foobar' in instance._tab.get_filtered_dir_list()
+    class_tab.remove('foobar')
+    assert 'foobar' not in instance._tab.get_filtered_dir_list()
+
+    # Attributes set on the instance itself are still found
+    instance.a_instance = 3
+    class_tab.add('a_instance')
+    assert 'a_instance' in instance._tab.get_filtered_dir_list()
+    class_tab.reset()
+
+    set_engineering_mode(True)
+    assert sorted(dir(instance)) == sorted(object.__dir__(instance))
+    set_engineering_mode(False)
+    try:
+        assert 'a' in dir(instance)
+        assert 'foobar' not in dir(instance)
+    finally:
+        set_engineering_mode(True)
+
+
+class LightpathDevice(LightpathMixin):
+    lightpath_cpts = ['pos']
+    pos = Cpt(Signal, value=0)
+
+    def calc_lightpath_state(self, pos=None):
+        return LightpathState(
+            inserted=pos > 5,
+            removed=pos <= 5,
+            output={self.output_branches[0]: 0.5 if pos > 5 else 1.0},
+        )
+
+
+def test_lightpath_change_events():
+    logger.debug('test_lightpath_change_events')
+    dev = LightpathDevice(name='dev', input_branches=['L0'],
+                          output_branches=['L0'])
+    events = []
+
+    def cb(old_state, new_state, **kwargs):
+        events.append((old_state, new_state))
+
+    dev.subscribe(cb, event_type=dev.SUB_LIGHTPATH, run=False)
+    assert dev.get_lightpath_state().removed
+    assert len(events) == 1
+    assert events[0][0] is None
+
+    # Recomputes that do not change the state do not emit events
+    for pos in (1, 2, 3):
+        dev.pos.put(pos)
+    assert len(events) == 1
+    dev.pos.put(10)
+    assert len(events) == 2
+    old, new = events[-1]
+    assert old.removed and new.inserted
+    assert new.output == {'L0': 0.5}
+    dev.pos.put(11)
+    assert len(events) == 2
+    assert dev.lightpath_stats == {'recomputes': 6, 'changes': 2}
+
+    # New subscribers get the latest change
+    late = []
+    dev.subscribe(lambda new_state, **kwargs: late.append(new_state),
+                  event_type=dev.SUB_LIGHTPATH)
+    assert late == [new]
+
+
+def test_monitored_lightpath_state():
+    logger.debug('test_monitored_lightpath_state')
+    # Without branches nothing keeps the cache up to date
+    dev = LightpathDevice(name='dev')
+    dev._cached_state = LightpathState(inserted=False, removed=True,
+                                       output={'L0': 1.0})
+    dev.pos.put(10)
+    assert dev.get_monitored_lightpath_state() is None
+
+    dev = LightpathDevice(name='dev', input_branches=['L0'],
+                          output_branches=['L0'])
+    dev.get_lightpath_state()
+    dev.pos.put(10)
+    assert dev.get_monitored_lightpath_state().inserted
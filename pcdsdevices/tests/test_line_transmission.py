@@ -0,0 +1,118 @@
+import logging
+import math
+
+import numpy as np
+import pytest
+from lightpath import LightpathState
+from ophyd.device import Component as Cpt
+from ophyd.signal import Signal
+from ophyd.sim import make_fake_device
+
+from ..inout import InOutRecordPositioner
+from ..interface import LightpathMixin
+from ..ipm import IPMMotion, IPMTarget
+from ..line_transmission import LineTransmission
+
+logger = logging.getLogger(__name__)
+
+
+class Foil(InOutRecordPositioner):
+    _transmission = {'IN': 0.5}
+    _transmission_energy = {'IN': ([1000, 2000], [0.2, 0.6])}
+
+
+class Blocker(LightpathMixin):
+    lightpath_cpts = ['blocking']
+    blocking = Cpt(Signal, value=False)
+
+    def calc_lightpath_state(self, blocking):
+        return LightpathState(
+            inserted=bool(blocking), removed=not blocking,
+            output={self.output_branches[0]: 0.0 if blocking else 1.0}
+        )
+
+
+@pytest.fixture(scope='function')
+def line():
+    ipm = make_fake_device(IPMMotion)('Test:IPM', name='ipm')
+    ipm.diode.state.state.sim_put(0)
+    ipm.diode.state.state.sim_set_enum_strs(
+        ['Unknown'] + InOutRecordPositioner.states_list
+    )
+    ipm.target.state.sim_put(0)
+    ipm.target.state.sim_set_enum_strs(['Unknown'] + IPMTarget.states_list)
+    foil = make_fake_device(Foil)('Test:Foil', name='foil')
+    foil.state.sim_put(0)
+    foil.state.sim_set_enum_strs(('Unknown', 'IN', 'OUT'))
+    blocker = Blocker('Test:Block', name='blocker', input_branches=['L0'],
+                      output_branches=['L0'])
+    blocker.blocking.put(False)
+    line = LineTransmission([ipm, foil, blocker])
+    yield line
+    line.destroy()
+
+
+def test_line_transmission(line):
+    logger.debug('test_line_transmission')
+    ipm, foil, blocker = line.devices
+    # Everything starts in an unknown state
+    assert math.isnan(line.transmission())
+    ipm.target.state.put('TARGET2')
+    ipm.diode.state.state.put('OUT')
+    foil.state.put('OUT')
+    np.testing.assert_allclose(line.device_transmissions(), [0.8, 1, 1])
+    assert line.transmission() == pytest.approx(0.8)
+    assert line.transmission() == pytest.approx(
+        ipm.transmission * foil.transmission
+    )
+    foil.state.put('IN')
+    assert line.transmission() == pytest.approx(0.4)
+    np.testing.assert_allclose(line.transmission(energy=[1000, 1500, 2000]),
+                               [0.16, 0.32, 0.48])
+    assert line.device_transmissions(energy=[1500]).shape == (1, 3)
+    blocker.blocking.put(True)
+    assert line.transmission() == 0
+    line.destroy()
+    blocker.blocking.put(False)
+    assert line.transmission() == 0
+
+
+def test_line_transmission_bad_device():
+    logger.debug('test_line_transmission_bad_device')
+    with pytest.raises(TypeError):
+        LineTransmission([Signal(name='sig')])
+    # Without branches nothing keeps the lightpath state up to date
+    with pytest.raises(TypeError):
+        LineTransmission([Blocker('Test:Block', name='blocker')])
+    assert LineTransmission([]).transmission() == 1
+
+
+def test_line_transmission_late_connection(monkeypatch):
+    logger.debug('test_line_transmission_late_connection')
+    foil = make_fake_device(Foil)('Test:Foil', name='foil')
+    foil.state.sim_put(0)
+    table = foil.transmission_table()
+    calls = []
+
+    def transmission_table():
+        # The state enum is not known until the positioner connects
+        calls.append(foil.state.enum_strs)
+        if foil.state.enum_strs is None:
+            raise AttributeError('_trans_table')
+        return table
+
+    monkeypatch.setattr(foil, 'transmission_table', transmission_table)
+    line = LineTransmission([foil])
+    n_calls = len(calls)
+    for _ in range(3):
+        assert math.isnan(line.transmission())
+    # Queries do not retry the table
+    assert len(calls) == n_calls
+    foil.state.sim_set_enum_strs(('Unknown', 'IN', 'OUT'))
+    foil.state.sim_put(1)
+    assert line.transmission() == pytest.approx(0.5)
+    n_calls = len(calls)
+    foil.state.sim_put(2)
+    assert line.transmission() == 1
+    assert len(calls) == n_calls
+    line.destroy()
@@ -5,10 +5,11 @@ import numpy as np
 import pytest
 from ophyd.sim import make_fake_device
 
-from ..epics_motor import OffsetMotor
-from ..lodcm import (CHI1, CHI2, H1N, H2N, LODCM, Y1, Y2, Dectris, Diode, Foil,
-                     LODCMEnergyC, LODCMEnergySi, SimFirstTower, SimLODCM,
-                     SimSecondTower, YagLom)
+from ..epics_motor import IMS, OffsetMotor
+from ..lodcm import (CHI1, CHI2, H1N, H2N, LODCM, Y1, Y2, CrystalTower1,
+                     Dectris, Diode, Foil, LODCMEnergyC, LODCMEnergySi,
+                     SimFirstTower, SimLODCM, SimSecondTower, YagLom)
+from ..utils import get_deferred_components
 
 logger = logging.getLogger(__name__)
 
@@ -295,6 +296,17 @@ def test_set_energy(fake_lodcm, monkeypatch):
     assert np.isclose(lom.z2Si.wm(), 713.4828146545175)
 
 
+def test_lodcm_lazy_ims():
+    # Only the LODCM motors defer their config and omitted signals
+    assert not any(cpt.lazy for cpt in IMS._sig_attrs.values())
+    assert IMS.lazy_wait_for_connection
+    tower1 = make_fake_device(CrystalTower1)('FAKE:TOWER1', name='fake_t1')
+    motor = tower1.z1
+    assert isinstance(motor, IMS)
+    assert get_deferred_components(motor)
+    assert not type(motor).lazy_wait_for_connection
+
+
 def test_tower1_crystal_type(fake_tower1):
     tower1 = fake_tower1
     # tower1 si: y1_state = Si, chi1_state = Si, h1n = Si or Out
@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+
+from ..epics_motor import IMS
+from ..inout import Reflaser
+from ..lasers.qmini import QminiSpectrometer
+from ..make_soft_ioc import (collect_pv_specs, format_specs, main,
+                             make_devices, make_pvdb)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope='function')
+def specs():
+    devices = [
+        IMS('TST:MTR:01', name='motor'),
+        QminiSpectrometer('TST:QMINI', name='qmini'),
+        Reflaser('TST:RFL', name='reflaser'),
+    ]
+    return collect_pv_specs(devices)
+
+
+def test_collect_pv_specs(specs):
+    # Motor record fields
+    assert specs['TST:MTR:01.RBV'].dtype == 'float'
+    assert specs['TST:MTR:01.RBV'].dynamic
+    assert not specs['TST:MTR:01.VAL'].dynamic
+    assert specs['TST:MTR:01.DMOV'].value == 1
+    assert specs['TST:MTR:01.EGU'].dtype == 'string'
+    assert specs['TST:MTR:01.SPG'].enum_strings == ('Stop', 'Pause', 'Go')
+    # Variety metadata and waveforms
+    assert specs['TST:QMINI:START_EXPOSURE.PROC'].dtype == 'int'
+    assert specs['TST:QMINI:SPECTRUM'].dtype == 'float_array'
+    assert len(specs['TST:QMINI:SPECTRUM'].value) == 1024
+    # State positioners use their states
+    assert specs['TST:RFL'].dtype == 'enum'
+    assert 'IN' in specs['TST:RFL'].enum_strings
+    # Both read and write PVs are included
+    assert 'TST:QMINI:SET_EXPOSURE_TIME' in specs
+    assert 'TST:QMINI:GET_EXPOSURE_TIME' in specs
+    assert 'TST:MTR:01.RBV float (dynamic)' in format_specs(specs)
+
+
+def test_make_devices():
+    devices = make_devices(['pcdsdevices.epics_motor.IMS=TST:MTR:02'])
+    assert isinstance(devices[0], IMS)
+    assert devices[0].prefix == 'TST:MTR:02'
+    with pytest.raises(ValueError):
+        make_devices(['pcdsdevices.epics_motor.IMS'])
+
+
+def test_main_list(capsys):
+    specs = main(['pcdsdevices.epics_motor.IMS=TST:MTR:03', '--list'])
+    assert 'TST:MTR:03.RBV' in specs
+    assert 'TST:MTR:03.RBV' in capsys.readouterr().out
+
+
+def test_make_pvdb(specs):
+    caproto = pytest.importorskip('caproto')
+    pvdb = make_pvdb(specs)
+    assert set(pvdb) == set(specs)
+    assert isinstance(pvdb['TST:RFL'], caproto.ChannelEnum)
+    assert isinstance(pvdb['TST:MTR:01.EGU'], caproto.ChannelString)
+    assert pvdb['TST:MTR:01.DMOV'].value == 1
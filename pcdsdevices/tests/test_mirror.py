@@ -6,8 +6,10 @@ from ophyd.sim import ReadOnlyError, make_fake_device
 
 from pcdsdevices import mirror
 
-from ..mirror import (KBOMirror, OffsetMirror, PointingMirror,
-                      XOffsetMirrorStateCool, XOffsetMirrorXYState)
+from ..mirror import (KBOMirror, MirrorLogicError, OffsetMirror,
+                      PointingMirror, RangeClassifier, XOffsetMirror,
+                      XOffsetMirrorBend, XOffsetMirrorStateCool,
+                      XOffsetMirrorXYState)
 
 
 @pytest.fixture(scope='function')
@@ -216,3 +218,116 @@ def test_xy_mirror_lightpath(fake_xy_offset_mirror, monkeypatch):
     xym.get_lightpath_state(use_cache=False)
     assert mock_schedule.call_count == 2
     assert xym._retry_lightpath is False
+
+
+def test_range_classifier():
+    classifier = RangeClassifier([[10, 20], [-5, 5], [30, 40]])
+    assert classifier._disjoint
+    assert classifier.matches(0) == (1, )
+    assert classifier.matches(15) == (0, )
+    assert classifier.matches(35) == (2, )
+    # limits are exclusive
+    assert classifier.matches(10) == ()
+    assert classifier.matches(25) == ()
+    assert classifier.matches(-10) == ()
+
+    overlapping = RangeClassifier([[0, 10], [5, 15]])
+    assert not overlapping._disjoint
+    assert overlapping.matches(7) == (0, 1)
+    assert overlapping.matches(12) == (1, )
+
+    with pytest.raises(MirrorLogicError):
+        RangeClassifier([1, 2])
+    with pytest.raises(MirrorLogicError):
+        RangeClassifier([[0, 1], [2]])
+
+
+def test_range_classifier_hysteresis():
+    classifier = RangeClassifier([[0, 10], [10, 20]], hysteresis=1)
+    assert classifier.matches(9.5) == (0, )
+    # Still in the band around the first range
+    assert classifier.matches(10.5) == (0, )
+    assert classifier.matches(10) == (0, )
+    assert classifier.matches(11.5) == (1, )
+    assert classifier.matches(9.5) == (1, )
+    # Leaving the band with no match forgets the last range
+    assert classifier.matches(25) == ()
+    assert classifier.matches(19.5) == (1, )
+    classifier.reset()
+    assert classifier.matches(-0.5) == ()
+
+
+@pytest.fixture(scope='function')
+def fake_ranged_mirror():
+    FakeMirror = make_fake_device(XOffsetMirror)
+    mirror = FakeMirror(
+        'TST:MR1', name='ranged_mirror',
+        x_ranges=[[-100, -50], [-10, 10]],
+        y_ranges=[[-5, 5], [15, 25]],
+        pitch_ranges=[
+            [[0, 1], [1, 2]],
+            [[500, 600], [600, 700]],
+            [[400, 450], [450, 500]],
+        ],
+        range_hysteresis={'pitch': 5},
+    )
+    mirror.output_branches = ['L0', 'L1', 'L2']
+    mirror.input_branches = ['L0']
+    return mirror
+
+
+def test_xoffset_mirror_ranges(fake_ranged_mirror):
+    mirror = fake_ranged_mirror
+    state = mirror.calc_lightpath_state(-75, 0, 550)
+    assert state.removed and not state.inserted
+    assert state.output == {'L0': 1}
+
+    # y=0 is the first coating, which uses the second set of pitch ranges
+    state = mirror.calc_lightpath_state(0, 0, 550)
+    assert state.inserted and not state.removed
+    assert state.output == {'L1': 1}
+    # Flapping around the destination edge does not change the state
+    assert mirror.calc_lightpath_state(0, 0, 602).output == {'L1': 1}
+    assert mirror.calc_lightpath_state(0, 0, 598).output == {'L1': 1}
+    assert mirror.calc_lightpath_state(0, 0, 606).output == {'L2': 1}
+
+    state = mirror.calc_lightpath_state(0, 20, 470)
+    assert state.output == {'L2': 1}
+
+    # Unknown coating blocks the beam
+    state = mirror.calc_lightpath_state(0, 10, 550)
+    assert not state.inserted and not state.removed
+    assert state.output == {'L0': 0}
+
+
+def test_xoffset_mirror_malformed_ranges(fake_ranged_mirror):
+    mirror = fake_ranged_mirror
+    # Malformed ranges are reported by blocking the beam, not at init
+    mirror.x_ranges = [[-100, -50]]
+    state = mirror.calc_lightpath_state(0, 0, 550)
+    assert state.output == {'L0': 0}
+    mirror.x_ranges = [[-100, -50], [-10, 10]]
+    mirror.pitch_ranges = [[], [1, 2]]
+    state = mirror.calc_lightpath_state(0, 0, 550)
+    assert state.output == {'L0': 0}
+    # Always-in mirrors
+    mirror.x_ranges = []
+    mirror.y_ranges = []
+    mirror.pitch_ranges = []
+    state = mirror.calc_lightpath_state(-75, 100, 0)
+    assert state.inserted
+    assert state.output == {'L0': 1}
+
+
+def test_xoffset_mirror_bend_ranges():
+    FakeMirror = make_fake_device(XOffsetMirrorBend)
+    mirror = FakeMirror('TST:MR1', name='bend_mirror',
+                        y_ranges=[[-100, -50], [-10, 10]])
+    mirror.output_branches = ['K0', 'K1']
+    mirror.input_branches = ['K0']
+    assert mirror.calc_lightpath_state(0, 0, 0).output == {'K1': 1}
+    state = mirror.calc_lightpath_state(0, -75, 0)
+    assert state.removed
+    assert state.output == {'K0': 1}
+    mirror.y_ranges = [[-100, -50]]
+    assert mirror.calc_lightpath_state(0, 0, 0).output == {'K0': 0}
@@ -4,7 +4,9 @@ import pytest
 from ophyd.sim import make_fake_device
 
 from ..device_types import MPODApalisModule4Channel
-from ..mpod_apalis import MPODApalisChannel, MPODApalisCrate
+from ..mpod import bulk_set, set_voltages
+from ..mpod_apalis import (MPODApalisChannel, MPODApalisCrate,
+                           MPODApalisModule8Channel, set_ramp_speeds)
 
 logger = logging.getLogger(__name__)
 
@@ -110,10 +112,119 @@ def test_power_cycle(fake_mpod_crate):
         power_values.append(value)
 
     fake_mpod_crate.power.subscribe(accumulate_values)
-    fake_mpod_crate.power_cycle()
+    status = fake_mpod_crate.power_cycle(delay=0.1)
+    # Returns right away, with the crate off
+    assert not status.done
+    assert power_values == [1, 0]
+    status.wait(timeout=5)
     assert power_values == [1, 0, 1]
 
 
+@pytest.fixture(scope='function')
+def fake_mpod_module8Channel():
+    FakeMPODmodule = make_fake_device(MPODApalisModule8Channel)
+    module = FakeMPODmodule('TEST:MPOD:MOD:8', name='TestM8')
+    for channel in module.channels:
+        channel.voltage.sim_put(0)
+        channel.current.sim_put(0)
+        channel.max_voltage.sim_put(100)
+        channel.max_current.sim_put(0.1)
+    return module
+
+
+def test_module_set_voltages(fake_mpod_module8Channel):
+    logger.debug('Testing MPOD Module bulk voltage setting')
+    module = fake_mpod_module8Channel
+    assert len(module.channels) == 8
+    assert module.channels[3] is module.c3
+    status = module.set_voltages([10, 20, 30, 40, 50, 60, 70, 80],
+                                 timeout=5)
+    status.wait(timeout=5)
+    assert [channel.voltage.get() for channel in module.channels] == [
+        10, 20, 30, 40, 50, 60, 70, 80
+    ]
+    # Over the limit is clipped to the limit
+    module.set_currents(0.5).wait(timeout=5)
+    assert module.c7.current.get() == 0.1
+    with pytest.raises(ValueError):
+        module.set_voltages([1, 2, 3])
+
+
+def test_bulk_set_waits_for_readbacks(fake_mpod_module8Channel):
+    logger.debug('Testing MPOD bulk setting waits for all readbacks')
+    module = fake_mpod_module8Channel
+    # Setpoint puts that do not move the readback, like a ramping channel
+    for channel in module.channels:
+        channel.voltage.sim_set_putter(lambda value: None)
+    status = set_voltages([module.c0, module.c1], 50, tolerance=1)
+    assert not status.done
+    module.c0.voltage.sim_put(49.5)
+    assert not status.done
+    module.c1.voltage.sim_put(50.5)
+    status.wait(timeout=5)
+    assert status.success
+
+
+def test_bulk_set_limits_per_module(fake_mpod_module8Channel,
+                                    fake_mpod_module4Channel):
+    logger.debug('Testing MPOD bulk setting reads limits once per module')
+    module8 = fake_mpod_module8Channel
+    module4 = fake_mpod_module4Channel
+    for channel in module4.channels:
+        channel.voltage.sim_put(0)
+        channel.max_voltage.sim_put(10)
+    reads = []
+
+    def reader(signals):
+        reads.append([signal.name for signal in signals])
+        return [signal.get() for signal in signals]
+
+    status = bulk_set([module8, module4], 20, 'voltage', 'max_voltage',
+                      limit_reader=reader)
+    status.wait(timeout=5)
+    assert len(reads) == 2
+    assert sorted(len(names) for names in reads) == [4, 8]
+    assert module8.c0.voltage.get() == 20
+    assert module4.c0.voltage.get() == 10
+
+
+def test_bulk_set_collects_errors(fake_mpod_module8Channel):
+    logger.debug('Testing MPOD bulk setting puts all channels')
+    module = fake_mpod_module8Channel
+
+    def broken(value):
+        raise RuntimeError('put failed')
+
+    module.c2.voltage.sim_set_putter(broken)
+
+    def reader(signals):
+        values = [signal.get() for signal in signals]
+        values[5] = None
+        return values
+
+    status = bulk_set([module], 50, 'voltage', 'max_voltage',
+                      limit_reader=reader)
+    with pytest.raises(RuntimeError) as exc_info:
+        status.wait(timeout=5)
+    assert module.c2.name in str(exc_info.value)
+    assert module.c5.name in str(exc_info.value)
+    # Every other channel was still set
+    for idx, channel in enumerate(module.channels):
+        if idx not in (2, 5):
+            assert channel.voltage.get() == 50
+    assert module.c5.voltage.get() == 0
+
+
+def test_set_ramp_speeds(fake_mpod_module4Channel):
+    logger.debug('Testing MPOD Module bulk ramp speeds')
+    module = fake_mpod_module4Channel
+    set_ramp_speeds([module], voltage=20, current=[30]).wait(timeout=5)
+    assert module.voltage_ramp_speed.get() == 20
+    assert module.current_ramp_speed.get() == 30
+    with pytest.raises(ValueError):
+        set_ramp_speeds([module], voltage=[1, 2])
+
+
 @pytest.mark.timeout(5)
 def test_mpod_module_disconnected():
     logger.debug('test_mpod_module_disconnected')
@@ -7,7 +7,8 @@ from ophyd import Device
 from ophyd.sim import make_fake_device
 
 from .. import mps as mps_module
-from ..mps import MPS, MPSLimits, mps_factory, must_be_known, must_be_out
+from ..mps import (MPS, MPSAggregator, MPSLimits, mps_factory, must_be_known,
+                   must_be_out)
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +87,11 @@ def test_mps_factory(fake_mps):
     assert d.mps.prefix == 'Tst:Mps:Prefix'
     # Check our original device constructor still worked
     assert d.name == 'Tst'
+    # The class is reused, the prefix is per instance
+    other = MPSDevice('Tst:Other', name='Other', mps_prefix='Tst:Mps:Other')
+    assert type(other) is type(d)
+    assert other.mps.prefix == 'Tst:Mps:Other'
+    assert d.mps.prefix == 'Tst:Mps:Prefix'
 
 
 def test_mpslimit_faults(fake_mps_limits):
@@ -109,6 +115,59 @@ def test_mpslimit_subscriptions(fake_mps_limits):
     assert cb.called
 
 
+def test_mps_aggregator(fake_mps, fake_mps_limits):
+    fake_mps.fault.sim_put(0)
+    fake_mps.bypass.sim_put(0)
+    aggregator = MPSAggregator([fake_mps])
+    assert aggregator.register(fake_mps_limits) == 1
+    assert aggregator.register(fake_mps) == 0
+    assert len(aggregator) == 2
+    assert not aggregator.any_tripped
+    assert not aggregator.unknown_bits
+
+    events = []
+    aggregator.subscribe(lambda changes, **kwargs: events.append(changes))
+
+    fake_mps.fault.sim_put(1)
+    assert aggregator.is_faulted(fake_mps)
+    assert aggregator.is_tripped(fake_mps)
+    assert aggregator.tripped == [fake_mps]
+    assert aggregator.tripped_bits == 0b01
+    (change,) = events[-1]
+    assert change.device is fake_mps
+    assert change.flipped == ('faulted', 'tripped')
+
+    fake_mps.bypass.sim_put(1)
+    assert aggregator.is_bypassed(fake_mps)
+    assert not aggregator.any_tripped
+    assert events[-1][0].flipped == ('bypassed', 'tripped')
+
+    # MPSLimits bits are combined with their logic
+    fake_mps_limits.in_limit.fault.sim_put(1)
+    assert aggregator.tripped == [fake_mps_limits]
+    n_events = len(events)
+    fake_mps_limits.out_limit.fault.sim_put(1)
+    assert len(events) == n_events
+
+    aggregator.unregister(fake_mps_limits)
+    assert not aggregator.any_tripped
+    fake_mps_limits.in_limit.fault.sim_put(0)
+    assert len(events) == n_events
+
+
+def test_mps_aggregator_register_all(fake_mps_limits):
+    aggregator = MPSAggregator()
+    aggregator.register_all()
+    tracked = aggregator.devices_from_bits(
+        (1 << len(aggregator)) - 1)
+    assert fake_mps_limits in tracked
+    assert fake_mps_limits.in_limit not in tracked
+    assert fake_mps_limits.out_limit not in tracked
+    # Sitting at one limit is fine for this logic
+    fake_mps_limits.out_limit.fault.sim_put(1)
+    assert not aggregator.is_faulted(fake_mps_limits)
+
+
 @pytest.mark.timeout(5)
 def test_mps_disconnected():
     MPS("TST:MPS", name='MPS Bit')
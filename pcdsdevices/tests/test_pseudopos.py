@@ -130,6 +130,36 @@ def test_sync_axis_crazy():
         sync.move(20)
 
 
+def test_readback_throttle():
+    logger.debug('test_readback_throttle')
+    sync = SyncAxisDefault('THROTTLE', name='sync_throttle',
+                           readback_max_rate=5)
+    sync.move(1, wait=True)
+    start = dict(sync.update_stats)
+    for pos in range(10):
+        sync.one.set_current_position(pos)
+    # At most one immediate update, the rest are merged into one pending
+    assert sync.update_stats['readback_updates'] - start['readback_updates'] <= 1
+    assert sync.update_stats['readback_merged'] - start['readback_merged'] >= 8
+    # The last value wins
+    deadline = time.monotonic() + 2
+    while sync._position.sync != 9 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert sync._position.sync == 9
+    assert sync.update_stats['readback_updates'] - start['readback_updates'] <= 2
+
+
+def test_readback_unthrottled():
+    logger.debug('test_readback_unthrottled')
+    sync = SyncAxisDefault('UNTHROTTLED', name='sync_unthrottled')
+    assert sync.readback_max_rate is None
+    start = sync.update_stats['readback_updates']
+    for pos in range(10):
+        sync.one.set_current_position(pos)
+    assert sync.update_stats['readback_updates'] - start == 10
+    assert sync.update_stats['readback_merged'] == 0
+
+
 def test_sync_axis_class_checks():
     logger.debug('test_sync_axis_class_checks')
 
@@ -323,3 +353,21 @@ def test_implicit_mutex(linked_delays: tuple[FakeDelay, FakeDelay]):
     assert delay_one._my_move
     wait_for(delay_two, '_my_move', False)
     assert_no_updates()
+
+
+def test_notepad_batching():
+    delay = FakeDelay('SIM', name='delay_batch', notepad_max_rate=5)
+    delay.move(1, wait=True)
+    assert delay._my_move
+    start = dict(delay.update_stats)
+    for pos in range(2, 12):
+        delay.motor.set_current_position(pos)
+    # Readbacks are merged into at most two notepad writes
+    assert delay.update_stats['notepad_merged'] - start['notepad_merged'] >= 8
+    deadline = time.monotonic() + 2
+    expected = delay.position.delay
+    while (delay.delay.notepad_readback.get() != expected
+           and time.monotonic() < deadline):
+        time.sleep(0.05)
+    assert delay.delay.notepad_readback.get() == expected
+    assert delay.update_stats['notepad_writes'] - start['notepad_writes'] <= 2
@@ -0,0 +1,68 @@
+import logging
+
+import numpy as np
+import pytest
+from ophyd.sim import make_fake_device
+
+from ..lasers.qmini import QminiSpectrometer
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope='function')
+def fake_qmini():
+    FakeQmini = make_fake_device(QminiSpectrometer)
+    qmini = FakeQmini('TST:QMINI', name='qmini')
+    qmini.wavelengths.sim_put(np.linspace(700, 900, 64))
+    return qmini
+
+
+def test_qmini_wavelengths_cached(fake_qmini):
+    wavelengths = fake_qmini.get_wavelengths()
+    assert wavelengths[0] == 700
+    fake_qmini.wavelengths.sim_put(np.linspace(600, 800, 64))
+    assert fake_qmini.get_wavelengths() is wavelengths
+    assert fake_qmini.get_wavelengths(refresh=True)[0] == 600
+
+
+def test_qmini_spectrum_history(fake_qmini):
+    history = fake_qmini.spectrum_history
+    for shot in range(3):
+        fake_qmini.spectrum.sim_put(np.full(64, shot, dtype=float))
+    assert history.get() == 3
+    np.testing.assert_array_equal(history.mean(), np.ones(64))
+    assert 'qmini_spectrum_history' not in fake_qmini.read()
+
+
+def gaussian(wavelengths, center, fwhm):
+    sigma = fwhm / (2 * np.sqrt(2 * np.log(2)))
+    return 1000 * np.exp(-0.5 * ((wavelengths - center) / sigma) ** 2)
+
+
+def test_qmini_fit_spectra(fake_qmini):
+    wavelengths = fake_qmini.get_wavelengths()
+    fake_qmini.spectrum.sim_put(gaussian(wavelengths, 800, 20))
+    # Without any history, fit the current spectrum
+    result = fake_qmini.fit_spectra()
+    assert result.center[0] == pytest.approx(800, abs=0.1)
+
+    for center in (780, 790, 800, 810):
+        fake_qmini.spectrum.sim_put(gaussian(wavelengths, center, 20))
+    result = fake_qmini.fit_spectra(n=4)
+    np.testing.assert_allclose(result.center, [780, 790, 800, 810], atol=0.1)
+    np.testing.assert_allclose(result.fwhm, 20, rtol=0.01)
+    stack = fake_qmini.spectrum_history.latest(2).copy()
+    result = fake_qmini.fit_spectra(stack, method='moments')
+    np.testing.assert_allclose(result.center, [800, 810], atol=0.5)
+
+
+def test_qmini_local_fit(fake_qmini):
+    wavelengths = fake_qmini.get_wavelengths()
+    fake_qmini.start_local_fit()
+    fake_qmini.spectrum.sim_put(gaussian(wavelengths, 820, 15))
+    assert fake_qmini.local_w0.get() == pytest.approx(820, abs=0.1)
+    assert fake_qmini.local_fwhm.get() == pytest.approx(15, rel=0.01)
+    assert fake_qmini.local_amplitude.get() == pytest.approx(1000, rel=0.01)
+    fake_qmini.stop_local_fit()
+    fake_qmini.spectrum.sim_put(gaussian(wavelengths, 790, 15))
+    assert fake_qmini.local_w0.get() == pytest.approx(820, abs=0.1)
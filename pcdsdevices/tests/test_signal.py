@@ -4,6 +4,7 @@ import time
 from typing import Any
 from unittest.mock import MagicMock, Mock
 
+import numpy as np
 import pytest
 from ophyd import Component as Cpt
 from ophyd import Device
@@ -12,9 +13,10 @@ from ophyd.sim import FakeEpicsSignal
 from ophyd.status import Status
 
 from .. import signal as signal_module
-from ..signal import (AggregateSignal, AvgSignal, MultiDerivedSignal,
-                      MultiDerivedSignalRO, PytmcSignal, ReadOnlyError,
-                      SignalEditMD, UnitConversionDerivedSignal)
+from ..signal import (AggregateSignal, ArrayHistorySignal, AvgSignal,
+                      MultiDerivedSignal, MultiDerivedSignalRO, PytmcSignal,
+                      ReadOnlyError, ScalarHistorySignal, SignalEditMD,
+                      ThresholdSignal, UnitConversionDerivedSignal)
 from ..type_hints import OphydDataType, SignalToValue
 
 logger = logging.getLogger(__name__)
@@ -104,6 +106,122 @@ def unit_conv_signal():
     )
 
 
+def test_array_history_signal():
+    logger.debug('test_array_history_signal')
+    sig = Signal(name='raw')
+    hist = ArrayHistorySignal(sig, 3, name='hist')
+    assert hist.count == 0
+    assert hist.latest().shape == (0, 0)
+
+    for shot in range(5):
+        sig.put(np.arange(4) + shot)
+    assert hist.get() == hist.count == 3
+    assert hist.width == 4
+    latest = hist.latest()
+    np.testing.assert_array_equal(latest[:, 0], [2, 3, 4])
+    # Zero-copy view into the history buffer
+    assert np.shares_memory(latest, hist._buffer)
+    np.testing.assert_array_equal(hist.latest(2)[:, 0], [3, 4])
+    np.testing.assert_array_equal(hist.mean(), np.arange(4) + 3)
+    np.testing.assert_allclose(hist.std(2), np.full(4, 0.5))
+    np.testing.assert_array_equal(hist.peak_index(), [3, 3, 3])
+
+    # A new array length clears the history
+    sig.put(np.zeros(6))
+    assert hist.count == 1
+    assert hist.width == 6
+    hist.clear()
+    assert hist.get() == 0
+    assert hist.latest().shape == (0, 6)
+
+
+def test_array_history_signal_memmap(tmp_path):
+    logger.debug('test_array_history_signal_memmap')
+    sig = Signal(name='raw')
+    filename = tmp_path / 'history.dat'
+    hist = ArrayHistorySignal(sig, 2, filename=str(filename),
+                              dtype=np.float32, name='hist')
+    sig.put(np.ones(5))
+    hist.flush()
+    on_disk = np.memmap(filename, dtype=np.float32, mode='r', shape=(4, 5))
+    np.testing.assert_array_equal(on_disk[0], np.ones(5))
+    with pytest.raises(ValueError):
+        hist.size = 0
+
+
+def test_scalar_history_signal():
+    logger.debug('test_scalar_history_signal')
+    sig = Signal(name='raw')
+    hist = ScalarHistorySignal(sig, 4, name='hist')
+    assert np.isnan(hist.rate_of_rise())
+    assert np.isnan(hist.max())
+    assert hist.window(10).shape == (0, 2)
+
+    # Pressure rising by 2e-9 per second
+    for second in range(6):
+        sig.put(1e-8 + 2e-9 * second, timestamp=1000.0 + second)
+    assert hist.count == 4
+    np.testing.assert_array_equal(hist.times(), [1002, 1003, 1004, 1005])
+    np.testing.assert_array_equal(hist.times(1.5), [1004, 1005])
+    assert hist.min() == pytest.approx(1.4e-8)
+    assert hist.max(1.5) == pytest.approx(2e-8)
+    assert hist.rate_of_rise() == pytest.approx(2e-9)
+    assert hist.time_to_threshold(3e-8) == pytest.approx(5.0)
+    assert hist.time_to_threshold(1e-8) == 0.0
+
+    # Pump-down by a decade every 10 seconds
+    hist.clear()
+    for second in range(4):
+        sig.put(1e-5 * 10 ** (-second / 10), timestamp=2000.0 + second)
+    sig.put(-1, timestamp=2004.0)
+    assert hist.time_to_threshold(1e-6, log=True) == pytest.approx(6.0)
+
+    # Flat trends never get there, strings are ignored
+    hist.clear()
+    sig.put(1.0, timestamp=1.0)
+    sig.put(1.0, timestamp=2.0)
+    sig.put('ERROR', timestamp=3.0)
+    assert hist.count == 2
+    assert hist.time_to_threshold(2.0) == np.inf
+
+
+def test_threshold_signal():
+    logger.debug('test_threshold_signal')
+    sig = Signal(name='raw')
+    above = ThresholdSignal(sig, above=10, name='above')
+    below = ThresholdSignal(sig, below=10, hysteresis=1, name='below')
+    not_above = ThresholdSignal(sig, above=10, invert=True, name='not_above')
+    assert above.get() is None
+    sig.put(0.0)
+    assert above.get() is False
+    assert below.get() is True
+    assert not_above.get() is True
+    above_events = []
+    below_events = []
+    above.subscribe(lambda value, **kwargs: above_events.append(value),
+                    run=False)
+    below.subscribe(lambda value, **kwargs: below_events.append(value),
+                    run=False)
+    # A noisy source around the threshold flips the plain state, but not
+    # the one with hysteresis
+    for value in (10.5, 9.5, 10.5, 9.5, 10.5):
+        sig.put(value)
+    assert above_events == [True, False, True, False, True]
+    assert above.state is True
+    assert not_above.get() is False
+    assert below_events == []
+    sig.put(11.5)
+    assert below_events == [False]
+    sig.put(10.5)
+    assert below.get() is False
+    sig.put(9.5)
+    assert below_events == [False, True]
+    with pytest.raises(ValueError):
+        ThresholdSignal(sig, name='neither')
+    with pytest.raises(ValueError):
+        ThresholdSignal(sig, above=1, below=2, name='both')
+
+
 def test_unit_conversion_signal_units(unit_conv_signal):
     assert unit_conv_signal.original_units == 'm'
     assert unit_conv_signal.derived_units == 'mm'
@@ -0,0 +1,84 @@
+import logging
+import threading
+
+import pytest
+
+from ..sim import SimClock, SimTwoAxis, SlowMotor
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope='function')
+def manual_clock():
+    return SimClock(tick=0.1, realtime=False)
+
+
+def test_slow_motor_manual_clock(manual_clock):
+    motor = SlowMotor(name='motor', clock=manual_clock)
+    status = motor.move(2.5, wait=False)
+    assert manual_clock.active == [motor]
+    manual_clock.advance(0.1)
+    assert motor.position == pytest.approx(1.0)
+    assert not status.done
+    assert manual_clock.run_until_idle() == pytest.approx(0.2)
+    status.wait(timeout=1)
+    assert status.success
+    assert motor.position == 2.5
+    assert manual_clock.active == []
+    assert manual_clock.time == pytest.approx(0.3)
+
+
+def test_slow_motor_acceleration(manual_clock):
+    motor = SlowMotor(name='motor', velocity=2, acceleration=1,
+                      clock=manual_clock)
+    status = motor.move(10, wait=False)
+    for _ in range(100):
+        manual_clock.advance(0.01)
+    assert motor.position == pytest.approx(0.5, abs=0.01)
+    elapsed = manual_clock.run_until_idle(dt=0.01)
+    status.wait(timeout=1)
+    # 2 s ramp up, 3 s at speed, 2 s ramp down
+    assert 1 + elapsed == pytest.approx(7.0, abs=0.05)
+    assert motor.position == 10
+
+
+def test_slow_motor_stop_and_retarget(manual_clock):
+    motor = SlowMotor(name='motor', clock=manual_clock)
+    first = motor.move(5, wait=False)
+    manual_clock.advance(0.1)
+    second = motor.move(-1, wait=False)
+    with pytest.raises(Exception):
+        first.wait(timeout=1)
+    manual_clock.run_until_idle()
+    second.wait(timeout=1)
+    assert motor.position == -1
+
+    third = motor.move(5, wait=False)
+    motor.stop()
+    manual_clock.advance(0.1)
+    with pytest.raises(Exception):
+        third.wait(timeout=1)
+    assert manual_clock.active == []
+
+
+@pytest.mark.timeout(10)
+def test_shared_clock_many_motors():
+    clock = SimClock(tick=0.01, speedup=100)
+    motors = [SlowMotor(name=f'motor{idx}', clock=clock)
+              for idx in range(200)]
+    n_threads = threading.active_count()
+    statuses = [motor.move(idx, wait=False)
+                for idx, motor in enumerate(motors)]
+    # One clock thread for all of the moves
+    assert threading.active_count() <= n_threads + 1
+    for status in statuses:
+        status.wait(timeout=5)
+    assert [motor.position for motor in motors] == list(range(200))
+    assert clock.time >= 19.9
+
+
+def test_sim_two_axis():
+    sim = SimTwoAxis(name='sim')
+    sim.x.move(0.5, wait=True)
+    sim.y.move(-0.5, wait=True)
+    assert (sim.x.position, sim.y.position) == (0.5, -0.5)
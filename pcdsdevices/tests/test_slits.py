@@ -1,4 +1,6 @@
 import logging
+import threading
+import time
 from unittest.mock import Mock
 
 import pytest
@@ -102,6 +104,55 @@ def test_slit_subscriptions(fake_slits):
     assert cb.called
 
 
+def test_slit_state_events(fake_slits):
+    logger.debug('test_slit_state_events')
+    slits = fake_slits
+    slits.xwidth.readback.sim_put(20.0)
+    slits.ywidth.readback.sim_put(20.0)
+    states = []
+    apertures = []
+    slits.subscribe(lambda inserted, **kwargs: states.append(inserted))
+    slits.subscribe(
+        lambda xwidth, ywidth, **kwargs: apertures.append((xwidth, ywidth)),
+        event_type=slits.SUB_APERTURE, run=False,
+    )
+    # Starts with the current state
+    assert states == [False]
+    for width in (19.0, 18.0, 4.0, 3.0):
+        slits.xwidth.readback.sim_put(width)
+    # Only the crossing of the nominal aperture changes the state
+    assert states == [False, True]
+    assert apertures == [(19.0, 20.0), (18.0, 20.0), (4.0, 20.0),
+                         (3.0, 20.0)]
+    # The cached nominal aperture follows the signal
+    slits.nominal_aperture.put(2.0)
+    assert states == [False, True, False]
+    assert slits.removed
+    slits.remove()
+    assert slits.xwidth.setpoint.get() == 0
+
+
+def test_slit_aperture_rate_limit(fake_slits):
+    logger.debug('test_slit_aperture_rate_limit')
+    slits = fake_slits
+    slits.aperture_rate_limit = 0.2
+    event = threading.Event()
+    apertures = []
+
+    def aperture_cb(xwidth, ywidth, **kwargs):
+        apertures.append((xwidth, ywidth))
+        if len(apertures) == 2:
+            event.set()
+
+    slits.subscribe(aperture_cb, event_type=slits.SUB_APERTURE, run=False)
+    slits.ywidth.readback.sim_put(10.0)
+    for width in range(5):
+        slits.xwidth.readback.sim_put(float(width))
+    # The first update is sent right away, the rest are combined
+    assert event.wait(timeout=5)
+    assert apertures == [(None, 10.0), (4.0, 10.0)]
+
+
 @pytest.mark.timeout(10)
 def test_slit_staging(fake_slits):
     logger.debug('test_slit_staging')
@@ -149,6 +200,82 @@ def test_beckhoffslits_dmov(fake_beckhoff_slits):
     assert not sl.done_all.get()
 
 
+def test_beckhoffslits_dmov_transitions(fake_beckhoff_slits):
+    sl = fake_beckhoff_slits
+    values = []
+    sl.done_all.subscribe(
+        lambda value, **kwargs: values.append(value), run=False
+    )
+    sl.done_top.sim_put(1)
+    sl.done_bottom.sim_put(1)
+    sl.done_north.sim_put(1)
+    sl.done_top.sim_put(0)
+    assert values == [False]
+    sl.done_top.sim_put(1)
+    sl.done_south.sim_put(1)
+    sl.done_south.sim_put(1)
+    assert values == [False, True]
+    assert sl.xcenter.done.get() == 1
+    sl.done_north.sim_put(0)
+    assert values == [False, True, False]
+    assert sl.ywidth.done.get() == 0
+
+
+def wait_for_exec(slits, timeout=2):
+    """Time until exec_move is set, with the setpoints seen at that time."""
+    ev = threading.Event()
+    setpoints = []
+
+    def executed(value, **kwargs):
+        if value == 1:
+            setpoints.append((slits.xwidth.setpoint.get(),
+                              slits.ywidth.setpoint.get()))
+            ev.set()
+
+    cid = slits.exec_move.subscribe(executed, run=False)
+    return ev, setpoints, cid
+
+
+def test_beckhoffslits_move_latency(fake_beckhoff_slits):
+    sl = fake_beckhoff_slits
+    for blade in (sl.done_top, sl.done_bottom, sl.done_north, sl.done_south):
+        blade.sim_put(1)
+    ev, setpoints, cid = wait_for_exec(sl)
+    start = time.monotonic()
+    status = sl.move(1.5, 2.5)
+    assert ev.wait(timeout=2)
+    latency = time.monotonic() - start
+    logger.debug('Beckhoff slits move-start latency: %.1f ms',
+                 latency * 1e3)
+    # This used to be a fixed 0.2 s wait for more move requests
+    assert latency < 0.1
+    # Both setpoints were acknowledged before the move was executed
+    assert setpoints == [(1.5, 2.5)]
+    sl.exec_move.unsubscribe(cid)
+
+    assert sl.exec_queue.get() == 1
+    sl.done_top.sim_put(0)
+    sl.done_top.sim_put(1)
+    status.wait(timeout=1)
+    assert sl.exec_queue.get() == 0
+    assert sl.exec_move.get() == 0
+
+
+def test_beckhoffslits_move_group(fake_beckhoff_slits):
+    sl = fake_beckhoff_slits
+    ev, setpoints, cid = wait_for_exec(sl)
+    with sl.move_group(sl.xwidth, sl.xcenter):
+        sl.xwidth.move(3, wait=False)
+        # Still waiting on xcenter
+        assert sl.exec_queue.get() != 1
+    # The group exits without an xcenter move, so execute anyway
+    assert ev.wait(timeout=2)
+    assert sl.exec_queue.get() == 1
+    with pytest.raises(ValueError):
+        with sl.move_group(sl.top):
+            pass
+
+
 @pytest.mark.timeout(5)
 def test_slits_disconnected():
     LusiSlits("TST:JAWS:", name='Test Slits')
@@ -24,6 +24,25 @@ def test_vh_init():
     FakeVH('TST', name='test', prefix_focus='zoom', prefix_energy='buzz')
 
 
+def test_kmono_states():
+    logger.debug('test_kmono_states')
+    kmono = make_fake_device(Kmono)('TST', name='test')
+    events = []
+    kmono.xtal_in.subscribe(lambda value, **kwargs: events.append(value),
+                            run=False)
+    for position in (0, 1, 60, 61, 62):
+        kmono.xtal_vert.user_readback.sim_put(position)
+    # Only the transition is emitted
+    assert events == [False, True]
+    assert kmono.xtal_in.get() and not kmono.xtal_out.get()
+    kmono.ret_vert.user_readback.sim_put(-1)
+    assert kmono.ret_in.get() and not kmono.ret_out.get()
+    kmono.ret_vert.user_readback.sim_put(-0.5)
+    assert not kmono.ret_in.get() and kmono.ret_out.get()
+    kmono.diode_vert.user_readback.sim_put(100)
+    assert kmono.diode_out.get() and not kmono.diode_in.get()
+
+
 @pytest.mark.timeout(5)
 def test_spectrometer_disconnected():
     logger.debug('test_spectrometer_disconnected')
@@ -0,0 +1,75 @@
+import logging
+
+import numpy as np
+import pytest
+
+from ..lasers.spectrum_fit import (FWHM_PER_SIGMA, SpectrumFitter,
+                                   fit_gaussian, moment_estimate)
+
+logger = logging.getLogger(__name__)
+
+
+def gaussian_stack(x, amplitude, center, sigma, background=100.0,
+                   noise=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    spectra = amplitude[:, np.newaxis] * np.exp(
+        -0.5 * ((x - center[:, np.newaxis]) / sigma[:, np.newaxis]) ** 2
+    ) + background
+    return spectra + rng.normal(0.0, noise, spectra.shape)
+
+
+@pytest.fixture(scope='module')
+def stack():
+    rng = np.random.default_rng(1)
+    x = np.linspace(700, 900, 1000)
+    amplitude = rng.uniform(500, 2000, 50)
+    center = rng.uniform(780, 820, 50)
+    sigma = rng.uniform(3, 10, 50)
+    spectra = gaussian_stack(x, amplitude, center, sigma, noise=5.0)
+    return x, spectra, amplitude, center, sigma
+
+
+def test_moment_estimate(stack):
+    x, spectra, amplitude, center, sigma = stack
+    result = moment_estimate(x, spectra)
+    assert result.converged.all()
+    np.testing.assert_allclose(result.center, center, atol=0.5)
+    np.testing.assert_allclose(result.sigma, sigma, rtol=0.1)
+    assert np.isnan(result.chisq).all()
+
+
+def test_fit_gaussian(stack):
+    x, spectra, amplitude, center, sigma = stack
+    result = fit_gaussian(x, spectra)
+    assert len(result) == 50
+    assert result.converged.all()
+    np.testing.assert_allclose(result.center, center, atol=0.1)
+    np.testing.assert_allclose(result.sigma, sigma, rtol=0.02)
+    np.testing.assert_allclose(result.amplitude, amplitude, rtol=0.02)
+    np.testing.assert_allclose(result.fwhm, FWHM_PER_SIGMA * result.sigma)
+    np.testing.assert_allclose(result.background, 100, atol=10)
+    # Descending wavelength axes are handled too
+    flipped = fit_gaussian(x[::-1], spectra[:, ::-1])
+    np.testing.assert_allclose(flipped.center, result.center)
+
+
+def test_fit_gaussian_failures():
+    x = np.linspace(0, 1, 100)
+    result = fit_gaussian(x, np.zeros((2, 100)))
+    assert not result.converged.any()
+    assert np.isnan(result.center).all()
+    with pytest.raises(ValueError):
+        fit_gaussian(x, np.zeros(50))
+
+
+def test_spectrum_fitter():
+    x = np.linspace(-10, 10, 201)
+    spectrum = gaussian_stack(x, np.array([1.0]), np.array([1.0]),
+                              np.array([2.0]), background=0.0)[0]
+    result = SpectrumFitter(x).fit(spectrum)
+    assert result.center[0] == pytest.approx(1.0)
+    assert result.fwhm[0] == pytest.approx(2.0 * FWHM_PER_SIGMA, rel=1e-3)
+    moments = SpectrumFitter(x, method='moments').fit(spectrum)
+    assert moments.center[0] == pytest.approx(1.0, abs=0.05)
+    with pytest.raises(ValueError):
+        SpectrumFitter(x, method='lorentzian')
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+from ophyd.sim import make_fake_device
+
+from ..evr import EVR_TICK_NS, Trigger
+from ..timing_bank import TimingBank, quantize_tpr_delay
+from ..tpr import TPR_TAP_NS, TPR_TICK_NS, TimingMode, TprTrigger
+
+
+@pytest.fixture(scope='function')
+def tpr_bank():
+    cls = make_fake_device(TprTrigger)
+    triggers = [
+        cls('TST:TPR', channel=channel, timing_mode=TimingMode.LCLS2,
+            name=f'trig_{channel}')
+        for channel in range(3)
+    ]
+    for trigger in triggers:
+        trigger.eventcode.sim_put(40)
+        trigger.fixedrate.sim_put(1)
+        trigger.polarity.sim_put(0)
+        trigger.width_setpoint.sim_put(TPR_TICK_NS)
+        trigger.delay_setpoint.sim_put(100.0)
+        trigger.enable_ch_cmd.sim_put(1)
+        trigger.enable_trg_cmd.sim_put(1)
+    bank = TimingBank(triggers)
+    yield bank
+    bank.destroy()
+
+
+def test_quantize_tpr_delay():
+    delays = quantize_tpr_delay([0, TPR_TICK_NS + 0.11, 10.0])
+    np.testing.assert_allclose(
+        delays, [0, TPR_TICK_NS + TPR_TAP_NS, TPR_TICK_NS + 58 * TPR_TAP_NS]
+    )
+
+
+def test_timing_bank_round_trip(tpr_bank):
+    table = tpr_bank.to_table()
+    assert list(table['name']) == ['trig_0', 'trig_1', 'trig_2']
+    assert table['delay'][1] == 100.0
+    assert table['enabled'].all()
+    # Nothing to do when applying the current settings
+    assert tpr_bank.changes(table) == {}
+    tpr_bank.apply(table).wait(timeout=5)
+
+
+def test_timing_bank_minimal_changes(tpr_bank):
+    trig_1 = tpr_bank.triggers[1]
+    table = {
+        'name': ['trig_1', 'trig_2'],
+        'delay': [200.0, 100.01],
+        'enabled': [False, True],
+    }
+    changes = tpr_bank.changes(table)
+    # trig_2 is already within a tap of the requested delay
+    assert set(changes) == {trig_1.delay_setpoint, trig_1.enable_ch_cmd,
+                            trig_1.enable_trg_cmd}
+    assert changes[trig_1.delay_setpoint] == pytest.approx(
+        quantize_tpr_delay(200.0)
+    )
+    tpr_bank.apply(table).wait(timeout=5)
+    assert trig_1.enable_trg_cmd.get() == 0
+    assert tpr_bank.to_table()['delay'][1] == pytest.approx(
+        quantize_tpr_delay(200.0)
+    )
+    assert tpr_bank.changes(table) == {}
+
+
+def test_timing_bank_validation(tpr_bank):
+    with pytest.raises(ValueError):
+        tpr_bank.validate({'delay': [1.0]})
+    with pytest.raises(ValueError):
+        tpr_bank.validate({'name': ['nope'], 'delay': [1.0]})
+    with pytest.raises(ValueError):
+        tpr_bank.validate({'name': ['trig_0', 'trig_0'], 'delay': [1, 2]})
+    with pytest.raises(ValueError):
+        tpr_bank.validate({'name': ['trig_0'], 'delay': [-1.0]})
+    with pytest.raises(ValueError):
+        tpr_bank.validate({'name': ['trig_0'], 'eventcode': [256]})
+    with pytest.raises(ValueError):
+        tpr_bank.validate({'name': ['trig_0'], 'bogus': [1]})
+
+
+def test_timing_bank_overlaps(tpr_bank):
+    # All three start at 100 ns with a one tick width
+    assert tpr_bank.overlaps() == [('trig_0', 'trig_1'), ('trig_0', 'trig_2'),
+                                   ('trig_1', 'trig_2')]
+    table = np.array(
+        [('trig_1', 120.0, 41), ('trig_2', 200.0, 40)],
+        dtype=[('name', 'U10'), ('delay', float), ('eventcode', int)],
+    )
+    # trig_1 moves to another event code, trig_2 moves later
+    assert tpr_bank.overlaps(table) == []
+    with pytest.raises(ValueError):
+        tpr_bank.apply({'name': ['trig_1'], 'delay': [101.0]},
+                       allow_overlap=False)
+    tpr_bank.apply(table, allow_overlap=False).wait(timeout=5)
+    assert tpr_bank.triggers[1].eventcode.get() == 41
+
+
+def test_timing_bank_evr():
+    cls = make_fake_device(Trigger)
+    triggers = [cls(f'TST:EVR:TRIG{idx}', name=f'evr_{idx}')
+                for idx in range(2)]
+    for trigger in triggers:
+        trigger.ns_delay.sim_put(0.0)
+    bank = TimingBank(triggers)
+    assert 'rate' not in bank.columns
+    changes = bank.changes({'name': ['evr_0'], 'delay': [20.0]})
+    assert changes == {triggers[0].ns_delay: 2 * EVR_TICK_NS}
+    with pytest.raises(TypeError):
+        TimingBank([triggers[0], make_fake_device(TprTrigger)(
+            'TST:TPR', channel=0, name='tpr')])
+    bank.destroy()
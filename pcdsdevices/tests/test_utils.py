@@ -10,9 +10,11 @@ from ophyd import Device, Signal
 from .. import utils
 from ..device import GroupDevice
 from ..pv_positioner import PVPositionerDone
-from ..utils import (move_subdevices_to_start, post_ophyds_to_elog,
-                     reorder_components, set_many, set_standard_ordering,
-                     sort_components_by_kind, sort_components_by_name)
+from ..utils import (deferred_components_report, get_deferred_components,
+                     lazy_components_by_kind, move_subdevices_to_start,
+                     post_ophyds_to_elog, reorder_components, set_many,
+                     set_standard_ordering, sort_components_by_kind,
+                     sort_components_by_name)
 
 try:
     import pty
@@ -265,6 +267,55 @@ def test_reorder_decorators():
     )
 
 
+def test_lazy_components_by_kind(SampleClass):
+    omit_cpt = SampleClass.omit
+    lazy_components_by_kind(SampleClass)
+    assert SampleClass.omit.lazy
+    assert SampleClass.cfg.lazy
+    assert not SampleClass.norm.lazy
+    assert not SampleClass.hint.lazy
+    assert not SampleClass.mot.lazy
+    # Components are copied, not mutated
+    assert SampleClass.omit is not omit_cpt
+    assert not omit_cpt.lazy
+    # Ordering is preserved
+    assert get_order(SampleClass) == ['omit', 'cfg', 'norm', 'hint', 'mot',
+                                      'sub']
+
+    class SubClass(SampleClass):
+        extra = Cpt(Signal, kind='config')
+
+    device = SubClass(name='device')
+    assert SubClass.omit.lazy
+    assert not SubClass.extra.lazy
+    assert sorted(get_deferred_components(device)) == ['cfg', 'omit']
+    # Configuration reads instantiate lazy components on demand
+    assert 'device_cfg' in device.read_configuration()
+    assert get_deferred_components(device) == ['omit']
+    report = deferred_components_report([device])
+    assert 'device' in report
+    assert 'Total' in report
+
+
+def test_lazy_components_by_kind_decorator():
+    @lazy_components_by_kind(kinds=['config'], include_devices=True)
+    class Widget(GroupDevice):
+        cfg = Cpt(Signal, kind='config')
+        omit = Cpt(Signal, kind='omitted')
+        sub = Cpt(SampleSub, 'SUB', kind='config')
+
+    assert Widget.cfg.lazy
+    assert Widget.sub.lazy
+    assert not Widget.omit.lazy
+
+    widget = Widget('PREFIX', name='widget')
+    assert sorted(get_deferred_components(widget)) == ['cfg', 'sub']
+    # GroupDevice parent handling also applies to lazy components
+    assert widget.sub.parent is None
+    assert widget.sub.biological_parent is widget
+    assert get_deferred_components(widget) == ['cfg']
+
+
 def test_set_many():
     """Checks that set_many sets multiple ophyd objects, and that it works
     with signals as well as positioners.
@@ -0,0 +1,232 @@
+import pytest
+import yaml
+from ophyd.sim import make_fake_device
+
+from ..gauge import GCCPLC
+from ..pump import PIPPLC
+from ..vacuum_topology import VacuumTopology
+from ..valve import VGC, GateValve
+
+POSITIONS = ['INVALID', 'OPEN', 'CLOSED', 'OPEN_F', 'MOVING']
+OPEN = POSITIONS.index('OPEN')
+CLOSED = POSITIONS.index('CLOSED')
+
+
+@pytest.fixture(scope='function')
+def loop_topology():
+    # a - b - c, with a bypass valve between a and c
+    topology = VacuumTopology()
+    topology.add_valve('v_ab', 'a', 'b', is_open=True)
+    topology.add_valve('v_bc', 'b', 'c', is_open=True)
+    topology.add_valve('bypass', 'a', 'c')
+    topology.add_volume('d')
+    topology.add_gauge('g_a', 'a')
+    topology.add_gauge('g_c', 'c')
+    topology.add_pump('p_a', 'a')
+    return topology
+
+
+def test_topology_sections(loop_topology):
+    topology = loop_topology
+    events = []
+    topology.subscribe(lambda **kwargs: events.append(kwargs), run=False)
+    assert topology.section('b') == {'a', 'b', 'c'}
+    assert topology.isolated_volumes() == ['d']
+    assert topology.unpumped_sections() == [{'d'}]
+
+    # Opening a valve within a section changes nothing
+    assert not topology.set_valve_open('bypass', True)
+    # Closing one side of the loop keeps the section connected
+    assert not topology.set_valve_open('v_ab', False)
+    assert events == []
+    assert topology.set_valve_open('bypass', False)
+    assert topology.section('a') == {'a'}
+    assert topology.section('c') == {'b', 'c'}
+    assert events[-1]['valve'] == 'bypass'
+    assert not events[-1]['is_open']
+    assert set(events[-1]['sections']) == {frozenset({'a'}),
+                                           frozenset({'b', 'c'})}
+    assert sorted(topology.isolated_volumes()) == ['a', 'd']
+    assert sorted(map(sorted, topology.unpumped_sections())) == [
+        ['b', 'c'], ['d']
+    ]
+    assert topology.valves_bounding('b') == ['bypass', 'v_ab']
+
+    assert topology.set_valve_open('v_ab', True)
+    assert events[-1]['sections'] == [frozenset({'a', 'b', 'c'})]
+    assert topology.stats['merges'] == 3
+    assert topology.stats['splits'] == 1
+
+
+def test_topology_pressures(loop_topology):
+    topology = loop_topology
+    topology.set_valve_open('v_bc', False)
+    topology.set_pressure('g_a', 1e-8)
+    topology.set_pressure('g_c', 1e-5)
+    assert topology.gauges_for_valve('v_bc') == (['g_a'], ['g_c'])
+    assert topology.section_pressure('b') == 1e-8
+    assert topology.pressure_differential('v_bc') == pytest.approx(
+        1e-5 - 1e-8
+    )
+    assert topology.section_pressure('d') is None
+    assert topology.pressure_differential('bypass') is not None
+    topology.set_valve_open('bypass', True)
+    assert topology.gauges_for_valve('v_bc') == (['g_a', 'g_c'],
+                                                 ['g_a', 'g_c'])
+    assert topology.section_pressure('b') == 1e-5
+    topology.set_pressure('g_c', None)
+    assert topology.section_pressure('b') == 1e-8
+    with pytest.raises(KeyError):
+        topology.set_pressure('nope', 1)
+
+
+def test_topology_errors():
+    topology = VacuumTopology()
+    topology.add_valve('v1', 'a', 'b')
+    with pytest.raises(ValueError):
+        topology.add_valve('v1', 'b', 'c')
+    with pytest.raises(ValueError):
+        topology.add_valve('v2', 'c', 'c')
+    topology.add_gauge('g1', 'a')
+    with pytest.raises(ValueError):
+        topology.add_pump('g1', 'b')
+    with pytest.raises(KeyError):
+        topology.attach_device('unknown', None)
+
+
+def test_topology_from_yaml(tmp_path):
+    config = {
+        'volumes': ['fee', 'xrt', 'hutch'],
+        'valves': {
+            'vgc1': {'upstream': 'fee', 'downstream': 'xrt', 'open': True},
+            'vgc2': {'upstream': 'xrt', 'downstream': 'hutch'},
+        },
+        'gauges': {'gcc1': 'fee', 'gcc2': 'hutch'},
+        'pumps': {'pip1': 'xrt'},
+    }
+    filename = tmp_path / 'vacuum.yaml'
+    with open(filename, 'w') as fd:
+        yaml.safe_dump(config, fd)
+    topology = VacuumTopology.from_yaml(str(filename))
+    assert topology.section('fee') == {'fee', 'xrt'}
+    assert topology.isolated_volumes() == ['hutch']
+    assert topology.gauges_for_valve('vgc2') == (['gcc1'], ['gcc2'])
+
+
+def test_topology_from_happi(tmp_path):
+    happi = pytest.importorskip('happi')
+    db = tmp_path / 'db.json'
+    db.write_text('{}')
+    client = happi.Client(path=str(db))
+    entries = [
+        ('vgc2', 'pcdsdevices.valve.VGC', 20.0),
+        ('vgc1', 'pcdsdevices.valve.VGC', 10.0),
+        ('gcc1', 'pcdsdevices.gauge.GCCPLC', 5.0),
+        ('gcc2', 'pcdsdevices.gauge.GCCPLC', 15.0),
+        ('pip1', 'pcdsdevices.pump.PIPPLC', 25.0),
+        ('im1', 'pcdsdevices.pim.PIM', 12.0),
+    ]
+    for name, device_class, z in entries:
+        item = client.create_item(
+            happi.OphydItem, name=name, device_class=device_class,
+            args=['{{prefix}}'], prefix=name.upper(), z=z, beamline='TST',
+        )
+        item.save()
+
+    topology = VacuumTopology.from_happi(client, beamline='TST')
+    assert sorted(topology.volumes) == ['TST:->vgc1', 'TST:vgc1->vgc2',
+                                        'TST:vgc2->']
+    assert topology.valves['vgc1'].upstream == 'TST:->vgc1'
+    assert topology.gauges_in_section('TST:vgc1->vgc2') == ['gcc2']
+    assert topology.unpumped_sections() == [
+        {'TST:->vgc1'}, {'TST:vgc1->vgc2'}
+    ]
+
+
+@pytest.fixture(scope='module')
+def fake_beamline():
+    """A long beamline with a gauge in every volume."""
+    n_valves = 300
+    FakeVGC = make_fake_device(VGC)
+    FakeGCC = make_fake_device(GCCPLC)
+    FakePIP = make_fake_device(PIPPLC)
+    config = {'valves': {}, 'gauges': {}, 'pumps': {}}
+    devices = {}
+    for idx in range(n_valves):
+        name = f'vgc{idx}'
+        config['valves'][name] = {'upstream': f'vol{idx}',
+                                  'downstream': f'vol{idx + 1}'}
+        valve = FakeVGC(f'TST:VGC:{idx:03}', name=name)
+        valve.valve_position.sim_set_enum_strs(POSITIONS)
+        valve.valve_position.sim_put(CLOSED)
+        valve.interlock_ok.sim_put(1)
+        devices[name] = valve
+    for idx in range(n_valves + 1):
+        name = f'gcc{idx}'
+        config['gauges'][name] = f'vol{idx}'
+        gauge = FakeGCC(f'TST:GCC:{idx:03}', name=name)
+        gauge.pressure.sim_put(1e-9 * (idx + 1))
+        devices[name] = gauge
+    for idx in range(0, n_valves, 50):
+        name = f'pip{idx}'
+        config['pumps'][name] = f'vol{idx}'
+        devices[name] = FakePIP(f'TST:PIP:{idx:03}', name=name)
+    return config, devices
+
+
+def test_topology_fake_beamline(fake_beamline):
+    config, devices = fake_beamline
+    topology = VacuumTopology.from_config(config, devices=devices)
+    try:
+        assert len(topology.valves) == 300
+        assert len(topology.isolated_volumes()) == 301
+        assert topology.section_pressure('vol10') == pytest.approx(11e-9)
+
+        for idx in range(300):
+            devices[f'vgc{idx}'].valve_position.sim_put(OPEN)
+        assert len(topology.sections()) == 1
+        assert topology.section_pressure('vol0') == pytest.approx(301e-9)
+        assert topology.unpumped_sections() == []
+
+        # A split near the end only visits the small side
+        topology.stats['visited'] = 0
+        devices['vgc297'].valve_position.sim_put(CLOSED)
+        assert topology.section('vol300') == {'vol298', 'vol299', 'vol300'}
+        assert topology.stats['visited'] <= 8
+        assert topology.unpumped_sections() == [
+            {'vol298', 'vol299', 'vol300'}
+        ]
+
+        devices['vgc150'].valve_position.sim_put(CLOSED)
+        assert len(topology.sections()) == 3
+        upstream, downstream = topology.gauges_for_valve('vgc150')
+        assert len(upstream) == 151
+        assert len(downstream) == 147
+        assert topology.pressure_differential('vgc150') == pytest.approx(
+            (298 - 151) * 1e-9
+        )
+
+        # Fast shutter style position strings also count as open
+        devices['vgc150'].valve_position.sim_put(POSITIONS.index('OPEN_F'))
+        assert len(topology.sections()) == 2
+
+        devices['vgc10'].interlock_ok.sim_put(0)
+        assert topology.interlocked_valves() == ['vgc10']
+        devices['gcc5'].pressure.sim_put(1e-3)
+        assert topology.section_pressure('vol100') == 1e-3
+    finally:
+        topology.detach_devices()
+
+
+def test_topology_limit_switch_valves():
+    FakeGateValve = make_fake_device(GateValve)
+    valve = FakeGateValve('TST:VGC:01', name='valve')
+    topology = VacuumTopology()
+    topology.add_valve('valve', 'a', 'b')
+    topology.attach_device('valve', valve)
+    valve.open_limit.sim_put(1)
+    valve.closed_limit.sim_put(0)
+    assert topology.section('a') == {'a', 'b'}
+    valve.open_limit.sim_put(0)
+    assert topology.isolated_volumes() == ['a', 'b']
+    topology.detach_devices()
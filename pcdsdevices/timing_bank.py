@@ -0,0 +1,430 @@
+"""
+Table-based configuration of banks of timing triggers.
+
+Configuring all of the triggers of a TPR or EVR one setting at a time takes
+a round trip per PV. `TimingBank` instead takes a whole table of trigger
+settings: one row per trigger, one column per setting. The table can be a
+NumPy structured array, a pandas DataFrame or a dictionary of columns.
+
+Only the ``name`` column is required. The other columns are optional and
+settings without a column are left alone:
+
+* ``eventcode``: the event code of the trigger.
+* ``rate``: the fixed rate selector (TPR only).
+* ``polarity``: the trigger polarity.
+* ``width``: the trigger width in ns.
+* ``delay``: the trigger delay in ns.
+* ``enabled``: whether the trigger is enabled.
+
+`TimingBank.apply` validates the table for all triggers at once, quantizes
+the delays and widths to what the hardware can do, and only puts the PVs
+that differ from the monitored values. `TimingBank.to_table` exports the
+current settings in the same format, so that a saved table can be applied
+again later::
+
+    bank = TimingBank([tpr_trig_0, tpr_trig_1, tpr_trig_2])
+    saved = bank.to_table()
+    ...
+    bank.apply(saved).wait()
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+import threading
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+import numpy as np
+from ophyd.status import StatusBase
+
+from .evr import EVR_TICK_NS, Trigger
+from .tpr import TPR_TAP_NS, TPR_TICK_NS, TprTrigger
+from .utils import set_many
+
+logger = logging.getLogger(__name__)
+
+#: Columns of a timing table, in order, with their dtypes
+TABLE_DTYPES = {
+    'eventcode': np.int64,
+    'rate': np.int64,
+    'polarity': np.int64,
+    'width': np.float64,
+    'delay': np.float64,
+    'enabled': np.bool_,
+}
+
+
+def quantize_tpr_delay(delays):
+    """Round delays in ns to the nearest TPR tick plus delay taps."""
+    delays = np.asarray(delays, dtype=float)
+    ticks = np.floor(delays / TPR_TICK_NS)
+    taps = np.round((delays - ticks * TPR_TICK_NS) / TPR_TAP_NS)
+    return ticks * TPR_TICK_NS + taps * TPR_TAP_NS
+
+
+def quantize_ticks(values, tick):
+    """Round times in ns to the nearest multiple of ``tick``."""
+    return np.round(np.asarray(values, dtype=float) / tick) * tick
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class TriggerSpec:
+    """
+    How the columns of a timing table map onto one type of trigger.
+
+    Attributes
+    ----------
+    fields : dict
+        Column name to the trigger attributes holding that setting. A
+        setting can be written to more than one signal, e.g. the channel and
+        trigger enables of a TPR.
+    quantize : dict
+        Column name to a function that rounds an array of requested values
+        to what the hardware can do.
+    overlap_key : tuple of str
+        Enabled triggers that match on these columns fire on the same
+        event, and their delay windows are checked for overlaps.
+    """
+    fields: dict[str, tuple[str, ...]]
+    quantize: dict[str, Callable[[np.ndarray], np.ndarray]]
+    overlap_key: tuple[str, ...]
+
+
+TPR_SPEC = TriggerSpec(
+    fields={
+        'eventcode': ('eventcode',),
+        'rate': ('fixedrate',),
+        'polarity': ('polarity',),
+        'width': ('width_setpoint',),
+        'delay': ('delay_setpoint',),
+        'enabled': ('enable_ch_cmd', 'enable_trg_cmd'),
+    },
+    quantize={
+        'width': lambda values: quantize_ticks(values, TPR_TICK_NS),
+        'delay': quantize_tpr_delay,
+    },
+    overlap_key=('eventcode', 'rate'),
+)
+
+EVR_SPEC = TriggerSpec(
+    fields={
+        'eventcode': ('eventcode',),
+        'polarity': ('polarity',),
+        'width': ('width',),
+        'delay': ('ns_delay',),
+        'enabled': ('enable_cmd',),
+    },
+    quantize={
+        'width': lambda values: quantize_ticks(values, EVR_TICK_NS),
+        'delay': lambda values: quantize_ticks(values, EVR_TICK_NS),
+    },
+    overlap_key=('eventcode',),
+)
+
+#: Trigger class to its table specification
+TRIGGER_SPECS = {
+    TprTrigger: TPR_SPEC,
+    Trigger: EVR_SPEC,
+}
+
+
+def _get_spec(trigger) -> TriggerSpec:
+    for cls, spec in TRIGGER_SPECS.items():
+        if isinstance(trigger, cls):
+            return spec
+    raise TypeError(
+        f'{trigger.name} is a {type(trigger).__name__}, expected one of '
+        f'{[cls.__name__ for cls in TRIGGER_SPECS]}'
+    )
+
+
+def _table_columns(table) -> dict[str, np.ndarray]:
+    """Normalize a structured array, DataFrame or dict to column arrays."""
+    dtype_names = getattr(getattr(table, 'dtype', None), 'names', None)
+    if dtype_names is not None:
+        names = dtype_names
+    elif hasattr(table, 'columns'):
+        names = list(table.columns)
+    else:
+        names = list(table)
+    return {name: np.asarray(table[name]) for name in names}
+
+
+class TimingBank:
+    """
+    Configure a bank of TPR or EVR triggers from a table.
+
+    The bank subscribes to the setting signals of all triggers, so the
+    current settings are known without a get per PV.
+
+    Parameters
+    ----------
+    triggers : sequence of TprTrigger or Trigger
+        The triggers in the bank, all of the same type. They are referred
+        to by name in the tables.
+    """
+
+    def __init__(self, triggers: Sequence[Any]):
+        self.triggers = list(triggers)
+        if not self.triggers:
+            raise ValueError('A timing bank needs at least one trigger')
+        specs = {_get_spec(trigger) for trigger in self.triggers}
+        if len(specs) > 1:
+            raise TypeError('All triggers in a timing bank must be of the '
+                            'same type')
+        self.spec = specs.pop()
+        self.names = [trigger.name for trigger in self.triggers]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError('Trigger names in a timing bank must be unique')
+        self._index = {name: idx for idx, name in enumerate(self.names)}
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._subscriptions = []
+        for trigger in self.triggers:
+            for attrs in self.spec.fields.values():
+                for attr in attrs:
+                    signal = getattr(trigger, attr)
+                    cid = signal.subscribe(self._update_cache, run=True)
+                    self._subscriptions.append((signal, cid))
+
+    @property
+    def columns(self) -> list[str]:
+        """The setting columns supported by this bank's triggers."""
+        return list(self.spec.fields)
+
+    def _update_cache(self, *args, obj, value, **kwargs):
+        with self._lock:
+            self._cache[obj] = value
+
+    def _current_attr(self, attr: str, rows=None,
+                      refresh: bool = False) -> np.ndarray:
+        """The cached values of one attribute, NaN where unknown."""
+        if rows is None:
+            rows = range(len(self.triggers))
+        values = []
+        for row in rows:
+            signal = getattr(self.triggers[row], attr)
+            with self._lock:
+                value = self._cache.get(signal)
+            if value is None and refresh:
+                value = signal.get()
+                with self._lock:
+                    self._cache[signal] = value
+            values.append(np.nan if value is None else value)
+        return np.asarray(values, dtype=float)
+
+    def _current(self, column: str, refresh: bool = False) -> np.ndarray:
+        """The current value of a setting of every trigger."""
+        return self._current_attr(self.spec.fields[column][0],
+                                  refresh=refresh)
+
+    def to_table(self, refresh: bool = True) -> np.ndarray:
+        """
+        Export the current settings of all triggers.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            Get settings that have not been received from a monitor yet.
+            If False, these are exported as NaN for the float columns and
+            -1 for the integer columns.
+
+        Returns
+        -------
+        table : np.ndarray
+            A structured array with one row per trigger, which can be
+            passed to `apply`. Use ``pandas.DataFrame(table)`` for a
+            DataFrame.
+        """
+        names = np.array(self.names)
+        dtype = [('name', names.dtype)] + [
+            (column, TABLE_DTYPES[column]) for column in self.columns
+        ]
+        table = np.zeros(len(self.triggers), dtype=dtype)
+        table['name'] = names
+        for column in self.columns:
+            values = self._current(column, refresh=refresh)
+            if np.issubdtype(TABLE_DTYPES[column], np.floating):
+                table[column] = values
+            else:
+                table[column] = np.where(np.isnan(values), -1, values)
+        return table
+
+    def validate(self, table, allow_overlap: bool = True
+                 ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Check a table of settings and quantize its delays and widths.
+
+        Parameters
+        ----------
+        table : structured array, DataFrame or dict of columns
+            The requested settings, see the module documentation.
+        allow_overlap : bool, optional
+            If False, raise if enabled triggers on the same event overlap,
+            see `overlaps`.
+
+        Returns
+        -------
+        rows : np.ndarray
+            The index of the trigger of each row.
+        columns : dict
+            The validated and quantized setting columns.
+
+        Raises
+        ------
+        ValueError
+            If the table has unknown triggers or columns, repeats a trigger
+            or has invalid settings.
+        """
+        columns = _table_columns(table)
+        if 'name' not in columns:
+            raise ValueError('Timing tables need a "name" column')
+        names = columns.pop('name').astype(str)
+        unknown = sorted(set(names) - set(self._index))
+        if unknown:
+            raise ValueError(f'Unknown triggers in timing table: {unknown}')
+        if len(set(names)) != len(names):
+            raise ValueError('Timing table has more than one row for a '
+                             'trigger')
+        extra = sorted(set(columns) - set(self.columns))
+        if extra:
+            raise ValueError(
+                f'Unsupported columns {extra}, expected some of '
+                f'{self.columns}'
+            )
+        rows = np.array([self._index[name] for name in names], dtype=int)
+
+        checked = {}
+        for column, values in columns.items():
+            values = np.asarray(values, dtype=TABLE_DTYPES[column])
+            bad = np.zeros(len(values), dtype=bool)
+            if column in ('width', 'delay'):
+                bad = ~np.isfinite(values) | (values < 0)
+            elif column == 'eventcode':
+                bad = (values < 0) | (values > 255)
+            elif column in ('rate', 'polarity'):
+                bad = values < 0
+            if bad.any():
+                raise ValueError(
+                    f'Invalid {column} for {list(names[bad])}: '
+                    f'{list(values[bad])}'
+                )
+            quantize = self.spec.quantize.get(column)
+            checked[column] = values if quantize is None else quantize(values)
+
+        if not allow_overlap:
+            overlaps = self.overlaps(table)
+            if overlaps:
+                raise ValueError(f'Overlapping triggers: {overlaps}')
+        return rows, checked
+
+    def _merged(self, rows, checked) -> dict[str, np.ndarray]:
+        """The current settings with the requested settings applied."""
+        merged = {}
+        for column in self.columns:
+            values = self._current(column)
+            if column in checked:
+                values[rows] = checked[column]
+            merged[column] = values
+        return merged
+
+    def overlaps(self, table=None) -> list[tuple[str, str]]:
+        """
+        Find enabled triggers on the same event whose pulses overlap.
+
+        Parameters
+        ----------
+        table : structured array, DataFrame or dict of columns, optional
+            Check the settings after applying this table. Defaults to the
+            current settings.
+
+        Returns
+        -------
+        overlaps : list of tuple of str
+            The names of each pair of overlapping triggers.
+        """
+        if table is None:
+            merged = self._merged([], {})
+        else:
+            merged = self._merged(*self.validate(table))
+        start = merged['delay']
+        end = start + merged['width']
+        same = merged['enabled'] == 1
+        same = same[:, np.newaxis] & same[np.newaxis, :]
+        for column in self.spec.overlap_key:
+            values = merged[column]
+            same &= values[:, np.newaxis] == values[np.newaxis, :]
+        overlap = (
+            same
+            & (start[:, np.newaxis] < end[np.newaxis, :])
+            & (start[np.newaxis, :] < end[:, np.newaxis])
+        )
+        first, second = np.nonzero(np.triu(overlap, k=1))
+        return [(self.names[i], self.names[j]) for i, j in zip(first, second)]
+
+    def changes(self, table) -> dict[Any, Any]:
+        """
+        Find the PVs that need to be put to apply a table.
+
+        Settings are compared after quantizing both the requested and the
+        current value, so applying an exported table changes nothing.
+
+        Parameters
+        ----------
+        table : structured array, DataFrame or dict of columns
+            The requested settings.
+
+        Returns
+        -------
+        changes : dict
+            Signal to the value to put.
+        """
+        rows, checked = self.validate(table)
+        changes = {}
+        for column, values in checked.items():
+            quantize = self.spec.quantize.get(column)
+            for attr in self.spec.fields[column]:
+                current = self._current_attr(attr, rows)
+                if quantize is not None:
+                    current = quantize(current)
+                if column in ('width', 'delay'):
+                    differs = ~np.isclose(values, current, rtol=0, atol=1e-6)
+                else:
+                    differs = values != current
+                for row, value in zip(rows[differs], values[differs]):
+                    signal = getattr(self.triggers[row], attr)
+                    changes[signal] = value.item()
+        return changes
+
+    def apply(self, table, allow_overlap: bool = True,
+              timeout: Optional[float] = None) -> StatusBase:
+        """
+        Apply a table of settings, only putting the PVs that change.
+
+        Parameters
+        ----------
+        table : structured array, DataFrame or dict of columns
+            The requested settings, see the module documentation.
+        allow_overlap : bool, optional
+            If False, refuse tables that make enabled triggers overlap.
+        timeout : float, optional
+            The timeout of each put.
+
+        Returns
+        -------
+        status : StatusBase
+            Finishes once all changed PVs are set.
+        """
+        if not allow_overlap:
+            self.validate(table, allow_overlap=False)
+        changes = self.changes(table)
+        logger.debug('Applying %d timing changes: %s', len(changes),
+                     {signal.name: value for signal, value in changes.items()})
+        return set_many(changes, timeout=timeout, raise_on_set_failure=True)
+
+    def destroy(self) -> None:
+        """Unsubscribe from all trigger signals."""
+        for signal, cid in self._subscriptions:
+            signal.unsubscribe(cid)
+        self._subscriptions.clear()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import enum
 import inspect
 import logging
@@ -980,3 +981,139 @@ def set_standard_ordering(cls: type[Device]) -> type[Device]:
     sort_components_by_kind(cls)
     move_subdevices_to_start(cls)
     return cls
+
+
+def lazy_components_by_kind(
+    cls: type[Device] | None = None,
+    kinds: Iterable[Kind] = (Kind.config, Kind.omitted),
+    include_devices: bool = False,
+) -> type[Device] | Callable[[type[Device]], type[Device]]:
+    """
+    Make the components of a device class that match the given kinds lazy.
+
+    Lazy components are only instantiated (and their PVs only connected) on
+    first access rather than during the device's ``__init__``. This is
+    intended for the many ``config`` and ``omitted`` signals that are rarely
+    touched in interactive sessions. Everything that explicitly asks for a
+    component, such as ``read_configuration`` or typhos, will instantiate it
+    on demand. Lazy components that have class-level subscriptions are still
+    instantiated eagerly by ``ophyd``.
+
+    Only components whose kind is exactly one of ``kinds`` are changed, so
+    e.g. a ``normal | config`` signal is never made lazy with the defaults.
+
+    This also sets ``lazy_wait_for_connection = False`` on the class, so
+    that accessing a lazy component returns it right away instead of
+    blocking until its PVs connect. Code that needs a value waits for the
+    connection on its own, e.g. through ``get``.
+
+    The class is mutated in place, so this should be applied at class
+    definition time, before any subclasses are created. Subclasses inherit
+    the lazy components. To use the policy for only some instances of a
+    shared class, apply it to a subclass instead.
+
+    Parameters
+    ----------
+    cls : Device subclass
+        The Device subclass whose components should be made lazy.
+    kinds : iterable of Kind or str, optional
+        The component kinds to make lazy. Defaults to config and omitted.
+    include_devices : bool, optional
+        If True, also make matching sub-device components lazy. Defaults to
+        False, which only affects signals.
+
+    Returns
+    -------
+    cls : Device subclass, or function that returns it
+        Decorator-compatible output. When used as a function or as a
+        no-argument decorator, this will return the input device.
+        When used as a decorator with arguments, this will return a
+        function as required by the decorator interface.
+    """
+    kinds = {
+        Kind[kind.lower()] if isinstance(kind, str) else Kind(kind)
+        for kind in kinds
+    }
+
+    # Special decorator handling
+    def inner(cls: type[Device]) -> type[Device]:
+        for name, cpt in cls._sig_attrs.items():
+            if cpt.lazy or cpt.kind not in kinds:
+                continue
+            if cpt.is_device and not include_devices:
+                continue
+            lazy_cpt = copy.copy(cpt)
+            lazy_cpt.lazy = True
+            lazy_cpt._subscriptions = copy.copy(cpt._subscriptions)
+            setattr(cls, name, lazy_cpt)
+            cls._sig_attrs[name] = lazy_cpt
+        # Lazy components should be connected by whoever asks for them
+        cls.lazy_wait_for_connection = False
+        return cls
+
+    if cls is not None:
+        # For function call or no-args decorator
+        return inner(cls)
+    # For decorator with args
+    return inner
+
+
+def get_deferred_components(device: Device) -> list[str]:
+    """
+    Get the dotted names of the lazy components not yet instantiated.
+
+    This walks through all the instantiated sub-devices of ``device``.
+    Components that have already been accessed are not included.
+
+    Parameters
+    ----------
+    device : Device
+        The top-level device to inspect.
+
+    Returns
+    -------
+    deferred : list of str
+        The dotted names of the deferred components, relative to ``device``.
+    """
+    deferred = []
+    for name, cpt in device._sig_attrs.items():
+        if name not in device._signals:
+            if cpt.lazy:
+                deferred.append(name)
+            continue
+        obj = device._signals[name]
+        if isinstance(obj, Device):
+            deferred.extend(
+                f'{name}.{sub_name}'
+                for sub_name in get_deferred_components(obj)
+            )
+    return deferred
+
+
+def deferred_components_report(devices: Iterable[Device]) -> str:
+    """
+    Create a table summarizing how many components are deferred per device.
+
+    Parameters
+    ----------
+    devices : iterable of Device
+        The devices to include in the report.
+
+    Returns
+    -------
+    report : str
+        A table of device name, instantiated signal count and deferred
+        component count, with a total row at the end.
+    """
+    table = prettytable.PrettyTable()
+    table.field_names = ['Device', 'Instantiated', 'Deferred']
+    total_inst = 0
+    total_deferred = 0
+    for device in devices:
+        n_inst = len(list(device.walk_signals(include_lazy=False)))
+        n_deferred = len(get_deferred_components(device))
+        table.add_row([device.name, n_inst, n_deferred])
+        total_inst += n_inst
+        total_deferred += n_deferred
+    table.add_row(['Total', total_inst, total_deferred])
+    return table.get_string()
@@ -0,0 +1,629 @@
+"""
+Vacuum section model of a beamline.
+
+The vacuum system is modeled as a graph: the nodes are volumes, and each
+valve is an edge between the two volumes it separates. Open valves connect
+their volumes into a vacuum section. Gauges and pumps are attached to a
+volume and see the whole section that volume belongs to.
+
+The sections are updated incrementally as valves open and close, so that
+queries such as "which volumes are isolated" or "which gauges see this
+valve" do not need to read every device:
+
+* Opening a valve merges two sections, relabeling only the smaller one.
+* Closing a valve searches both sides of the valve at the same time. The
+  search stops as soon as the sides meet (no split) or the smaller side is
+  exhausted (split), so the cost depends on the affected section only.
+
+A `VacuumTopology` can be built by hand, from a configuration dictionary or
+YAML file (see `VacuumTopology.from_config`), or from happi metadata by
+ordering the vacuum devices of a beamline by their ``z`` position (see
+`VacuumTopology.from_happi`). Devices can then be attached, so that the
+model follows the ``valve_position`` and ``interlock_ok`` monitors of the
+valves and the ``pressure`` monitors of the gauges and pumps.
+"""
+from __future__ import annotations
+
+import dataclasses
+import functools
+import logging
+import pydoc
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional
+
+import yaml
+from ophyd.ophydobj import OphydObject
+
+logger = logging.getLogger(__name__)
+
+#: Valve position strings that are considered open
+OPEN_POSITIONS = frozenset({'OPEN', 'OPEN_F'})
+
+
+@dataclasses.dataclass
+class ValveEdge:
+    """
+    A valve between two volumes.
+
+    Attributes
+    ----------
+    name : str
+        The valve name.
+    upstream : str
+        The volume on the upstream side of the valve.
+    downstream : str
+        The volume on the downstream side of the valve.
+    is_open : bool
+        Whether the valve connects its two volumes.
+    interlock_ok : bool or None
+        The last known state of the valve's interlock, if any.
+    """
+    name: str
+    upstream: str
+    downstream: str
+    is_open: bool = False
+    interlock_ok: Optional[bool] = None
+
+    def other(self, volume: str) -> str:
+        """Get the volume on the other side of the valve."""
+        return self.downstream if volume == self.upstream else self.upstream
+
+
+def _position_string(value: Any, signal) -> Optional[str]:
+    """Convert a ``valve_position`` value to its enum string."""
+    if isinstance(value, str):
+        return value
+    enum_strs = getattr(signal, 'enum_strs', None)
+    try:
+        return enum_strs[int(value)]
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _device_role(device_class: Any) -> Optional[str]:
+    """Get the vacuum role of a device class: valve, gauge or pump."""
+    if isinstance(device_class, str):
+        device_class = pydoc.locate(device_class)
+    if not isinstance(device_class, type):
+        return None
+    module = device_class.__module__
+    if module.endswith('.valve') and (
+        hasattr(device_class, 'valve_position')
+        or hasattr(device_class, 'open_limit')
+    ):
+        return 'valve'
+    if module.endswith('.gauge') and hasattr(device_class, 'pressure'):
+        return 'gauge'
+    if module.endswith('.pump'):
+        return 'pump'
+    return None
+
+
+class VacuumTopology(OphydObject):
+    """
+    Graph of the vacuum volumes of a beamline, separated by valves.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the model.
+    """
+    #: Run when a valve change merges or splits sections
+    SUB_SECTIONS = 'sections'
+    _default_sub = SUB_SECTIONS
+
+    def __init__(self, name: str = 'vacuum_topology', **kwargs):
+        super().__init__(name=name, **kwargs)
+        self._lock = threading.RLock()
+        # volume -> {valve name: valve}
+        self._adjacency: dict[str, dict[str, ValveEdge]] = {}
+        self._valves: dict[str, ValveEdge] = {}
+        self._gauges: dict[str, str] = {}
+        self._pumps: dict[str, str] = {}
+        self._sensors_by_volume: dict[str, set[str]] = {}
+        self._pressures: dict[str, float] = {}
+        # Connected components over the open valves
+        self._section_of: dict[str, int] = {}
+        self._sections: dict[int, set[str]] = {}
+        self._next_section = 0
+        # Monitor state for attached devices
+        self._limits: dict[str, dict[str, Any]] = {}
+        self._device_subs = []
+        #: Counts of section merges and splits, and of the volumes visited
+        #: while checking for splits.
+        self.stats = {'merges': 0, 'splits': 0, 'visited': 0}
+
+    # Building the graph
+    def _new_section(self, volumes: Iterable[str]) -> int:
+        section_id = self._next_section
+        self._next_section += 1
+        volumes = set(volumes)
+        self._sections[section_id] = volumes
+        for volume in volumes:
+            self._section_of[volume] = section_id
+        return section_id
+
+    def add_volume(self, volume: str) -> None:
+        """Add a volume, if it does not exist yet."""
+        with self._lock:
+            if volume not in self._adjacency:
+                self._adjacency[volume] = {}
+                self._sensors_by_volume[volume] = set()
+                self._new_section([volume])
+
+    def add_valve(
+        self,
+        name: str,
+        upstream: str,
+        downstream: str,
+        is_open: bool = False,
+    ) -> ValveEdge:
+        """
+        Add a valve between two volumes, creating the volumes as needed.
+
+        Parameters
+        ----------
+        name : str
+            The valve name.
+        upstream : str
+            The volume on the upstream side.
+        downstream : str
+            The volume on the downstream side.
+        is_open : bool, optional
+            The initial state of the valve.
+        """
+        with self._lock:
+            if name in self._valves:
+                raise ValueError(f'Duplicate valve name {name!r}')
+            if upstream == downstream:
+                raise ValueError(
+                    f'Valve {name!r} must separate two different volumes'
+                )
+            self.add_volume(upstream)
+            self.add_volume(downstream)
+            valve = ValveEdge(name=name, upstream=upstream,
+                              downstream=downstream)
+            self._valves[name] = valve
+            self._adjacency[upstream][name] = valve
+            self._adjacency[downstream][name] = valve
+        if is_open:
+            self.set_valve_open(name, True)
+        return valve
+
+    def _add_sensor(self, registry, name, volume):
+        with self._lock:
+            if name in self._gauges or name in self._pumps:
+                raise ValueError(f'Duplicate gauge or pump name {name!r}')
+            self.add_volume(volume)
+            registry[name] = volume
+            self._sensors_by_volume[volume].add(name)
+
+    def add_gauge(self, name: str, volume: str) -> None:
+        """Add a gauge that measures the pressure of ``volume``."""
+        self._add_sensor(self._gauges, name, volume)
+
+    def add_pump(self, name: str, volume: str) -> None:
+        """Add a pump that pumps on ``volume``."""
+        self._add_sensor(self._pumps, name, volume)
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Mapping,
+        devices: Optional[Mapping[str, Any]] = None,
+        **kwargs
+    ) -> VacuumTopology:
+        """
+        Build a topology from a configuration dictionary.
+
+        The configuration looks like this, where ``volumes`` is optional::
+
+            volumes: [fee, xrt]
+            valves:
+              vgc1: {upstream: fee, downstream: xrt, open: true}
+            gauges:
+              gcc1: fee
+            pumps:
+              pip1: xrt
+
+        Parameters
+        ----------
+        config : mapping
+            The configuration, see above.
+        devices : mapping of str to Device, optional
+            Devices to attach by valve, gauge or pump name, see
+            `attach_device`.
+        **kwargs
+            Passed to the constructor.
+        """
+        topology = cls(**kwargs)
+        for volume in config.get('volumes', None) or []:
+            topology.add_volume(volume)
+        for name, info in (config.get('valves', None) or {}).items():
+            topology.add_valve(name, info['upstream'], info['downstream'],
+                               is_open=bool(info.get('open', False)))
+        for name, volume in (config.get('gauges', None) or {}).items():
+            topology.add_gauge(name, volume)
+        for name, volume in (config.get('pumps', None) or {}).items():
+            topology.add_pump(name, volume)
+        for name, device in (devices or {}).items():
+            topology.attach_device(name, device)
+        return topology
+
+    @classmethod
+    def from_yaml(
+        cls,
+        filename: str,
+        devices: Optional[Mapping[str, Any]] = None,
+        **kwargs
+    ) -> VacuumTopology:
+        """Build a topology from a YAML file, see `from_config`."""
+        with open(filename) as fd:
+            config = yaml.safe_load(fd) or {}
+        return cls.from_config(config, devices=devices, **kwargs)
+
+    @classmethod
+    def from_items(
+        cls,
+        items: Iterable[Mapping],
+        devices: Optional[Mapping[str, Any]] = None,
+        **kwargs
+    ) -> VacuumTopology:
+        """
+        Build a topology from happi-style metadata.
+
+        The valves, gauges and pumps of each beamline are ordered by their
+        ``z`` position. Consecutive valves bound a volume, named after them
+        as ``'upstream->downstream'``, and each gauge or pump is attached to
+        the volume it is in. Items without a ``z`` or with another device
+        class are ignored. Beamlines are not connected to each other.
+
+        Parameters
+        ----------
+        items : iterable of mapping
+            Item metadata with ``name``, ``device_class`` and ``z``, and
+            optionally ``beamline``.
+        devices : mapping of str to Device, optional
+            Devices to attach by item name, see `attach_device`.
+        **kwargs
+            Passed to the constructor.
+        """
+        beamlines = {}
+        for item in items:
+            z = item.get('z', None)
+            role = _device_role(item.get('device_class', None))
+            if z is None or role is None:
+                continue
+            beamline = item.get('beamline', None) or ''
+            beamlines.setdefault(beamline, []).append(
+                (float(z), role, item['name'])
+            )
+
+        topology = cls(**kwargs)
+        for beamline, entries in beamlines.items():
+            entries.sort(key=lambda entry: (entry[0], entry[2]))
+            prefix = f'{beamline}:' if beamline else ''
+            valves = [name for _, role, name in entries if role == 'valve']
+            bounds = [''] + valves + ['']
+
+            def volume_name(index):
+                return f'{prefix}{bounds[index]}->{bounds[index + 1]}'
+
+            for index, valve in enumerate(valves):
+                topology.add_valve(valve, volume_name(index),
+                                   volume_name(index + 1))
+            index = 0
+            for _, role, name in entries:
+                if role == 'valve':
+                    index += 1
+                elif role == 'gauge':
+                    topology.add_gauge(name, volume_name(index))
+                else:
+                    topology.add_pump(name, volume_name(index))
+            if not valves:
+                topology.add_volume(volume_name(0))
+
+        for name, device in (devices or {}).items():
+            topology.attach_device(name, device)
+        return topology
+
+    @classmethod
+    def from_happi(
+        cls,
+        client,
+        devices: Optional[Mapping[str, Any]] = None,
+        **search
+    ) -> VacuumTopology:
+        """
+        Build a topology from the items of a happi client.
+
+        Parameters
+        ----------
+        client : happi.Client
+            The client to search.
+        devices : mapping of str to Device, optional
+            Devices to attach by item name, see `attach_device`.
+        **search
+            Search terms, e.g. ``beamline='TMO'``.
+        """
+        results = client.search(**search) if search else client.search()
+        return cls.from_items(
+            [dict(result.metadata) for result in results], devices=devices
+        )
+
+    # Incremental section updates
+    def set_valve_open(self, name: str, is_open: bool) -> bool:
+        """
+        Update the state of a valve.
+
+        Parameters
+        ----------
+        name : str
+            The valve name.
+        is_open : bool
+            The new state.
+
+        Returns
+        -------
+        changed : bool
+            True if the sections changed.
+        """
+        is_open = bool(is_open)
+        with self._lock:
+            valve = self._valves[name]
+            if valve.is_open == is_open:
+                return False
+            valve.is_open = is_open
+            if is_open:
+                sections = self._merge(valve)
+            else:
+                sections = self._split(valve)
+        if sections:
+            self._run_subs(sub_type=self.SUB_SECTIONS, valve=name,
+                           is_open=is_open, sections=sections)
+        return bool(sections)
+
+    def _merge(self, valve: ValveEdge) -> list[frozenset]:
+        first = self._section_of[valve.upstream]
+        second = self._section_of[valve.downstream]
+        if first == second:
+            # Already connected through another path
+            return []
+        if len(self._sections[first]) < len(self._sections[second]):
+            first, second = second, first
+        moved = self._sections.pop(second)
+        for volume in moved:
+            self._section_of[volume] = first
+        self._sections[first] |= moved
+        self.stats['merges'] += 1
+        return [frozenset(self._sections[first])]
+
+    def _split(self, valve: ValveEdge) -> list[frozenset]:
+        """Split the section of a closed valve, if it is no longer joined."""
+        sides = (valve.upstream, valve.downstream)
+        visited = ({sides[0]}, {sides[1]})
+        frontiers = ([sides[0]], [sides[1]])
+        while True:
+            for side in (0, 1):
+                if not frontiers[side]:
+                    # This side is exhausted without meeting the other one
+                    return self._finish_split(visited[side])
+                volume = frontiers[side].pop()
+                self.stats['visited'] += 1
+                for edge in self._adjacency[volume].values():
+                    if not edge.is_open:
+                        continue
+                    other = edge.other(volume)
+                    if other in visited[1 - side]:
+                        # Still connected through another path
+                        return []
+                    if other not in visited[side]:
+                        visited[side].add(other)
+                        frontiers[side].append(other)
+
+    def _finish_split(self, volumes: set[str]) -> list[frozenset]:
+        old_id = self._section_of[next(iter(volumes))]
+        self._sections[old_id] -= volumes
+        new_id = self._new_section(volumes)
+        self.stats['splits'] += 1
+        return [frozenset(self._sections[old_id]),
+                frozenset(self._sections[new_id])]
+
+    def set_interlock_ok(self, name: str, ok: Optional[bool]) -> None:
+        """Update the interlock state of a valve."""
+        with self._lock:
+            self._valves[name].interlock_ok = None if ok is None else bool(ok)
+
+    def set_pressure(self, name: str, pressure: Optional[float]) -> None:
+        """Update the pressure reading of a gauge or pump."""
+        with self._lock:
+            if name not in self._gauges and name not in self._pumps:
+                raise KeyError(f'Unknown gauge or pump {name!r}')
+            if pressure is None:
+                self._pressures.pop(name, None)
+            else:
+                self._pressures[name] = float(pressure)
+
+    # Device monitors
+    def attach_device(self, name: str, device) -> None:
+        """
+        Follow the monitors of the device for a valve, gauge or pump.
+
+        Valves use ``valve_position`` when available, or the ``open_limit``
+        and ``closed_limit`` signals otherwise, and ``interlock_ok`` if
+        present. Gauges and pumps use their ``pressure`` signal.
+
+        Parameters
+        ----------
+        name : str
+            The name of the valve, gauge or pump in the topology.
+        device : Device
+            The device to monitor.
+        """
+        if name in self._valves:
+            position = getattr(device, 'valve_position', None)
+            if position is not None:
+                self._subscribe(position, functools.partial(
+                    self._valve_position_changed, name))
+            else:
+                self._limits[name] = {}
+                for attr in ('open_limit', 'closed_limit'):
+                    signal = getattr(device, attr, None)
+                    if signal is not None:
+                        self._subscribe(signal, functools.partial(
+                            self._valve_limit_changed, name, attr))
+            interlock = getattr(device, 'interlock_ok', None)
+            if interlock is not None:
+                self._subscribe(interlock, functools.partial(
+                    self._interlock_changed, name))
+        elif name in self._gauges or name in self._pumps:
+            pressure = getattr(device, 'pressure', None)
+            if pressure is None or callable(pressure):
+                logger.debug('%s has no pressure signal to monitor', name)
+                return
+            self._subscribe(pressure, functools.partial(
+                self._pressure_changed, name))
+        else:
+            raise KeyError(f'{name!r} is not in the topology')
+
+    def _subscribe(self, signal, callback) -> None:
+        cid = signal.subscribe(callback, run=True)
+        self._device_subs.append((signal, cid))
+
+    def detach_devices(self) -> None:
+        """Stop following all attached devices."""
+        for signal, cid in self._device_subs:
+            signal.unsubscribe(cid)
+        self._device_subs.clear()
+
+    def _valve_position_changed(self, name, value=None, obj=None, **kwargs):
+        if value is None:
+            return
+        position = _position_string(value, obj)
+        self.set_valve_open(name, position in OPEN_POSITIONS)
+
+    def _valve_limit_changed(self, name, attr, value=None, **kwargs):
+        with self._lock:
+            limits = self._limits[name]
+            limits[attr] = value
+            is_open = (bool(limits.get('open_limit', False))
+                       and not limits.get('closed_limit', False))
+        self.set_valve_open(name, is_open)
+
+    def _interlock_changed(self, name, value=None, **kwargs):
+        self.set_interlock_ok(name, None if value is None else bool(value))
+
+    def _pressure_changed(self, name, value=None, **kwargs):
+        self.set_pressure(name, value)
+
+    # Queries
+    @property
+    def volumes(self) -> list[str]:
+        """All volume names."""
+        with self._lock:
+            return list(self._adjacency)
+
+    @property
+    def valves(self) -> dict[str, ValveEdge]:
+        """All valves by name."""
+        with self._lock:
+            return dict(self._valves)
+
+    def section(self, volume: str) -> frozenset:
+        """Get the volumes connected to ``volume`` through open valves."""
+        with self._lock:
+            return frozenset(self._sections[self._section_of[volume]])
+
+    def sections(self) -> list[frozenset]:
+        """Get all vacuum sections."""
+        with self._lock:
+            return [frozenset(volumes) for volumes in self._sections.values()]
+
+    def isolated_volumes(self) -> list[str]:
+        """Get the volumes that are closed off on all sides."""
+        with self._lock:
+            return [volume for volume, section_id in self._section_of.items()
+                    if len(self._sections[section_id]) == 1]
+
+    def unpumped_sections(self) -> list[frozenset]:
+        """Get the sections that no pump is connected to."""
+        with self._lock:
+            pumped = {self._section_of[volume]
+                      for volume in self._pumps.values()}
+            return [frozenset(volumes)
+                    for section_id, volumes in self._sections.items()
+                    if section_id not in pumped]
+
+    def gauges_in_section(self, volume: str) -> list[str]:
+        """Get the gauges that measure the section of ``volume``."""
+        with self._lock:
+            section = self._sections[self._section_of[volume]]
+            return sorted(
+                name for vol in section
+                for name in self._sensors_by_volume[vol]
+                if name in self._gauges
+            )
+
+    def gauges_for_valve(self, name: str) -> tuple[list[str], list[str]]:
+        """
+        Get the gauges that see either side of a valve.
+
+        Returns
+        -------
+        upstream, downstream : list of str
+            The gauges in the section on each side of the valve. These are
+            the same if the valve is open, or if both sides are connected
+            through another path.
+        """
+        with self._lock:
+            valve = self._valves[name]
+            return (self.gauges_in_section(valve.upstream),
+                    self.gauges_in_section(valve.downstream))
+
+    def valves_bounding(self, volume: str) -> list[str]:
+        """Get the closed valves at the boundary of the section of a volume."""
+        with self._lock:
+            section = self._sections[self._section_of[volume]]
+            return sorted({
+                edge.name for vol in section
+                for edge in self._adjacency[vol].values()
+                if not edge.is_open
+                and edge.other(vol) not in section
+            })
+
+    def section_pressure(self, volume: str) -> Optional[float]:
+        """
+        Get the pressure of the section of ``volume``.
+
+        This is the highest (worst) reading of the gauges and pumps that are
+        connected to the volume, or None if there are no readings.
+        """
+        with self._lock:
+            section = self._sections[self._section_of[volume]]
+            readings = [
+                self._pressures[name] for vol in section
+                for name in self._sensors_by_volume[vol]
+                if name in self._pressures
+            ]
+            return max(readings, default=None)
+
+    def pressure_differential(self, name: str) -> Optional[float]:
+        """
+        Get the pressure difference across a valve, downstream - upstream.
+
+        Returns None if either side has no pressure readings.
+        """
+        with self._lock:
+            valve = self._valves[name]
+            upstream = self.section_pressure(valve.upstream)
+            downstream = self.section_pressure(valve.downstream)
+        if upstream is None or downstream is None:
+            return None
+        return downstream - upstream
+
+    def interlocked_valves(self) -> list[str]:
+        """Get the valves whose interlock is not ok."""
+        with self._lock:
+            return sorted(name for name, valve in self._valves.items()
+                          if valve.interlock_ok is False)